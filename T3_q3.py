@@ -1,6 +1,9 @@
 import numpy as np
 import math
-import matplotlib.pyplot as plt
+import os
+import struct
+from leitura_dados import ler_blocos, blocos_de_arrays, TAMANHO_BLOCO_PADRAO
+from carregamento import importar
 
 
 def erro_quadratico(Y_observado, Y_ajustado):
@@ -83,31 +86,448 @@ def regressao_exponencial(X, Y):
     return coefs_lin, Y_ajustado
 
 
-def plotar_ajustes(X, Y, resultados):
-    """Gera o gráfico dos dados originais e das curvas de ajuste."""
+def matriz_potencias(X, grau):
+    """Monta a matriz de potências V[i, j] = xi^j (j = 0..grau) usada pelos ajustes polinomiais."""
+    return np.vander(X, grau + 1, increasing=True)
+
+def minimos_quadrados_ponderados(V, Y, pesos=None):
+    """
+    Resolve o sistema normal ponderado (Vᵀ W V) a = Vᵀ W Y.
+    V é a matriz de potências já calculada; pesos=None equivale a pesos unitários.
+    """
+    if pesos is None:
+        A = V.T @ V
+        b = V.T @ Y
+    else:
+        V_ponderada = V * pesos[:, None]
+        A = V_ponderada.T @ V
+        b = V_ponderada.T @ Y
+    return np.linalg.solve(A, b)
+
+def validar_pesos(pesos, X):
+    """Converte os pesos para array e verifica se há um peso não negativo para cada ponto."""
+    pesos = np.asarray(pesos, dtype=float)
+    if pesos.shape != np.shape(X):
+        raise ValueError("O número de pesos deve ser igual ao número de pontos.")
+    if np.any(pesos < 0):
+        raise ValueError("Os pesos devem ser não negativos.")
+    return pesos
+
+def regressao_ponderada(X, Y, pesos, grau=1):
+    """Ajusta um polinômio de grau 'grau' minimizando Σ wi*[F(xi) - G(xi)]²."""
+    pesos = validar_pesos(pesos, X)
+
+    V = matriz_potencias(X, grau)
+    coefs = minimos_quadrados_ponderados(V, Y, pesos)
+    return coefs, V @ coefs
+
+CONSTANTES_ROBUSTAS = {"Huber": 1.345, "Tukey": 4.685}
+
+def regressao_robusta(X, Y, grau=1, metodo="Huber", pesos=None, c=None, max_iter=50, tol=1e-8):
+    """
+    Ajuste polinomial robusto (M-estimador de Huber ou Tukey) por mínimos quadrados
+    iterativamente reponderados (IRLS).
+    A matriz de potências é montada uma única vez e reaproveitada em cada reponderação.
+    'pesos' são pesos a priori, multiplicados pelos pesos robustos a cada passo.
+    Retorna os coeficientes, os valores ajustados e os pesos finais.
+    """
+    if metodo not in CONSTANTES_ROBUSTAS:
+        raise ValueError(f"Método robusto desconhecido: {metodo}. Use 'Huber' ou 'Tukey'.")
+    if c is None:
+        c = CONSTANTES_ROBUSTAS[metodo]
+
+    V = matriz_potencias(X, grau)
+    pesos_base = np.ones_like(Y, dtype=float) if pesos is None else validar_pesos(pesos, X)
+    pesos_finais = pesos_base
+    coefs = minimos_quadrados_ponderados(V, Y, pesos_base)
+
+    for _ in range(max_iter):
+        residuos = Y - V @ coefs
+        escala = np.median(np.abs(residuos)) / 0.6745
+        if escala == 0:
+            break
+
+        u = np.abs(residuos) / (c * escala)
+        if metodo == "Huber":
+            pesos_robustos = 1.0 / np.maximum(u, 1.0)
+        else:
+            pesos_robustos = np.where(u < 1.0, (1.0 - u**2)**2, 0.0)
+
+        pesos_finais = pesos_base * pesos_robustos
+        novos_coefs = minimos_quadrados_ponderados(V, Y, pesos_finais)
+
+        convergiu = np.max(np.abs(novos_coefs - coefs)) <= tol * (1.0 + np.max(np.abs(coefs)))
+        coefs = novos_coefs
+        if convergiu:
+            break
+
+    return coefs, V @ coefs, pesos_finais
+
+
+GRAUS_AJUSTE = {"Reta": 1, "Parábola": 2, "Exponencial": 1}
+
+def estado_regressao(ajuste="Reta", metodo="normais"):
+    """
+    Cria o estado acumulado de uma regressão feita bloco a bloco.
+    Com metodo="normais" guarda VᵀV e VᵀY; com metodo="qr" guarda o fator R e Qᵀy
+    (mais estável para X grandes). Em ambos os casos o estado tem tamanho fixo.
+    As somas são feitas em torno das médias de X e Y do primeiro bloco, para que dados
+    longe da origem não percam precisão por cancelamento.
+    """
+    if ajuste not in GRAUS_AJUSTE:
+        raise ValueError(f"Ajuste desconhecido: {ajuste}.")
+    if metodo not in ("normais", "qr"):
+        raise ValueError("O método deve ser 'normais' ou 'qr'.")
+
+    p = GRAUS_AJUSTE[ajuste] + 1
+    return {
+        "Ajuste": ajuste,
+        "Método": metodo,
+        "N": 0,
+        "VtV": np.zeros((p, p)),
+        "VtY": np.zeros(p),
+        "R": np.zeros((0, p)),
+        "QtY": np.zeros(0),
+        "Soma Y2": 0.0,
+        "Deslocamento X": 0.0,
+        "Deslocamento Y": 0.0,
+    }
+
+def _mudar_origem(coefs, deslocamento):
+    """Coeficientes de p(x + deslocamento) a partir dos de p(x) (potências em ordem crescente)."""
+    p = len(coefs)
+    T = np.array([[math.comb(j, k) * deslocamento ** (j - k) if j >= k else 0.0 for j in range(p)]
+                  for k in range(p)])
+    return T @ np.asarray(coefs, dtype=float)
+
+def _coefs_originais(coefs_deslocados, estado):
+    """Converte coeficientes ajustados em torno do deslocamento do estado para a variável x original."""
+    coefs = _mudar_origem(coefs_deslocados, -estado["Deslocamento X"])
+    coefs[0] += estado["Deslocamento Y"]
+    return coefs
+
+def _coefs_deslocados(coefs, estado):
+    """Inverso de _coefs_originais: coeficientes de G(x) escritos em torno do deslocamento do estado."""
+    coefs_deslocados = _mudar_origem(coefs, estado["Deslocamento X"])
+    coefs_deslocados[0] -= estado["Deslocamento Y"]
+    return coefs_deslocados
+
+def acumular_bloco(estado, X, Y):
+    """Incorpora um bloco de pontos (X, Y) ao estado da regressão."""
+    if len(X) != len(Y):
+        raise ValueError("O número de valores para X e F(x) deve ser o mesmo em cada bloco.")
+    if len(X) == 0:
+        return estado
+
+    if estado["Ajuste"] == "Exponencial":
+        if np.any(Y <= 0):
+            raise ValueError("Regressão exponencial requer que todos os valores de F(x) sejam positivos.")
+        Y = np.log(Y)
+
+    if estado["N"] == 0:
+        estado["Deslocamento X"] = float(np.mean(X))
+        estado["Deslocamento Y"] = float(np.mean(Y))
+    X = X - estado["Deslocamento X"]
+    Y = Y - estado["Deslocamento Y"]
+
+    V = matriz_potencias(X, GRAUS_AJUSTE[estado["Ajuste"]])
+    estado["N"] += len(X)
+    estado["Soma Y2"] += float(Y @ Y)
+
+    if estado["Método"] == "normais":
+        estado["VtV"] += V.T @ V
+        estado["VtY"] += V.T @ Y
+    else:
+        Q, R = np.linalg.qr(np.vstack([estado["R"], V]))
+        estado["QtY"] = Q.T @ np.concatenate([estado["QtY"], Y])
+        estado["R"] = R
+    return estado
+
+def resolver_estado(estado):
+    """Resolve o ajuste a partir do estado acumulado e devolve os coeficientes."""
+    p = GRAUS_AJUSTE[estado["Ajuste"]] + 1
+    if estado["N"] < p:
+        raise ValueError(f"São necessários pelo menos {p} pontos para o ajuste {estado['Ajuste']}.")
+    if estado["Método"] == "normais":
+        coefs = np.linalg.solve(estado["VtV"], estado["VtY"])
+    else:
+        coefs = np.linalg.solve(estado["R"], estado["QtY"])
+    return _coefs_originais(coefs, estado)
+
+def regressao_em_blocos(blocos, ajuste="Reta", metodo="normais"):
+    """
+    Ajusta Reta, Parábola ou Exponencial consumindo um iterável de blocos (X, Y),
+    sem nunca manter o conjunto de dados inteiro na memória.
+    Retorna os coeficientes e o estado acumulado.
+    """
+    estado = estado_regressao(ajuste, metodo)
+    for X_bloco, Y_bloco in blocos:
+        acumular_bloco(estado, np.asarray(X_bloco, dtype=float), np.asarray(Y_bloco, dtype=float))
+    return resolver_estado(estado), estado
+
+def regressao_arquivo(caminho, ajuste="Reta", metodo="normais", colunas=(0, 1),
+                      tamanho_bloco=TAMANHO_BLOCO_PADRAO, cabecalho=False):
+    """Ajusta os dados de um arquivo .npy/.csv/.txt lido em blocos (fora da memória)."""
+    blocos = ler_blocos(caminho, colunas=colunas, tamanho_bloco=tamanho_bloco, cabecalho=cabecalho)
+    return regressao_em_blocos(blocos, ajuste=ajuste, metodo=metodo)
+
+def estatisticas_suficientes(X, Y, ajuste="Parábola"):
+    """
+    Acumula Σy², VᵀV e VᵀY percorrendo os dados em blocos, sem temporários do tamanho de N.
+    O estado de uma Parábola contém também as estatísticas da Reta (submatrizes 2x2).
+    """
+    estado = estado_regressao(ajuste)
+    for X_bloco, Y_bloco in blocos_de_arrays(X, Y):
+        acumular_bloco(estado, X_bloco, Y_bloco)
+    return estado
+
+def resolver_subsistema(estado, grau):
+    """Resolve o ajuste polinomial de grau 'grau' <= grau do estado usando as equações normais acumuladas."""
+    p = grau + 1
+    if estado["N"] < p:
+        raise ValueError(f"São necessários pelo menos {p} pontos para o ajuste de grau {grau}.")
+    return _coefs_originais(np.linalg.solve(estado["VtV"][:p, :p], estado["VtY"][:p]), estado)
+
+def erro_quadratico_estado(coefs, estado):
+    """
+    Calcula E = Σy² - 2·aᵀ(VᵀY) + aᵀ(VᵀV)a apenas com as estatísticas acumuladas,
+    sem montar G(xi) nem os resíduos. Vale para qualquer vetor de coeficientes de um
+    modelo linear nos parâmetros (inclusive ajustes ponderados ou robustos).
+    Os coeficientes são reescritos em torno do deslocamento do estado, onde as somas foram feitas.
+    """
+    coefs = _coefs_deslocados(coefs, estado)
+    p = len(coefs)
+
+    if estado["Método"] == "qr":
+        if p != estado["R"].shape[1]:
+            raise ValueError("No estado QR o número de coeficientes deve ser igual ao do ajuste acumulado.")
+        desvio = estado["R"] @ coefs - estado["QtY"]
+        erro = estado["Soma Y2"] - estado["QtY"] @ estado["QtY"] + desvio @ desvio
+    else:
+        VtV = estado["VtV"][:p, :p]
+        VtY = estado["VtY"][:p]
+        erro = estado["Soma Y2"] - 2 * coefs @ VtY + coefs @ VtV @ coefs
+
+    return max(float(erro), 0.0)
+
+def erro_quadratico_exato(X, Y, coefs, ajuste):
+    """
+    Erro quadrático por uma passada explícita nos resíduos, feita em blocos.
+    Usado para verificação e para o ajuste Exponencial (não linear em a).
+    """
+    erro = 0.0
+    for X_bloco, Y_bloco in blocos_de_arrays(X, Y):
+        residuos = Y_bloco - ModeloRegressao(ajuste, coefs).prever(X_bloco)
+        erro += float(residuos @ residuos)
+    return erro
+
+def erro_modelo(X, Y, coefs, ajuste, estado, verificar=False):
+    """
+    Erro quadrático de um ajuste. Reta e Parábola usam as estatísticas suficientes;
+    com verificar=True (ou no ajuste Exponencial) faz a passada exata nos resíduos.
+    """
+    if verificar or ajuste == "Exponencial":
+        return erro_quadratico_exato(X, Y, coefs, ajuste)
+    return erro_quadratico_estado(coefs, estado)
+
+
+class ModeloRegressao:
+    """
+    Modelo ajustado (Reta, Parábola ou Exponencial) com previsão vetorizada.
+    Pode ser serializado em um formato binário compacto (cabeçalho + coeficientes
+    float64) e recarregado sem refazer o ajuste.
+    """
+
+    __slots__ = ("ajuste", "coefs", "erro")
+
+    ASSINATURA = b"RGM1"
+    CODIGOS = {"Reta": 1, "Parábola": 2, "Exponencial": 3}
+    CABECALHO = struct.Struct("<4sBBd")
+
+    def __init__(self, ajuste, coefs, erro=float("nan")):
+        if ajuste not in self.CODIGOS:
+            raise ValueError(f"Ajuste desconhecido: {ajuste}.")
+        coefs = np.ascontiguousarray(coefs, dtype="<f8")
+        if len(coefs) != GRAUS_AJUSTE[ajuste] + 1:
+            raise ValueError(f"O ajuste {ajuste} requer {GRAUS_AJUSTE[ajuste] + 1} coeficientes.")
+        self.ajuste = ajuste
+        self.coefs = coefs
+        self.erro = float(erro)
+
+    def __repr__(self):
+        return f"ModeloRegressao({self.equacao()!r}, erro={self.erro:.6f})"
+
+    def equacao(self):
+        """Equação do modelo no mesmo formato de formatar_polinomio."""
+        return formatar_polinomio(self.coefs, self.ajuste)
+
+    def prever(self, X):
+        """Avalia G(x) para um array de X (Horner para os polinômios, sem montar potências)."""
+        X = np.asarray(X, dtype=float)
+        escalar = X.ndim == 0
+        X = np.atleast_1d(X)
+        if self.ajuste == "Exponencial":
+            Y = np.multiply(X, self.coefs[1])
+            np.exp(Y, out=Y)
+            Y *= math.exp(self.coefs[0])
+        else:
+            Y = np.full(X.shape, self.coefs[-1])
+            for a in self.coefs[-2::-1]:
+                Y *= X
+                Y += a
+        return Y[0] if escalar else Y
+
+    def prever_em_blocos(self, blocos_x):
+        """Gera as previsões para cada bloco de X de um iterável (ex.: arquivo lido em blocos)."""
+        for X_bloco in blocos_x:
+            yield self.prever(X_bloco)
+
+    def para_bytes(self):
+        """Serializa o modelo: assinatura, código do ajuste, nº de coeficientes, erro e coeficientes."""
+        cabecalho = self.CABECALHO.pack(self.ASSINATURA, self.CODIGOS[self.ajuste], len(self.coefs), self.erro)
+        return cabecalho + self.coefs.tobytes()
+
+    @classmethod
+    def de_bytes(cls, dados):
+        """Reconstrói um modelo a partir de para_bytes()."""
+        tamanho = cls.CABECALHO.size
+        if len(dados) < tamanho:
+            raise ValueError("Dados insuficientes para um modelo de regressão.")
+        assinatura, codigo, n_coefs, erro = cls.CABECALHO.unpack_from(dados)
+        if assinatura != cls.ASSINATURA:
+            raise ValueError("Os dados não contêm um modelo de regressão válido.")
+        ajustes = {v: k for k, v in cls.CODIGOS.items()}
+        if codigo not in ajustes or len(dados) != tamanho + 8 * n_coefs:
+            raise ValueError("Modelo de regressão corrompido.")
+        coefs = np.frombuffer(dados, dtype="<f8", count=n_coefs, offset=tamanho)
+        return cls(ajustes[codigo], coefs, erro)
+
+    def salvar(self, caminho):
+        """Grava o modelo serializado em um arquivo."""
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(self.para_bytes())
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Lê um modelo gravado por salvar()."""
+        with open(caminho, "rb") as arquivo:
+            return cls.de_bytes(arquivo.read())
+
+
+_MODELOS_CARREGADOS = {}
+
+def obter_modelo(caminho):
+    """
+    Devolve o modelo gravado em 'caminho', mantendo-o em memória no processo.
+    O arquivo só é relido se for modificado, o que permite servir previsões
+    em grande volume sem reler nem reajustar nada.
+    """
+    chave = os.path.abspath(caminho)
+    modificado = os.path.getmtime(chave)
+    em_cache = _MODELOS_CARREGADOS.get(chave)
+    if em_cache is None or em_cache[0] != modificado:
+        em_cache = (modificado, ModeloRegressao.carregar(chave))
+        _MODELOS_CARREGADOS[chave] = em_cache
+    return em_cache[1]
+
+
+def reduzir_lttb(X, Y, n_saida):
+    """
+    Reduz (X, Y) a 'n_saida' pontos pelo algoritmo Largest-Triangle-Three-Buckets,
+    que preserva a forma visual da série. Os pontos são ordenados por X.
+    """
+    N = len(X)
+    if n_saida >= N or n_saida < 3:
+        return X, Y
+
+    ordem = np.argsort(X, kind="stable")
+    X = X[ordem]
+    Y = Y[ordem]
+
+    bordas = np.linspace(1, N - 1, n_saida - 1).astype(int)
+    contagens = np.diff(bordas)
+    medias_x = np.add.reduceat(X[1:N - 1], bordas[:-1] - 1) / contagens
+    medias_y = np.add.reduceat(Y[1:N - 1], bordas[:-1] - 1) / contagens
+
+    indices = np.empty(n_saida, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = N - 1
+    anterior = 0
+
+    for i in range(n_saida - 2):
+        inicio, fim = bordas[i], bordas[i + 1]
+        if i + 1 < n_saida - 2:
+            prox_x, prox_y = medias_x[i + 1], medias_y[i + 1]
+        else:
+            prox_x, prox_y = X[-1], Y[-1]
+
+        ax, ay = X[anterior], Y[anterior]
+        areas = np.abs((ax - prox_x) * (Y[inicio:fim] - ay) - (ax - X[inicio:fim]) * (prox_y - ay))
+        anterior = inicio + int(np.argmax(areas))
+        indices[i + 1] = anterior
+
+    return X[indices], Y[indices]
+
+def reduzir_minmax(X, Y, n_baldes):
+    """
+    Divide o eixo X em 'n_baldes' faixas de mesma largura (uma por coluna de pixels)
+    e mantém, em cada faixa, os pontos de menor e de maior F(x).
+    """
+    N = len(X)
+    if 2 * n_baldes >= N:
+        return X, Y
+
+    if np.any(np.diff(X) < 0):
+        ordem = np.argsort(X, kind="stable")
+        X = X[ordem]
+        Y = Y[ordem]
+
+    bordas = np.linspace(X[0], X[-1], n_baldes + 1)
+    inicios = np.unique(np.searchsorted(X, bordas[:-1], side="left"))
+    contagens = np.diff(np.append(inicios, N))
+
+    posicoes_min = _primeira_ocorrencia(Y == np.repeat(np.minimum.reduceat(Y, inicios), contagens), inicios)
+    posicoes_max = _primeira_ocorrencia(Y == np.repeat(np.maximum.reduceat(Y, inicios), contagens), inicios)
+
+    indices = np.unique(np.concatenate((posicoes_min, posicoes_max)))
+    return X[indices], Y[indices]
+
+def _primeira_ocorrencia(mascara, inicios):
+    """Índice do primeiro True de 'mascara' em cada segmento que começa em 'inicios'."""
+    verdadeiros = np.flatnonzero(mascara)
+    return verdadeiros[np.searchsorted(verdadeiros, inicios)]
+
+def reduzir_pontos(X, Y, max_pontos=2000, modo="lttb"):
+    """Reduz os pontos observados para o gráfico ('lttb' ou 'minmax'); devolve os dados intactos se N <= max_pontos."""
+    if len(X) <= max_pontos:
+        return X, Y
+    if modo == "minmax":
+        return reduzir_minmax(X, Y, max_pontos // 2)
+    return reduzir_lttb(X, Y, max_pontos)
+
+
+def plotar_ajustes(X, Y, resultados, max_pontos=2000, modo="lttb"):
+    """
+    Gera o gráfico dos dados originais e das curvas de ajuste.
+    Acima de 'max_pontos' os dados observados são reduzidos ('lttb' ou 'minmax')
+    ou desenhados como mapa de densidade ('densidade'), limitando o custo de renderização.
+    """
+    plt = importar("matplotlib.pyplot")
     
     plt.figure(figsize=(10, 6))
-    plt.plot(X, Y, 'o', label='Dados Originais F(x)', color='black')
+    if modo == "densidade" and len(X) > max_pontos:
+        plt.hexbin(X, Y, gridsize=80, bins='log', cmap='Greys', mincnt=1)
+        plt.plot([], [], 'h', label='Densidade dos Dados F(x)', color='gray')
+    else:
+        X_graf, Y_graf = reduzir_pontos(X, Y, max_pontos, modo)
+        plt.plot(X_graf, Y_graf, 'o', label='Dados Originais F(x)', color='black')
     
     X_plot = np.linspace(X.min(), X.max(), 100)
     
+    estilos = {"Reta": '-', "Parábola": '--', "Exponencial": ':'}
     for res in resultados:
-        ajuste = res["Ajuste"]
-        coefs = res["Coeficientes"]
-        
-        if ajuste == "Reta":
-            Y_plot = coefs[0] + coefs[1] * X_plot
-            plt.plot(X_plot, Y_plot, '-', label=f'Reta (Erro: {res["Erro Quadrático"]:.3f})')
-        
-        elif ajuste == "Parábola":
-            Y_plot = coefs[0] + coefs[1] * X_plot + coefs[2] * (X_plot**2)
-            plt.plot(X_plot, Y_plot, '--', label=f'Parábola (Erro: {res["Erro Quadrático"]:.3f})')
-            
-        elif ajuste == "Exponencial":
-            a = math.exp(coefs[0])
-            b = coefs[1]
-            Y_plot = a * np.exp(b * X_plot)
-            plt.plot(X_plot, Y_plot, ':', label=f'Exponencial (Erro: {res["Erro Quadrático"]:.3f})')
+        Y_plot = res["Modelo"].prever(X_plot)
+        plt.plot(X_plot, Y_plot, estilos[res["Ajuste"]], label=f'{res["Ajuste"]} (Erro: {res["Erro Quadrático"]:.3f})')
             
     plt.title('Regressão por Mínimos Quadrados: Comparação de Ajustes')
     plt.xlabel('X')
@@ -122,8 +542,12 @@ def plotar_ajustes(X, Y, resultados):
     return caminho_grafico
 
 
-def processar_regressao(X, Y):
-    """Executa as 3 regressões e apresenta os resultados."""
+def processar_regressao(X, Y, verificar=False):
+    """
+    Executa as 3 regressões e apresenta os resultados.
+    Os erros de Reta e Parábola vêm das estatísticas suficientes; verificar=True
+    recalcula todos pela passada exata nos resíduos.
+    """
     
     print("\n===================================================================")
     print("       REGRESSÃO POR MÍNIMOS QUADRADOS: RETA, PARÁBOLA E EXPONENCIAL")
@@ -134,11 +558,12 @@ def processar_regressao(X, Y):
     print(f"F(x) (Variável Dependente): {Y}")
     
     resultados = []
+    estado = estatisticas_suficientes(X, Y, "Parábola" if len(X) >= 3 else "Reta")
     
     print("\n\n--- 1. Regressão Linear (Reta) ---")
     try:
-        coefs_linear, Y_ajustado_linear = regressao_linear(X, Y)
-        erro_linear = erro_quadratico(Y, Y_ajustado_linear)
+        coefs_linear = resolver_subsistema(estado, 1)
+        erro_linear = erro_modelo(X, Y, coefs_linear, "Reta", estado, verificar)
         equacao_linear = formatar_polinomio(coefs_linear, "Reta")
         
         print(f"Coeficientes [a0, a1]: {coefs_linear}")
@@ -149,7 +574,8 @@ def processar_regressao(X, Y):
             "Ajuste": "Reta",
             "Equação": equacao_linear,
             "Erro Quadrático": erro_linear,
-            "Coeficientes": coefs_linear
+            "Coeficientes": coefs_linear,
+            "Modelo": ModeloRegressao("Reta", coefs_linear, erro_linear)
         })
     except Exception as e:
         print(f"Erro na Regressão Linear: {e}")
@@ -159,8 +585,8 @@ def processar_regressao(X, Y):
         if len(X) < 3:
             print("Aviso: Mínimo de 3 pontos necessários para regressão quadrática. Ignorando.")
         else:
-            coefs_quadratica, Y_ajustado_quadratica = regressao_quadratica(X, Y)
-            erro_quadratica = erro_quadratico(Y, Y_ajustado_quadratica)
+            coefs_quadratica = resolver_subsistema(estado, 2)
+            erro_quadratica = erro_modelo(X, Y, coefs_quadratica, "Parábola", estado, verificar)
             equacao_quadratica = formatar_polinomio(coefs_quadratica, "Parábola")
             
             print(f"Coeficientes [a0, a1, a2]: {coefs_quadratica}")
@@ -171,15 +597,16 @@ def processar_regressao(X, Y):
                 "Ajuste": "Parábola",
                 "Equação": equacao_quadratica,
                 "Erro Quadrático": erro_quadratica,
-                "Coeficientes": coefs_quadratica
+                "Coeficientes": coefs_quadratica,
+                "Modelo": ModeloRegressao("Parábola", coefs_quadratica, erro_quadratica)
             })
     except Exception as e:
         print(f"Erro na Regressão Quadrática: {e}")
         
     print("\n\n--- 3. Regressão Exponencial ---")
     try:
-        coefs_exp_lin, Y_ajustado_exp = regressao_exponencial(X, Y)
-        erro_exp = erro_quadratico(Y, Y_ajustado_exp)
+        coefs_exp_lin, _ = regressao_em_blocos(blocos_de_arrays(X, Y), "Exponencial")
+        erro_exp = erro_modelo(X, Y, coefs_exp_lin, "Exponencial", estado)
         equacao_exp = formatar_polinomio(coefs_exp_lin, "Exponencial")
         
         print(f"Coeficientes Lineares [ln(a), b]: {coefs_exp_lin}")
@@ -190,7 +617,8 @@ def processar_regressao(X, Y):
             "Ajuste": "Exponencial",
             "Equação": equacao_exp,
             "Erro Quadrático": erro_exp,
-            "Coeficientes": coefs_exp_lin
+            "Coeficientes": coefs_exp_lin,
+            "Modelo": ModeloRegressao("Exponencial", coefs_exp_lin, erro_exp)
         })
     except ValueError as e:
         print(f"Erro na Regressão Exponencial: {e}")
@@ -260,6 +688,31 @@ def input_dados_usuario():
             print(f"Ocorreu um erro: {e}")
             return None
 
+def input_arquivo_grande():
+    """Ajusta os modelos a partir de um arquivo grande (.npy/.csv/.txt), lido em blocos."""
+    print("\n===================================================================")
+    print("              MODO ARQUIVO: DADOS FORA DA MEMÓRIA                  ")
+    print("===================================================================")
+    
+    caminho = input("Caminho do arquivo (.npy, .csv ou .txt) com as colunas X e F(x): ").strip()
+    
+    resultados = []
+    for ajuste in ("Reta", "Parábola", "Exponencial"):
+        try:
+            coefs, estado = regressao_arquivo(caminho, ajuste=ajuste)
+            equacao = formatar_polinomio(coefs, ajuste)
+            print(f"\n--- {ajuste} ---")
+            print(f"Pontos processados: {estado['N']}")
+            print(f"Coeficientes: {coefs}")
+            print(f"Equação de Ajuste: {equacao}")
+            resultados.append((ajuste, equacao))
+        except (OSError, ValueError, np.linalg.LinAlgError) as e:
+            print(f"Erro no ajuste {ajuste}: {e}")
+    
+    if not resultados:
+        print("\nNão foi possível realizar nenhum ajuste.")
+    return None
+
 def main():
     """Função principal para iniciar o programa e apresentar as opções."""
     
@@ -273,19 +726,22 @@ def main():
         print("\nEscolha uma opção:")
         print("1 - Rodar o Exemplo 1 (Dados Originais)")
         print("2 - Inserir novos dados (Modo Interativo)")
-        print("3 - Sair")
+        print("3 - Ajustar a partir de arquivo grande (.npy/.csv/.txt)")
+        print("4 - Sair")
         
-        escolha = input("Sua escolha (1, 2 ou 3): ")
+        escolha = input("Sua escolha (1, 2, 3 ou 4): ")
         
         if escolha == '1':
             caminho_grafico = exemplo_1()
         elif escolha == '2':
             caminho_grafico = input_dados_usuario()
         elif escolha == '3':
+            input_arquivo_grande()
+        elif escolha == '4':
             print("Programa encerrado. Obrigado!")
             break
         else:
-            print("Opção inválida. Por favor, escolha 1, 2 ou 3.")
+            print("Opção inválida. Por favor, escolha 1, 2, 3 ou 4.")
             
     if caminho_grafico:
         print(f"\nO gráfico da última execução foi salvo em: {caminho_grafico}")
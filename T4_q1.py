@@ -1,17 +1,273 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import math
-from sympy import sympify, lambdify
-from sympy.abc import x
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import re
+from collections import OrderedDict
+from leitura_dados import ler_blocos, TAMANHO_BLOCO_PADRAO
+from carregamento import importar
+
+NOMES_PERMITIDOS = (
+    "sin", "cos", "tan", "cot", "sec", "csc", "asin", "acos", "atan", "atan2",
+    "sinh", "cosh", "tanh", "asinh", "acosh", "atanh",
+    "exp", "log", "ln", "sqrt", "cbrt", "root", "Abs", "sign", "floor", "ceiling",
+    "Min", "Max", "Piecewise", "Heaviside", "erf", "erfc", "gamma", "loggamma",
+    "besselj", "bessely", "besseli", "besselk", "pi", "E",
+)
+_AMBIENTE_SYMPY = {}
+
+def ambiente_sympy():
+    """
+    Carrega o SymPy sob demanda (só quem interpreta expressões paga o custo da importação)
+    e monta, uma única vez, as funções permitidas e os globais seguros usados pelo parser.
+    """
+    if not _AMBIENTE_SYMPY:
+        sympy = importar("sympy")
+        funcoes = {nome: getattr(sympy, nome) for nome in NOMES_PERMITIDOS}
+        funcoes["abs"] = sympy.Abs
+        funcoes["e"] = sympy.E
+        globais = {
+            "__builtins__": {},
+            "Integer": sympy.Integer,
+            "Float": sympy.Float,
+            "Rational": sympy.Rational,
+            "Symbol": sympy.Symbol,
+        }
+        _AMBIENTE_SYMPY.update(sympy=sympy, funcoes=funcoes, globais=globais)
+    return _AMBIENTE_SYMPY
+
+_CARACTERES_PERMITIDOS = re.compile(r"^[0-9A-Za-z_+\-*/^().,<>=&| ]*$")
+# Nomes, literais numéricos (onde o ponto é permitido) ou um caractere isolado.
+_TOKENS_EXPRESSAO = re.compile(r"[A-Za-z_][A-Za-z_0-9]*|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|\S")
+
+LIMITE_CACHE_FUNCOES = 256
+_CACHE_FUNCOES = OrderedDict()
+_TRAVA_CACHE_FUNCOES = threading.Lock()
+_CONTADORES_CACHE_FUNCOES = {"Acertos": 0, "Faltas": 0, "Descartes": 0}
+
+def normalizar_expressao(func_str):
+    """Troca '^' por '**' e reduz cada sequência de espaços a um só (o texto continua equivalente)."""
+    return " ".join(str(func_str).replace("^", "**").split())
+
+def interpretar_expressao(func_str, variaveis=("x",)):
+    """
+    Converte a string em expressão SymPy aceitando apenas números, as variáveis
+    indicadas e as funções de NOMES_PERMITIDOS (nada de atributos, índices ou builtins).
+    """
+    texto = normalizar_expressao(func_str)
+    if not texto:
+        raise ValueError("A expressão da função está vazia.")
+    if "__" in texto or not _CARACTERES_PERMITIDOS.match(texto):
+        raise ValueError(f"A expressão contém caracteres não permitidos: {func_str}")
+    if "." in _TOKENS_EXPRESSAO.findall(texto):
+        raise ValueError(f"A expressão não pode acessar atributos (o ponto só é aceito em números): {func_str}")
+
+    ambiente = ambiente_sympy()
+    sympy = ambiente["sympy"]
+    parser = importar("sympy.parsing.sympy_parser")
+    simbolos = {nome: sympy.Symbol(nome) for nome in variaveis}
+    locais = dict(ambiente["funcoes"])
+    locais.update(simbolos)
+    try:
+        expressao = parser.parse_expr(
+            texto,
+            local_dict=locais,
+            global_dict=dict(ambiente["globais"]),
+            transformations=parser.standard_transformations + (parser.convert_xor,),
+        )
+    except NameError:
+        raise ValueError(f"A expressão usa funções não permitidas: {func_str}") from None
+    except (SyntaxError, TypeError, AttributeError, sympy.SympifyError) as e:
+        raise ValueError(f"A expressão da função está mal formada: {func_str}") from e
+
+    if not isinstance(expressao, sympy.Basic):
+        raise ValueError(f"A expressão não define uma função válida: {func_str}")
+    desconhecidos = {str(s) for s in expressao.free_symbols} - set(simbolos)
+    desconhecidos |= {str(f.func) for f in expressao.atoms(sympy.core.function.AppliedUndef)}
+    if desconhecidos:
+        raise ValueError(f"Nomes não reconhecidos na expressão: {', '.join(sorted(desconhecidos))}")
+    return expressao
+
+def compilar_funcao(func_str, variaveis=("x",)):
+    """
+    Devolve (f_vetorizada, expressão) para a string da função, usando um cache LRU
+    compartilhado por todo o processo (e, portanto, por todas as sessões do Streamlit).
+    A busca é feita primeiro pelo texto normalizado; numa falta, a expressão é interpretada e
+    procurada pela forma canônica do SymPy (srepr), de modo que entradas equivalentes
+    ("x^2*3", "3*x**2") compartilham a mesma função. Só expressões novas pagam o lambdify.
+    """
+    variaveis = tuple(variaveis)
+    chave_texto = ("texto", normalizar_expressao(func_str), variaveis)
+    with _TRAVA_CACHE_FUNCOES:
+        compilada = _CACHE_FUNCOES.get(chave_texto)
+        if compilada is not None:
+            _CACHE_FUNCOES.move_to_end(chave_texto)
+            _CONTADORES_CACHE_FUNCOES["Acertos"] += 1
+            return compilada
+
+    expressao = interpretar_expressao(func_str, variaveis)
+    sympy = ambiente_sympy()["sympy"]
+    chave_expressao = ("srepr", sympy.srepr(expressao), variaveis)
+    with _TRAVA_CACHE_FUNCOES:
+        compilada = _CACHE_FUNCOES.get(chave_expressao)
+        _CONTADORES_CACHE_FUNCOES["Acertos" if compilada is not None else "Faltas"] += 1
+
+    if compilada is None:
+        simbolos = [sympy.Symbol(nome) for nome in variaveis]
+        f_lambda = sympy.lambdify(simbolos[0] if len(simbolos) == 1 else simbolos, expressao, ["scipy", "numpy"])
+        compilada = (f_lambda, expressao)
+
+    with _TRAVA_CACHE_FUNCOES:
+        for chave in (chave_expressao, chave_texto):
+            _CACHE_FUNCOES[chave] = compilada
+            _CACHE_FUNCOES.move_to_end(chave)
+        while len(_CACHE_FUNCOES) > LIMITE_CACHE_FUNCOES:
+            _CACHE_FUNCOES.popitem(last=False)
+            _CONTADORES_CACHE_FUNCOES["Descartes"] += 1
+    return compilada
+
+def estatisticas_cache_funcoes():
+    """Contadores do cache de funções compiladas (acertos, faltas, descartes e taxa de acerto)."""
+    with _TRAVA_CACHE_FUNCOES:
+        estatisticas = dict(_CONTADORES_CACHE_FUNCOES)
+        # Cada função pode estar sob duas chaves (texto e srepr): conta as funções distintas.
+        estatisticas["Entradas"] = len({id(compilada) for compilada in _CACHE_FUNCOES.values()})
+    consultas = estatisticas["Acertos"] + estatisticas["Faltas"]
+    estatisticas["Taxa de Acerto"] = estatisticas["Acertos"] / consultas if consultas else 0.0
+    return estatisticas
+
+
+def espacamento_uniforme(X):
+    """Verifica se os pontos X são igualmente espaçados (tolerância relativa ao passo, em qualquer escala)."""
+    h = np.diff(X)
+    return len(h) == 0 or np.allclose(h, h[0], rtol=1e-9, atol=0.0)
+
+def pesos_trapezio(X):
+    """
+    Pesos wi da Regra do Trapézio para pontos X quaisquer (crescentes), de modo que
+    a integral seja Σ wi*yi: wi = (h(i-1) + hi) / 2.
+    Se X for 2D, calcula os pesos de cada linha (uma seção por linha).
+    """
+    h = np.diff(X, axis=-1)
+    pesos = np.zeros(np.shape(X))
+    pesos[..., :-1] += h / 2
+    pesos[..., 1:] += h / 2
+    return pesos
+
+def _pesos_simpson_um_terco(X):
+    """
+    Pesos da Regra de Simpson 1/3 Repetida para pontos X quaisquer com número par de
+    subintervalos. Cada painel [x0, x2], com h0 = x1 - x0 e h1 = x2 - x1, contribui
+    (h0 + h1)/6 * [(2 - h1/h0)*y0 + (h0 + h1)²/(h0*h1)*y1 + (2 - h0/h1)*y2].
+    """
+    h = np.diff(X, axis=-1)
+    h0 = h[..., 0::2]
+    h1 = h[..., 1::2]
+    soma = h0 + h1
+
+    pesos = np.zeros(np.shape(X))
+    pesos[..., 0:-1:2] += soma / 6 * (2 - h1 / h0)
+    pesos[..., 1::2] += soma / 6 * soma**2 / (h0 * h1)
+    pesos[..., 2::2] += soma / 6 * (2 - h0 / h1)
+    return pesos
+
+def pesos_cubica(X, inicio, fim):
+    """
+    Pesos wk tais que Σ wk*yk é a integral, de 'inicio' até 'fim', da cúbica que passa
+    pelos 4 pontos de X (último eixo). Os pesos vêm do sistema de momentos
+    Σ wk*sk^m = ∫ s^m ds (m = 0..3), resolvido na variável normalizada s = (x - x0)/(x3 - x0).
+    """
+    X = np.asarray(X, dtype=float)
+    x0 = X[..., :1]
+    escala = X[..., 3:] - x0
+    s = (X - x0) / escala
+    s_inicio = (np.asarray(inicio, dtype=float)[..., None] - x0) / escala
+    s_fim = (np.asarray(fim, dtype=float)[..., None] - x0) / escala
+
+    m = np.arange(4)
+    vandermonde = s[..., None, :] ** m[:, None]
+    momentos = (s_fim ** (m + 1) - s_inicio ** (m + 1)) / (m + 1)
+    return np.linalg.solve(vandermonde, momentos[..., None])[..., 0] * escala
+
+def pesos_tres_oitavos(X):
+    """
+    Pesos da Regra de Simpson 3/8 em um painel de 4 pontos quaisquer (cúbica de Lagrange).
+    Com espaçamento constante os pesos se reduzem a 3h/8 * [1, 3, 3, 1].
+    """
+    X = np.asarray(X, dtype=float)
+    return pesos_cubica(X, X[..., 0], X[..., 3])
+
+def pesos_simpson(X):
+    """
+    Pesos wi da Regra de Simpson Repetida para pontos X quaisquer (N >= 3).
+    Com número par de subintervalos é a Simpson 1/3 Repetida; com número ímpar, o último
+    painel de 3 subintervalos usa a Regra de 3/8, mantendo a ordem de precisão sem reamostrar.
+    Com espaçamento constante os pesos se reduzem a h/3 * [1, 4, 2, 4, ..., 2, 4, 1].
+    Se X for 2D, calcula os pesos de cada linha (uma seção por linha).
+    """
+    N = np.shape(X)[-1]
+    if (N - 1) % 2 == 0:
+        return _pesos_simpson_um_terco(X)
+
+    pesos = np.zeros(np.shape(X))
+    if N > 4:
+        pesos[..., :N - 3] = _pesos_simpson_um_terco(X[..., :N - 3])
+    pesos[..., N - 4:] += pesos_tres_oitavos(X[..., N - 4:])
+    return pesos
+
+def simpson_uniforme(Y, h):
+    """
+    Simpson Repetida com espaçamento constante h: 1/3 nos primeiros painéis e, se o número
+    de subintervalos for ímpar, 3/8 nos três últimos.
+    """
+    N = len(Y)
+    integral = 0.0
+    fim = N if (N - 1) % 2 == 0 else N - 3
+    if fim >= 3:
+        soma_impares = np.sum(Y[1:fim - 1:2])
+        soma_pares = np.sum(Y[2:fim - 1:2])
+        integral = (h / 3) * (Y[0] + 4 * soma_impares + 2 * soma_pares + Y[fim - 1])
+    if fim < N:
+        integral += (3 * h / 8) * (Y[-4] + 3 * Y[-3] + 3 * Y[-2] + Y[-1])
+    return integral
+
+def nome_regra_simpson(N):
+    """Nome da regra de Simpson aplicada a N pontos (1/3, ou 1/3 + 3/8 se N-1 for ímpar)."""
+    return "Simpson 1/3 Repetida" if (N - 1) % 2 == 0 else "Simpson 1/3 + 3/8"
+
+def regra_trapezio_nao_uniforme(X, Y):
+    """
+    Calcula a integral pela Regra do Trapézio com espaçamento variável.
+    Y pode ser 2D (uma série por linha); o resultado é o produto Y @ w.
+    """
+    N = len(X)
+    if N < 2:
+        return None, "Erro: Mínimo de 2 pontos necessários para a Regra do Trapézio."
+    return np.asarray(Y) @ pesos_trapezio(X), None
+
+def regra_simpson_nao_uniforme(X, Y):
+    """
+    Calcula a integral pela Regra de Simpson Repetida com espaçamento variável,
+    usando pesos por painel (3/8 no último painel se N-1 for ímpar).
+    """
+    N = len(X)
+    if N < 3:
+        return None, "Erro: Mínimo de 3 pontos necessários para a Regra de Simpson."
+    return np.asarray(Y) @ pesos_simpson(X), None
 
 def regra_trapezio_repetida(X, Y):
     """
     Calcula a integral usando a Regra do Trapézio Repetida.
-    Assume que os pontos X são igualmente espaçados.
+    Se os pontos X não forem igualmente espaçados, usa a versão com espaçamento variável.
     """
     N = len(X)
     if N < 2:
         return None, "Erro: Mínimo de 2 pontos necessários para a Regra do Trapézio."
+    if not espacamento_uniforme(X):
+        return regra_trapezio_nao_uniforme(X, Y)
     
     h = X[1] - X[0]
     soma_interna = np.sum(Y[1:-1])
@@ -21,24 +277,1071 @@ def regra_trapezio_repetida(X, Y):
 def regra_simpson_repetida(X, Y):
     """
     Calcula a integral usando a Regra de Simpson 1/3 Repetida.
-    Assume que os pontos X são igualmente espaçados e o número de subintervalos (N-1) é par.
+    Se o número de subintervalos (N-1) for ímpar, o último painel usa a Regra de 3/8.
+    Se os pontos X não forem igualmente espaçados, usa a versão com pesos por painel.
     """
     N = len(X)
     if N < 3:
         return None, "Erro: Mínimo de 3 pontos necessários para a Regra de Simpson."
-    
-    if (N - 1) % 2 != 0:
-        return None, "Erro: O número de subintervalos (N-1) deve ser par para a Regra de Simpson Repetida."
+    if not espacamento_uniforme(X):
+        return regra_simpson_nao_uniforme(X, Y)
         
-    h = X[1] - X[0]
-    soma_impares = np.sum(Y[1:-1:2])
-    soma_pares = np.sum(Y[2:-1:2])
-    integral = (h / 3) * (Y[0] + 4 * soma_impares + 2 * soma_pares + Y[-1])
-    return integral, None
+    return simpson_uniforme(Y, X[1] - X[0]), None
+
+
+def erro_estimado_trapezio(X, Y):
+    """
+    Estimativa a posteriori do erro da Regra do Trapézio, sem novas avaliações de f.
+    Com número par de subintervalos usa Richardson com a malha de passo 2h (pontos alternados):
+    E ≈ (T(h) - T(2h)) / 3. Caso contrário, usa a diferença para a Regra de Simpson: E ≈ S - T.
+    Retorna o valor absoluto da estimativa (NaN se não houver pontos suficientes).
+    """
+    N = len(X)
+    if N < 3:
+        return np.nan
+    T, _ = regra_trapezio_repetida(X, Y)
+    if (N - 1) % 2 == 0:
+        T_grossa, _ = regra_trapezio_repetida(X[::2], Y[::2])
+        return float(abs(T - T_grossa) / 3)
+    S, _ = regra_simpson_repetida(X, Y)
+    return float(abs(S - T))
+
+def erro_estimado_simpson(X, Y):
+    """
+    Estimativa a posteriori do erro da Regra de Simpson, sem novas avaliações de f.
+    Usa Richardson com a malha de passo 2h: E ≈ (S(h) - S(2h)) / 15. Com número ímpar de
+    subintervalos, a estimativa é feita na parte coberta pela Regra de 1/3 e estendida ao
+    painel de 3/8, cujo erro por unidade de comprimento é 9/4 do de 1/3 (h⁴/80 contra h⁴/180).
+    Retorna o valor absoluto da estimativa (NaN se não houver pontos suficientes).
+    """
+    N = len(X)
+    fim = N if (N - 1) % 2 == 0 else N - 3
+    if fim < 5:
+        return np.nan
+    S, _ = regra_simpson_repetida(X[:fim], Y[:fim])
+    S_grossa, _ = regra_simpson_repetida(X[:fim:2], Y[:fim:2])
+    erro = abs(S - S_grossa) / 15
+    if fim < N:
+        comprimento = X[fim - 1] - X[0]
+        erro *= (comprimento + 9 / 4 * (X[-1] - X[fim - 1])) / comprimento
+    return float(erro)
+
+def avaliar_funcao(f, X):
+    """Avalia f (vetorizada) em X, garantindo um array float do mesmo formato (ex.: f constante)."""
+    Y = np.asarray(f(X), dtype=float)
+    if Y.shape != np.shape(X):
+        Y = np.broadcast_to(Y, np.shape(X)).copy()
+    return Y
+
+PONTOS_SONDA = 4096
+TEMPO_MINIMO_POR_TRABALHADOR = 0.05
+BLOCOS_POR_TRABALHADOR = 4
+MODOS_PARALELOS = ("threads", "processos")
+_POOLS = {}
+_TRAVA_POOLS = threading.Lock()
+
+def numero_nucleos():
+    """Número de núcleos de CPU disponíveis para este processo."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def escolher_trabalhadores(tempo_por_ponto, n_pontos, max_trabalhadores=None):
+    """
+    Número de trabalhadores que compensa o custo de distribuir os blocos: cada trabalhador
+    deve receber pelo menos TEMPO_MINIMO_POR_TRABALHADOR segundos de cálculo.
+    Funções baratas (ou malhas pequenas) ficam em 1 trabalhador, isto é, sem paralelismo.
+    """
+    if max_trabalhadores is None:
+        max_trabalhadores = numero_nucleos()
+    tempo_total = tempo_por_ponto * n_pontos
+    return int(max(1, min(max_trabalhadores, tempo_total // TEMPO_MINIMO_POR_TRABALHADOR)))
+
+def _obter_pool(modo, n_trabalhadores):
+    """Pool de threads ou de processos reaproveitado entre chamadas (criado sob demanda)."""
+    chave = (modo, n_trabalhadores)
+    with _TRAVA_POOLS:
+        pool = _POOLS.get(chave)
+        if pool is None:
+            if modo == "threads":
+                pool = ThreadPoolExecutor(max_workers=n_trabalhadores)
+            else:
+                pool = ProcessPoolExecutor(max_workers=n_trabalhadores,
+                                           mp_context=multiprocessing.get_context("spawn"))
+            _POOLS[chave] = pool
+        return pool
+
+def _avaliar_bloco_processo(func_str, X_bloco):
+    """Avalia um bloco em outro processo: a função é recompilada ali a partir da string (com cache)."""
+    f, _ = compilar_funcao(func_str)
+    return avaliar_funcao(f, X_bloco)
+
+def avaliar_funcao_paralela(f, X, func_str=None, modo="threads", n_trabalhadores=None):
+    """
+    Avalia f em X dividindo a malha em blocos executados em um pool de threads ou de processos.
+    Os resultados são gravados diretamente nas fatias de um único array Y pré-alocado.
+    Se n_trabalhadores não for dado, o custo por ponto é medido em uma pequena sonda
+    (cujo resultado já é aproveitado em Y) e usado para decidir quantos trabalhadores usar.
+    O modo 'processos' exige a string da função (func_str), pois a função compilada
+    não pode ser enviada a outro processo.
+    """
+    if modo not in MODOS_PARALELOS:
+        raise ValueError(f"Modo '{modo}' desconhecido. Use um de {MODOS_PARALELOS}.")
+    if modo == "processos" and func_str is None:
+        raise ValueError("O modo 'processos' requer a expressão da função (func_str).")
+
+    X = np.asarray(X, dtype=float)
+    N = len(X)
+    Y = np.empty(N)
+
+    sonda = min(N, PONTOS_SONDA)
+    inicio_sonda = time.perf_counter()
+    Y[:sonda] = avaliar_funcao(f, X[:sonda])
+    tempo_por_ponto = (time.perf_counter() - inicio_sonda) / max(sonda, 1)
+    if sonda == N:
+        return Y
+
+    if n_trabalhadores is None:
+        n_trabalhadores = escolher_trabalhadores(tempo_por_ponto, N - sonda)
+    if n_trabalhadores <= 1:
+        Y[sonda:] = avaliar_funcao(f, X[sonda:])
+        return Y
+
+    limites = np.linspace(sonda, N, n_trabalhadores * BLOCOS_POR_TRABALHADOR + 1).astype(int)
+    fatias = [slice(i, j) for i, j in zip(limites[:-1], limites[1:]) if j > i]
+    pool = _obter_pool(modo, n_trabalhadores)
+
+    if modo == "threads":
+        def avaliar_fatia(fatia):
+            Y[fatia] = avaliar_funcao(f, X[fatia])
+        for tarefa in [pool.submit(avaliar_fatia, fatia) for fatia in fatias]:
+            tarefa.result()
+    else:
+        tarefas = [(fatia, pool.submit(_avaliar_bloco_processo, func_str, X[fatia])) for fatia in fatias]
+        for fatia, tarefa in tarefas:
+            Y[fatia] = tarefa.result()
+    return Y
+
+def _resultado_adaptativo(integral, erro_estimado, X_nos, Y_nos, niveis):
+    """Monta o resultado das integrações adaptativas, com os nós avaliados em ordem crescente."""
+    X_nos = np.concatenate(X_nos)
+    Y_nos = np.concatenate(Y_nos)
+    ordem = np.argsort(X_nos, kind="stable")
+    return {
+        "Integral": float(integral),
+        "Erro Estimado": float(erro_estimado),
+        "Avaliações": len(X_nos),
+        "Níveis": niveis,
+        "X": X_nos[ordem],
+        "Y": Y_nos[ordem],
+    }
+
+def integrar_simpson_adaptativo(f, a, b, tol=1e-8, max_niveis=50, max_avaliacoes=2_000_000):
+    """
+    Integra f em [a, b] pela Regra de Simpson adaptativa até a tolerância 'tol'.
+    O refinamento é feito nível a nível: todos os intervalos ainda não convergidos
+    são divididos ao mesmo tempo e f é avaliada uma única vez, em lote, nos novos
+    pontos médios. Os valores já calculados nas extremidades e no meio de cada
+    intervalo são herdados pelos subintervalos, de modo que nenhum nó é avaliado duas vezes.
+    Retorna (resultado, None) ou (None, mensagem de erro).
+    """
+    if b <= a:
+        return None, "Erro: O limite superior 'b' deve ser maior que o limite inferior 'a'."
+
+    X_nos = [np.array([a, (a + b) / 2, b])]
+    Y_nos = [avaliar_funcao(f, X_nos[0])]
+    fa, fm, fb = (np.array([v]) for v in Y_nos[0])
+    if not np.all(np.isfinite(Y_nos[0])):
+        return None, "Erro: A função resultou em valores inválidos (ex: divisão por zero) no intervalo."
+
+    esq = np.array([a], dtype=float)
+    fim = np.array([b], dtype=float)
+    S = (fim - esq) / 6 * (fa + 4 * fm + fb)
+    tols = np.array([tol])
+    integral = 0.0
+    erro_estimado = 0.0
+
+    for nivel in range(1, max_niveis + 1):
+        meio = (esq + fim) / 2
+        novos_x = np.concatenate([(esq + meio) / 2, (meio + fim) / 2])
+        novos_y = avaliar_funcao(f, novos_x)
+        if not np.all(np.isfinite(novos_y)):
+            return None, "Erro: A função resultou em valores inválidos (ex: divisão por zero) no intervalo."
+        X_nos.append(novos_x)
+        Y_nos.append(novos_y)
+
+        m = len(esq)
+        f_esq_meio, f_dir_meio = novos_y[:m], novos_y[m:]
+        S_esq = (meio - esq) / 6 * (fa + 4 * f_esq_meio + fm)
+        S_dir = (fim - meio) / 6 * (fm + 4 * f_dir_meio + fb)
+        diferenca = S_esq + S_dir - S
+
+        convergiu = np.abs(diferenca) <= 15 * tols
+        total_avaliacoes = sum(len(v) for v in X_nos)
+        if nivel == max_niveis or total_avaliacoes >= max_avaliacoes:
+            convergiu[:] = True
+
+        integral += np.sum(S_esq[convergiu] + S_dir[convergiu] + diferenca[convergiu] / 15)
+        erro_estimado += np.sum(np.abs(diferenca[convergiu])) / 15
+
+        ativo = ~convergiu
+        if not np.any(ativo):
+            return _resultado_adaptativo(integral, erro_estimado, X_nos, Y_nos, nivel), None
+
+        esq, meio, fim = esq[ativo], meio[ativo], fim[ativo]
+        fa, fm, fb = fa[ativo], fm[ativo], fb[ativo]
+        f_esq_meio, f_dir_meio = f_esq_meio[ativo], f_dir_meio[ativo]
+        S_esq, S_dir, tols = S_esq[ativo], S_dir[ativo], tols[ativo] / 2
+
+        esq, fim = np.concatenate([esq, meio]), np.concatenate([meio, fim])
+        fa, fb = np.concatenate([fa, fm]), np.concatenate([fm, fb])
+        fm = np.concatenate([f_esq_meio, f_dir_meio])
+        S = np.concatenate([S_esq, S_dir])
+        tols = np.concatenate([tols, tols])
+
+    return _resultado_adaptativo(integral, erro_estimado, X_nos, Y_nos, max_niveis), None
+
+
+def integrar_romberg(f, a, b, tol=1e-8, max_niveis=20):
+    """
+    Integração de Romberg sobre a Regra do Trapézio Repetida.
+    A cada nível a malha é dobrada e f é avaliada apenas nos novos pontos médios;
+    a soma anterior é reaproveitada: T(h/2) = T(h)/2 + (h/2)*Σ f(novos pontos).
+    A extrapolação de Richardson monta a tabela R[k][j], e o erro estimado em cada
+    nível é |R[k][k] - R[k-1][k-1]|; o processo para sozinho quando fica abaixo de 'tol'.
+    Retorna (resultado, None) ou (None, mensagem de erro).
+    """
+    if b <= a:
+        return None, "Erro: O limite superior 'b' deve ser maior que o limite inferior 'a'."
+
+    X0 = np.array([a, b], dtype=float)
+    Y0 = avaliar_funcao(f, X0)
+    if not np.all(np.isfinite(Y0)):
+        return None, "Erro: A função resultou em valores inválidos (ex: divisão por zero) no intervalo."
+
+    T, _ = regra_trapezio_repetida(X0, Y0)
+    tabela = [[T]]
+    historico = []
+    X_nos, Y_nos = [X0], [Y0]
+    h = b - a
+    erro = np.inf
+    avaliacoes = 2
+
+    for k in range(1, max_niveis + 1):
+        novos_x = a + h * (np.arange(2**(k - 1)) + 0.5)
+        novos_y = avaliar_funcao(f, novos_x)
+        if not np.all(np.isfinite(novos_y)):
+            return None, "Erro: A função resultou em valores inválidos (ex: divisão por zero) no intervalo."
+        X_nos.append(novos_x)
+        Y_nos.append(novos_y)
+        avaliacoes += len(novos_x)
+
+        linha = [tabela[-1][0] / 2 + (h / 2) * np.sum(novos_y)]
+        h /= 2
+        for j in range(1, k + 1):
+            linha.append(linha[j - 1] + (linha[j - 1] - tabela[-1][j - 1]) / (4**j - 1))
+
+        erro = abs(linha[-1] - tabela[-1][-1])
+        tabela.append(linha)
+        historico.append({
+            "Nível": k,
+            "n": 2**k,
+            "Avaliações": avaliacoes,
+            "Trapézio": linha[0],
+            "Romberg R(k,k)": linha[-1],
+            "Erro Estimado": erro,
+        })
+
+        if k >= 2 and erro <= tol:
+            break
+
+    resultado = _resultado_adaptativo(tabela[-1][-1], erro, X_nos, Y_nos, len(historico))
+    resultado["Histórico"] = historico
+    resultado["Tabela"] = tabela
+    return resultado, None
+
+
+def integrar_malha_automatica(f, a, b, tol=1e-8, n_inicial=8, max_n=2**22):
+    """
+    Escolhe n automaticamente: a malha uniforme é dobrada (avaliando f só nos novos pontos
+    médios) até que a estimativa de erro de Simpson por Richardson, obtida das próprias
+    amostras (erro_estimado_simpson), fique abaixo de 'tol'.
+    Retorna (resultado, None) ou (None, mensagem de erro); o resultado traz a malha final em X e Y.
+    """
+    if b <= a:
+        return None, "Erro: O limite superior 'b' deve ser maior que o limite inferior 'a'."
+
+    n = max(4, 2 * ((n_inicial + 1) // 2))
+    X = np.linspace(a, b, n + 1)
+    Y = avaliar_funcao(f, X)
+    historico = []
+
+    while True:
+        if not np.all(np.isfinite(Y)):
+            return None, "Erro: A função resultou em valores inválidos (ex: divisão por zero) no intervalo."
+        simpson, _ = regra_simpson_repetida(X, Y)
+        erro = erro_estimado_simpson(X, Y)
+        historico.append({
+            "Nível": len(historico) + 1,
+            "n": n,
+            "Avaliações": n + 1,
+            "Trapézio": regra_trapezio_repetida(X, Y)[0],
+            "Simpson": simpson,
+            "Erro Estimado": erro,
+        })
+        if erro <= tol or 2 * n > max_n:
+            break
+
+        novos_x = (X[:-1] + X[1:]) / 2
+        novos_y = avaliar_funcao(f, novos_x)
+        X_fino = np.empty(2 * n + 1)
+        Y_fino = np.empty(2 * n + 1)
+        X_fino[0::2], X_fino[1::2] = X, novos_x
+        Y_fino[0::2], Y_fino[1::2] = Y, novos_y
+        X, Y, n = X_fino, Y_fino, 2 * n
+
+    resultado = _resultado_adaptativo(simpson, erro, [X], [Y], len(historico))
+    resultado["Histórico"] = historico
+    return resultado, None
+
+
+_XGK = np.array([
+    0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+    0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+    0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+    0.207784955007898467600689403773245, 0.0,
+])
+_WGK = np.array([
+    0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649, 0.209482141084727828012999174891714,
+])
+_WG = np.array([
+    0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+    0.381830050505118944950369775488975, 0.417959183673469387755102040816327,
+])
+
+NOS_KRONROD_15 = np.concatenate([-_XGK[:-1], _XGK[::-1]])
+PESOS_KRONROD_15 = np.concatenate([_WGK[:-1], _WGK[::-1]])
+PESOS_GAUSS_7 = np.zeros(15)
+PESOS_GAUSS_7[[1, 3, 5, 7, 9, 11, 13]] = np.concatenate([_WG[:-1], _WG[::-1]])
+
+def integrar_gauss_kronrod(f, a, b, tol=1e-8, max_niveis=50, max_avaliacoes=2_000_000):
+    """
+    Integra f em [a, b] pela quadratura adaptativa de Gauss-Kronrod 7-15.
+    Em cada nível, os 15 nós de todos os intervalos ativos são avaliados em um único
+    lote; o erro de cada intervalo é |K15 - G7| (os nós de Gauss são um subconjunto
+    dos de Kronrod). Intervalos cujo erro excede a parcela proporcional de 'tol' são bissectados.
+    Retorna (resultado, None) ou (None, mensagem de erro).
+    """
+    if b <= a:
+        return None, "Erro: O limite superior 'b' deve ser maior que o limite inferior 'a'."
+
+    esq = np.array([a], dtype=float)
+    fim = np.array([b], dtype=float)
+    X_nos, Y_nos = [], []
+    integral = 0.0
+    erro_estimado = 0.0
+
+    for nivel in range(1, max_niveis + 1):
+        centro = (esq + fim) / 2
+        raio = (fim - esq) / 2
+        nos = centro[:, None] + raio[:, None] * NOS_KRONROD_15
+        valores = avaliar_funcao(f, nos.ravel()).reshape(nos.shape)
+        if not np.all(np.isfinite(valores)):
+            return None, "Erro: A função resultou em valores inválidos (ex: divisão por zero) no intervalo."
+        X_nos.append(nos.ravel())
+        Y_nos.append(valores.ravel())
+
+        K = raio * (valores @ PESOS_KRONROD_15)
+        G = raio * (valores @ PESOS_GAUSS_7)
+        erros = np.abs(K - G)
+
+        convergiu = erros <= tol * (fim - esq) / (b - a)
+        if nivel == max_niveis or sum(len(v) for v in X_nos) >= max_avaliacoes:
+            convergiu[:] = True
+
+        integral += np.sum(K[convergiu])
+        erro_estimado += np.sum(erros[convergiu])
+
+        ativo = ~convergiu
+        if not np.any(ativo):
+            return _resultado_adaptativo(integral, erro_estimado, X_nos, Y_nos, nivel), None
+
+        esq, centro, fim = esq[ativo], centro[ativo], fim[ativo]
+        esq, fim = np.concatenate([esq, centro]), np.concatenate([centro, fim])
+
+    return _resultado_adaptativo(integral, erro_estimado, X_nos, Y_nos, max_niveis), None
+
+
+def trapezio_acumulado(X, Y):
+    """
+    Área acumulada A(xi) = ∫ de x0 até xi pela Regra do Trapézio, com A(x0) = 0,
+    calculada em uma única passada (cumsum). Retorna (array, None) ou (None, mensagem de erro).
+    """
+    if len(X) < 2:
+        return None, "Erro: Mínimo de 2 pontos necessários para a Regra do Trapézio."
+    acumulado = np.zeros(len(X))
+    np.cumsum(np.diff(X) * (Y[:-1] + Y[1:]) / 2, out=acumulado[1:])
+    return acumulado, None
+
+def simpson_acumulado(X, Y):
+    """
+    Área acumulada pela Regra de Simpson: cada subintervalo é integrado pela parábola
+    que passa pelos três pontos do seu painel (primeira ou segunda metade), de modo que
+    nos nós pares o valor coincide com a Regra de Simpson 1/3 Repetida. Quando N-1 é
+    ímpar, os três últimos subintervalos são integrados pela cúbica do painel de 3/8,
+    e o valor final coincide com regra_simpson_repetida.
+    Aceita espaçamento variável. Retorna (array, None) ou (None, mensagem de erro).
+    """
+    N = len(X)
+    if N < 3:
+        return None, "Erro: Mínimo de 3 pontos necessários para a Regra de Simpson."
+
+    X = np.asarray(X, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+    h = np.diff(X)
+    parciais = np.empty(N - 1)
+    fim = N - 1 if (N - 1) % 2 == 0 else N - 4
+
+    i = np.arange(0, fim, 2)
+    h0, h1 = h[i], h[i + 1]
+    soma = h0 + h1
+    parciais[i] = (Y[i] * h0 * (2 * h0 + 3 * h1) / (6 * soma)
+                   + Y[i + 1] * h0 * (h0 + 3 * h1) / (6 * h1)
+                   - Y[i + 2] * h0**3 / (6 * h1 * soma))
+
+    j = i + 1
+    h0, h1 = h[j - 1], h[j]
+    soma = h0 + h1
+    parciais[j] = (-Y[j - 1] * h1**3 / (6 * h0 * soma)
+                   + Y[j] * h1 * (3 * h0 + h1) / (6 * h0)
+                   + Y[j + 1] * h1 * (3 * h0 + 2 * h1) / (6 * soma))
+
+    if fim < N - 1:
+        painel = X[N - 4:]
+        parciais[fim:] = pesos_cubica(np.broadcast_to(painel, (3, 4)), painel[:3], painel[1:]) @ Y[N - 4:]
+
+    acumulado = np.zeros(N)
+    np.cumsum(parciais, out=acumulado[1:])
+    return acumulado, None
+
+def posicao_para_area(X, Y, acumulado, areas):
+    """
+    Posição x em que a área acumulada atinge cada valor de 'areas' (vetorizado).
+    O intervalo é localizado por busca binária em 'acumulado' e, dentro dele, a posição
+    é obtida resolvendo a área do perfil linear entre as amostras (exato para o Trapézio).
+    Áreas fora de [0, área total] resultam em NaN. Requer Y >= 0 (área não decrescente).
+    """
+    if np.any(np.diff(acumulado) < 0):
+        raise ValueError("A área acumulada deve ser não decrescente (valores de Y não negativos).")
+
+    areas = np.asarray(areas, dtype=float)
+    i = np.clip(np.searchsorted(acumulado, areas, side="left") - 1, 0, len(X) - 2)
+    h = X[i + 1] - X[i]
+    y0 = Y[i]
+    inclinacao = (Y[i + 1] - Y[i]) / h
+    resto = np.maximum(areas - acumulado[i], 0.0)
+
+    raiz = np.sqrt(np.maximum(y0**2 + 2 * inclinacao * resto, 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(y0 + raiz > 0, 2 * resto / (y0 + raiz), 0.0)
+    posicoes = X[i] + np.clip(t, 0.0, h)
+
+    fora = (areas < 0) | (areas > acumulado[-1])
+    return np.where(fora, np.nan, posicoes)
+
+def posicao_fracao_area(X, Y, fracao=0.5):
+    """Posição em que a área acumulada (Trapézio) atinge a fração dada da área total (ex.: 0.5 = meia área)."""
+    acumulado, erro = trapezio_acumulado(X, Y)
+    if erro:
+        return None, erro
+    if np.any(Y < 0):
+        return None, "Erro: A busca por área acumulada requer valores de Y não negativos."
+    return posicao_para_area(X, Y, acumulado, fracao * acumulado[-1]), None
+
+
+REGRAS_AREA = ("Trapézio", "Simpson")
+METODOS_VOLUME = ("Áreas Médias", "Prismoidal")
+
+def areas_secoes(X, Y, regra="Trapézio"):
+    """
+    Áreas de várias seções transversais de uma só vez.
+    Y é uma matriz (seções x verticais); X pode ser 1D (verticais comuns a todas as seções)
+    ou 2D (verticais próprias de cada seção). Com X 1D a área é o produto Y @ w, sem laço.
+    Seções com números diferentes de verticais podem ser passadas como listas de arrays
+    (ver areas_secoes_irregulares). Retorna (array de áreas, None) ou (None, mensagem de erro).
+    """
+    if isinstance(Y, (list, tuple)) and len({len(y) for y in Y}) > 1:
+        return areas_secoes_irregulares(X, Y, regra)
+
+    X = np.asarray(X, dtype=float)
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    if X.shape[-1] != Y.shape[-1]:
+        return None, "Erro: X e Y devem ter o mesmo número de verticais."
+    N = Y.shape[-1]
+
+    if regra == "Trapézio":
+        if N < 2:
+            return None, "Erro: Mínimo de 2 pontos necessários para a Regra do Trapézio."
+        pesos = pesos_trapezio(X)
+    elif regra == "Simpson":
+        if N < 3:
+            return None, "Erro: Mínimo de 3 pontos necessários para a Regra de Simpson."
+        pesos = pesos_simpson(X)
+    else:
+        return None, f"Erro: Regra '{regra}' desconhecida. Use uma de {REGRAS_AREA}."
+
+    if X.ndim == 1:
+        return Y @ pesos, None
+    return np.einsum("ij,ij->i", Y, pesos), None
+
+def areas_secoes_irregulares(secoes_X, secoes_Y, regra="Trapézio"):
+    """
+    Áreas de seções com números diferentes de verticais (listas de arrays).
+    As seções são concatenadas em um único vetor e as contribuições de cada subintervalo
+    (ou painel de Simpson) são somadas por seção com np.bincount, sem laço em Python.
+    """
+    comprimentos = np.array([len(x) for x in secoes_X])
+    if len(secoes_Y) != len(comprimentos) or any(len(y) != n for y, n in zip(secoes_Y, comprimentos)):
+        return None, "Erro: Cada seção deve ter o mesmo número de valores em X e Y."
+
+    X = np.concatenate(secoes_X).astype(float)
+    Y = np.concatenate(secoes_Y).astype(float)
+    secao = np.repeat(np.arange(len(comprimentos)), comprimentos)
+    local = np.arange(len(X)) - np.repeat(np.cumsum(comprimentos) - comprimentos, comprimentos)
+
+    if regra == "Trapézio":
+        if np.any(comprimentos < 2):
+            return None, "Erro: Mínimo de 2 pontos necessários para a Regra do Trapézio."
+        i = np.flatnonzero(secao[:-1] == secao[1:])
+        contribuicoes = (X[i + 1] - X[i]) * (Y[i] + Y[i + 1]) / 2
+    elif regra == "Simpson":
+        if np.any(comprimentos < 3):
+            return None, "Erro: Mínimo de 3 pontos necessários para a Regra de Simpson."
+        # Seções com número ímpar de subintervalos terminam em um painel de 3/8 de 4 pontos.
+        fim_um_terco = np.where((comprimentos - 1) % 2 == 0, comprimentos - 1, comprimentos - 4)
+        i = np.flatnonzero((local % 2 == 0) & (local + 2 <= fim_um_terco[secao]))
+        h0 = X[i + 1] - X[i]
+        h1 = X[i + 2] - X[i + 1]
+        soma = h0 + h1
+        contribuicoes = soma / 6 * ((2 - h1 / h0) * Y[i] + soma**2 / (h0 * h1) * Y[i + 1] + (2 - h0 / h1) * Y[i + 2])
+
+        impares = np.flatnonzero((comprimentos - 1) % 2 != 0)
+        if len(impares):
+            k = (np.cumsum(comprimentos) - 4)[impares, None] + np.arange(4)
+            tres_oitavos = np.einsum("ij,ij->i", pesos_tres_oitavos(X[k]), Y[k])
+            i = np.concatenate([i, k[:, 0]])
+            contribuicoes = np.concatenate([contribuicoes, tres_oitavos])
+    else:
+        return None, f"Erro: Regra '{regra}' desconhecida. Use uma de {REGRAS_AREA}."
+
+    return np.bincount(secao[i], weights=contribuicoes, minlength=len(comprimentos)), None
+
+def volume_trecho(estacoes, areas, metodo="Áreas Médias"):
+    """
+    Volume de um trecho a partir das áreas das seções e das suas posições (estações) ao longo do rio.
+    'Áreas Médias': V = Σ (Ai + Ai+1)/2 * Li (Trapézio sobre as estações).
+    'Prismoidal': Simpson sobre as estações (1/3, com 3/8 no último painel se o número de
+    intervalos for ímpar; aceita espaçamento variável).
+    """
+    estacoes = np.asarray(estacoes, dtype=float)
+    areas = np.asarray(areas, dtype=float)
+    if len(estacoes) != len(areas):
+        return None, "Erro: O número de estações deve ser igual ao número de seções."
+    if np.any(np.diff(estacoes) <= 0):
+        return None, "Erro: As estações devem estar em ordem estritamente crescente."
+
+    if metodo == "Áreas Médias":
+        return regra_trapezio_nao_uniforme(estacoes, areas)
+    if metodo == "Prismoidal":
+        return regra_simpson_nao_uniforme(estacoes, areas)
+    return None, f"Erro: Método '{metodo}' desconhecido. Use um de {METODOS_VOLUME}."
+
+def calcular_trecho(estacoes, X, Y, regra="Trapézio", metodo="Áreas Médias"):
+    """
+    Calcula de uma só vez as áreas de todas as seções de um levantamento e o volume do trecho.
+    Retorna ({"Áreas": array, "Volume": float}, None) ou (None, mensagem de erro).
+    """
+    areas, erro = areas_secoes(X, Y, regra)
+    if erro:
+        return None, erro
+    volume, erro = volume_trecho(estacoes, areas, metodo)
+    if erro:
+        return None, erro
+    return {"Áreas": areas, "Volume": float(volume)}, None
+
+
+LIMITE_ELEMENTOS_COTAS = 2_000_000
+
+def cotas_do_leito(Y):
+    """
+    Converte profundidades medidas (como no Exemplo 1) em cotas do leito, tomando como
+    zero o ponto mais profundo da seção: a cota de um nível d'água passa a ser a sua altura
+    sobre o talvegue.
+    """
+    Y = np.asarray(Y, dtype=float)
+    return Y.max() - Y
+
+def geometria_molhada(X, Z, cotas):
+    """
+    Área molhada, perímetro molhado e largura superficial exatos da seção de leito linear por
+    partes (X, Z) para cada nível d'água em 'cotas' (vetorizado).
+    Em cada segmento a lâmina h - z é recortada em zero: segmentos submersos contribuem
+    inteiros e segmentos parcialmente submersos apenas a parte abaixo do nível.
+    Acima das margens, a seção é limitada ao trecho levantado (sem paredes laterais).
+    """
+    X = np.asarray(X, dtype=float)
+    Z = np.asarray(Z, dtype=float)
+    cotas = np.atleast_1d(np.asarray(cotas, dtype=float))
+    dx = np.diff(X)
+    comprimento = np.hypot(dx, np.diff(Z))
+
+    area = np.empty(len(cotas))
+    perimetro = np.empty(len(cotas))
+    largura = np.empty(len(cotas))
+    passo = max(1, LIMITE_ELEMENTOS_COTAS // len(X))
+    for inicio in range(0, len(cotas), passo):
+        fatia = slice(inicio, inicio + passo)
+        lamina = cotas[fatia, None] - Z[None, :]
+        d0, d1 = lamina[:, :-1], lamina[:, 1:]
+        maior = np.maximum(d0, d1)
+        menor = np.minimum(d0, d1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fracao = np.where(menor >= 0, 1.0, np.where(maior > 0, maior / (maior - menor), 0.0))
+        profundidade_media = np.where(menor >= 0, (d0 + d1) / 2, maior / 2)
+
+        area[fatia] = (fracao * dx * profundidade_media).sum(axis=1)
+        perimetro[fatia] = (fracao * comprimento).sum(axis=1)
+        largura[fatia] = (fracao * dx).sum(axis=1)
+    return area, perimetro, largura
+
+def tabela_cota_area(X, Z, cota_maxima=None, n_cotas=2001):
+    """
+    Pré-calcula a tabela cota -> área (e perímetro molhado e largura) de uma seção levantada.
+    As cotas do próprio leito entram na tabela junto com a malha uniforme, de modo que a
+    interpolação linear só aproxima a parte quadrática entre elas.
+    Retorna (dict com 'Cota', 'Área', 'Perímetro' e 'Largura', None) ou (None, mensagem de erro).
+    """
+    X = np.asarray(X, dtype=float)
+    Z = np.asarray(Z, dtype=float)
+    if len(X) < 2 or len(X) != len(Z):
+        return None, "Erro: São necessários pelo menos 2 pontos, com o mesmo número de valores em X e Z."
+    if np.any(np.diff(X) <= 0):
+        return None, "Erro: Os valores de X devem estar em ordem estritamente crescente."
+
+    cota_minima = Z.min()
+    if cota_maxima is None:
+        cota_maxima = min(Z[0], Z[-1])
+    if cota_maxima <= cota_minima:
+        return None, "Erro: A cota máxima deve ser maior que a cota do ponto mais profundo do leito."
+
+    cotas = np.linspace(cota_minima, cota_maxima, n_cotas)
+    cotas = np.union1d(cotas, Z[(Z > cota_minima) & (Z < cota_maxima)])
+    area, perimetro, largura = geometria_molhada(X, Z, cotas)
+    return {"Cota": cotas, "Área": area, "Perímetro": perimetro, "Largura": largura}, None
+
+def consultar_tabela(tabela, cotas):
+    """
+    Consulta em lote a tabela cota-área por interpolação linear (np.interp).
+    Cotas abaixo do leito têm área zero; cotas acima da tabela resultam em NaN.
+    Retorna um dict com 'Área', 'Perímetro', 'Largura' e 'Raio Hidráulico' (A/P; zero onde
+    o perímetro molhado é zero dentro da tabela e NaN fora dela).
+    """
+    cotas = np.asarray(cotas, dtype=float)
+    resultado = {}
+    for chave in ("Área", "Perímetro", "Largura"):
+        resultado[chave] = np.interp(cotas, tabela["Cota"], tabela[chave], left=0.0, right=np.nan)
+    perimetro = resultado["Perímetro"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        resultado["Raio Hidráulico"] = np.where(np.isnan(perimetro), np.nan,
+                                                 np.where(perimetro > 0, resultado["Área"] / perimetro, 0.0))
+    return resultado
+
+def salvar_tabela_cota_area(tabela, caminho):
+    """Grava a tabela cota-área em disco (.npz)."""
+    np.savez(caminho, cota=tabela["Cota"], area=tabela["Área"],
+             perimetro=tabela["Perímetro"], largura=tabela["Largura"])
+
+def carregar_tabela_cota_area(caminho):
+    """Carrega uma tabela gravada por salvar_tabela_cota_area."""
+    with np.load(caminho) as dados:
+        return {"Cota": dados["cota"], "Área": dados["area"],
+                "Perímetro": dados["perimetro"], "Largura": dados["largura"]}
+
+
+def integrar_em_fluxo(blocos):
+    """
+    Integra pelas Regras do Trapézio e de Simpson 1/3 uma série recebida em blocos (X, Y),
+    com memória constante. A última amostra de cada bloco é levada ao bloco seguinte
+    (fronteira), e para Simpson também a amostra pendente quando o bloco termina no meio
+    de um painel (paridade). O último painel de 1/3 fica guardado: se a série terminar com
+    número ímpar de subintervalos, ele é trocado por um painel de 3/8 nos 4 últimos pontos.
+    O resultado é o mesmo das regras aplicadas aos dados inteiros.
+    Retorna (resultado, None) ou (None, mensagem de erro).
+    """
+    fronteira_x = np.empty(0)
+    fronteira_y = np.empty(0)
+    painel_x = np.empty(0)
+    painel_y = np.empty(0)
+    ultimo_x = np.empty(0)
+    ultimo_y = np.empty(0)
+    ultimo_valor = 0.0
+    trapezio = 0.0
+    simpson = 0.0
+    N = 0
+    h_min, h_max = np.inf, 0.0
+
+    for X_bloco, Y_bloco in blocos:
+        X_bloco = np.asarray(X_bloco, dtype=float)
+        Y_bloco = np.asarray(Y_bloco, dtype=float)
+        if len(X_bloco) != len(Y_bloco):
+            return None, "Erro: O número de valores para X e Y deve ser o mesmo em cada bloco."
+        if len(X_bloco) == 0:
+            continue
+        N += len(X_bloco)
+
+        X_trap = np.concatenate([fronteira_x, X_bloco])
+        Y_trap = np.concatenate([fronteira_y, Y_bloco])
+        h = np.diff(X_trap)
+        if np.any(h <= 0):
+            return None, "Erro: Os pontos de X devem estar em ordem estritamente crescente."
+        if len(h):
+            h_min, h_max = min(h_min, float(h.min())), max(h_max, float(h.max()))
+            trapezio += Y_trap @ pesos_trapezio(X_trap)
+        fronteira_x, fronteira_y = X_trap[-1:], Y_trap[-1:]
+
+        X_simp = np.concatenate([painel_x, X_bloco])
+        Y_simp = np.concatenate([painel_y, Y_bloco])
+        paineis = (len(X_simp) - 1) // 2
+        if paineis > 0:
+            fim = 2 * paineis + 1
+            simpson += Y_simp[:fim] @ pesos_simpson(X_simp[:fim])
+            ultimo_x, ultimo_y = X_simp[fim - 3:fim], Y_simp[fim - 3:fim]
+            ultimo_valor = ultimo_y @ pesos_simpson(ultimo_x)
+        painel_x, painel_y = X_simp[2 * paineis:], Y_simp[2 * paineis:]
+
+    resultado = {"N": N, "h mínimo": h_min, "h máximo": h_max, "Trapézio": None, "Simpson": None,
+                 "Erro Trapézio": None, "Erro Simpson": None, "Erro Estimado Trapézio": None}
+    if N < 2:
+        resultado["Erro Trapézio"] = "Erro: Mínimo de 2 pontos necessários para a Regra do Trapézio."
+    else:
+        resultado["Trapézio"] = float(trapezio)
+    if N < 3:
+        resultado["Erro Simpson"] = "Erro: Mínimo de 3 pontos necessários para a Regra de Simpson."
+    else:
+        if len(painel_x) == 2:
+            X_final = np.concatenate([ultimo_x, painel_x[1:]])
+            Y_final = np.concatenate([ultimo_y, painel_y[1:]])
+            simpson += Y_final @ pesos_tres_oitavos(X_final) - ultimo_valor
+        resultado["Simpson"] = float(simpson)
+        # Estimativa do erro do Trapézio pela diferença para Simpson (sem reler os dados).
+        resultado["Erro Estimado Trapézio"] = abs(resultado["Simpson"] - resultado["Trapézio"])
+    return resultado, None
+
+def integrar_arquivo(caminho, colunas=(0, 1), tamanho_bloco=TAMANHO_BLOCO_PADRAO, cabecalho=False):
+    """Integra um arquivo .npy/.csv/.txt com as colunas X e Y, lido em blocos (memória constante)."""
+    return integrar_em_fluxo(ler_blocos(caminho, colunas=colunas, tamanho_bloco=tamanho_bloco, cabecalho=cabecalho))
+
+
+LINHAS_BLOCO_GRADE = 1024
+
+def _pesos_eixo(eixo, regra, nome):
+    """Pesos de integração ao longo de um eixo da grade (Trapézio ou Simpson), ou mensagem de erro."""
+    N = len(eixo)
+    if np.any(np.diff(eixo) <= 0):
+        return None, f"Erro: Os valores de {nome} devem estar em ordem estritamente crescente."
+    if regra == "Trapézio":
+        if N < 2:
+            return None, f"Erro: Mínimo de 2 pontos em {nome} necessários para a Regra do Trapézio."
+        return pesos_trapezio(eixo), None
+    if regra == "Simpson":
+        if N < 3:
+            return None, f"Erro: Mínimo de 3 pontos em {nome} necessários para a Regra de Simpson."
+        return pesos_simpson(eixo), None
+    return None, f"Erro: Regra '{regra}' desconhecida. Use uma de {REGRAS_AREA}."
+
+def integrar_grade(X, Y, Z, regra="Trapézio", linhas_bloco=LINHAS_BLOCO_GRADE):
+    """
+    Integral dupla (volume) de uma grade regular Z[i, j] = f(X[j], Y[i]) pela regra produto:
+    V = wy @ Z @ wx, com os pesos 1D de cada eixo (aceita espaçamento variável em X e Y).
+    Z é percorrida em faixas de 'linhas_bloco' linhas, de modo que um array mapeado em
+    memória (np.load(..., mmap_mode="r")) nunca é carregado por inteiro.
+    Retorna (volume, None) ou (None, mensagem de erro).
+    """
+    X = np.asarray(X, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+    if np.ndim(Z) != 2 or np.shape(Z) != (len(Y), len(X)):
+        return None, "Erro: Z deve ser uma matriz com len(Y) linhas e len(X) colunas."
+
+    pesos_x, erro = _pesos_eixo(X, regra, "X")
+    if erro:
+        return None, erro
+    pesos_y, erro = _pesos_eixo(Y, regra, "Y")
+    if erro:
+        return None, erro
+
+    volume = 0.0
+    for inicio in range(0, len(Y), linhas_bloco):
+        faixa = np.asarray(Z[inicio:inicio + linhas_bloco], dtype=float)
+        volume += pesos_y[inicio:inicio + linhas_bloco] @ (faixa @ pesos_x)
+    return float(volume), None
+
+def integrar_grade_arquivo(caminho, X, Y, regra="Trapézio", linhas_bloco=LINHAS_BLOCO_GRADE):
+    """Integra uma grade de profundidades gravada em .npy, lida por memória mapeada em faixas de linhas."""
+    Z = np.load(caminho, mmap_mode="r")
+    return integrar_grade(X, Y, Z, regra=regra, linhas_bloco=linhas_bloco)
+
+def integrar_pontos_dispersos(X, Y, Z):
+    """
+    Volume sob pontos (X, Y, Z) irregularmente distribuídos: a área é triangulada (Delaunay)
+    e cada triângulo contribui com área * média das três profundidades, o que é exato
+    para a superfície linear por partes que passa pelos pontos.
+    Retorna (volume, None) ou (None, mensagem de erro).
+    """
+    X = np.asarray(X, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+    Z = np.asarray(Z, dtype=float)
+    if not len(X) == len(Y) == len(Z):
+        return None, "Erro: X, Y e Z devem ter o mesmo número de valores."
+    if len(X) < 3:
+        return None, "Erro: São necessários pelo menos 3 pontos para a triangulação."
+
+    espacial = importar("scipy.spatial")
+    try:
+        triangulacao = espacial.Delaunay(np.column_stack([X, Y]))
+    except espacial.QhullError:
+        return None, "Erro: Não foi possível triangular os pontos (pontos colineares ou repetidos)."
+
+    v0, v1, v2 = triangulacao.simplices.T
+    areas = 0.5 * np.abs((X[v1] - X[v0]) * (Y[v2] - Y[v0]) - (X[v2] - X[v0]) * (Y[v1] - Y[v0]))
+    return float(areas @ ((Z[v0] + Z[v1] + Z[v2]) / 3)), None
+
+
+ORDEM_MAXIMA_QUADRATURA = 500
+LIMITE_CACHE_NOS_PESOS = 64
+_CACHE_NOS_PESOS = OrderedDict()
+_TRAVA_NOS_PESOS = threading.Lock()
+REGRAS_GAUSSIANAS = ("Gauss-Legendre", "Clenshaw-Curtis")
+
+def _nos_pesos_clenshaw_curtis(n):
+    """Nós xk = cos(kπ/n), k = 0..n, e pesos da regra de Clenshaw-Curtis em [-1, 1]."""
+    theta = np.pi * np.arange(n + 1) / n
+    j = np.arange(1, n // 2 + 1)
+    b = np.where(2 * j == n, 1.0, 2.0)
+    c = np.full(n + 1, 2.0)
+    c[[0, -1]] = 1.0
+    pesos = c / n * (1 - np.cos(2 * np.outer(theta, j)) @ (b / (4 * j**2 - 1)))
+    return np.cos(theta), pesos
+
+def nos_pesos_quadratura(regra, n):
+    """
+    Nós e pesos em [-1, 1] da regra 'Gauss-Legendre' (n pontos) ou 'Clenshaw-Curtis'
+    (n + 1 pontos), com n até ORDEM_MAXIMA_QUADRATURA. São guardados em um cache LRU
+    do processo limitado a LIMITE_CACHE_NOS_PESOS tabelas.
+    """
+    chave = (regra, int(n))
+    with _TRAVA_NOS_PESOS:
+        tabela = _CACHE_NOS_PESOS.get(chave)
+        if tabela is not None:
+            _CACHE_NOS_PESOS.move_to_end(chave)
+            return tabela
+
+    if regra not in REGRAS_GAUSSIANAS:
+        raise ValueError(f"Regra desconhecida: {regra}. Use 'Gauss-Legendre' ou 'Clenshaw-Curtis'.")
+    if n < 1:
+        raise ValueError("A ordem da regra deve ser positiva.")
+    if n > ORDEM_MAXIMA_QUADRATURA:
+        raise ValueError(f"A ordem da regra deve ser no máximo {ORDEM_MAXIMA_QUADRATURA}; "
+                         "para mais precisão, aumente o número de subintervalos.")
+
+    if regra == "Gauss-Legendre":
+        nos, pesos = np.polynomial.legendre.leggauss(int(n))
+    else:
+        nos, pesos = _nos_pesos_clenshaw_curtis(int(n))
+    nos.setflags(write=False)
+    pesos.setflags(write=False)
+
+    return _guardar_nos_pesos(chave, nos, pesos)
+
+def _guardar_nos_pesos(chave, nos, pesos):
+    """Guarda uma tabela no cache LRU de nós e pesos, descartando as usadas há mais tempo."""
+    with _TRAVA_NOS_PESOS:
+        tabela = _CACHE_NOS_PESOS.setdefault(chave, (nos, pesos))
+        _CACHE_NOS_PESOS.move_to_end(chave)
+        while len(_CACHE_NOS_PESOS) > LIMITE_CACHE_NOS_PESOS:
+            _CACHE_NOS_PESOS.popitem(last=False)
+        return tabela
+
+def salvar_tabela_quadratura(caminho):
+    """Grava em disco (.npz) todos os nós e pesos já calculados neste processo."""
+    with _TRAVA_NOS_PESOS:
+        tabelas = dict(_CACHE_NOS_PESOS)
+    dados = {}
+    for (regra, n), (nos, pesos) in tabelas.items():
+        dados[f"{regra}|{n}|nos"] = nos
+        dados[f"{regra}|{n}|pesos"] = pesos
+    np.savez(caminho, **dados)
+
+def carregar_tabela_quadratura(caminho):
+    """Carrega uma tabela gravada por salvar_tabela_quadratura para o cache do processo."""
+    with np.load(caminho) as dados:
+        for chave in dados.files:
+            regra, n, tipo = chave.split("|")
+            if tipo != "nos" or regra not in REGRAS_GAUSSIANAS or not 1 <= int(n) <= ORDEM_MAXIMA_QUADRATURA:
+                continue
+            nos = dados[chave]
+            pesos = dados[f"{regra}|{n}|pesos"]
+            nos.setflags(write=False)
+            pesos.setflags(write=False)
+            _guardar_nos_pesos((regra, int(n)), nos, pesos)
+    return len(_CACHE_NOS_PESOS)
+
+def integrar_intervalos(f, A, B, n=10, regra="Gauss-Legendre"):
+    """
+    Integra f em vários intervalos [Ai, Bi] de uma só vez: todos os nós são avaliados
+    em um único lote e cada integral é um produto escalar com os pesos da regra.
+    Retorna o array de integrais e a matriz de nós/valores (um intervalo por linha).
+    """
+    nos, pesos = nos_pesos_quadratura(regra, n)
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float)
+    centro = (A + B) / 2
+    raio = (B - A) / 2
+    X = centro[..., None] + raio[..., None] * nos
+    Y = avaliar_funcao(f, X.ravel()).reshape(X.shape)
+    return raio * (Y @ pesos), X, Y
+
+def integrar_quadratura_gaussiana(f, a, b, n=10, subintervalos=1, regra="Gauss-Legendre"):
+    """
+    Integra f em [a, b] pela regra 'Gauss-Legendre' ou 'Clenshaw-Curtis' de ordem n,
+    composta em 'subintervalos' partes iguais.
+    Para Clenshaw-Curtis com n par, os nós da regra de ordem n/2 estão contidos nos de
+    ordem n, o que dá uma estimativa de erro sem novas avaliações de f.
+    Retorna (resultado, None) ou (None, mensagem de erro).
+    """
+    if b <= a:
+        return None, "Erro: O limite superior 'b' deve ser maior que o limite inferior 'a'."
+    if subintervalos < 1:
+        return None, "Erro: O número de subintervalos deve ser positivo."
+    if not 1 <= n <= ORDEM_MAXIMA_QUADRATURA:
+        return None, f"Erro: A ordem da regra deve estar entre 1 e {ORDEM_MAXIMA_QUADRATURA}."
+
+    bordas = np.linspace(a, b, int(subintervalos) + 1)
+    integrais, X, Y = integrar_intervalos(f, bordas[:-1], bordas[1:], n, regra)
+    if not np.all(np.isfinite(Y)):
+        return None, "Erro: A função resultou em valores inválidos (ex: divisão por zero) no intervalo."
+
+    erro_estimado = np.nan
+    if regra == "Clenshaw-Curtis" and n % 2 == 0 and n >= 4:
+        _, pesos_metade = nos_pesos_quadratura(regra, n // 2)
+        raio = (bordas[1:] - bordas[:-1]) / 2
+        integrais_metade = raio * (Y[:, ::2] @ pesos_metade)
+        erro_estimado = float(np.sum(np.abs(integrais - integrais_metade)))
+
+    return _resultado_adaptativo(np.sum(integrais), erro_estimado, [X.ravel()], [Y.ravel()], 1), None
+
+
+SEQUENCIAS_QMC = ("Sobol", "Halton")
+
+def variaveis_dimensao(d):
+    """Nomes das variáveis de uma função de d variáveis: ('x1', ..., 'xd')."""
+    return tuple(f"x{i}" for i in range(1, d + 1))
+
+def _soma_lote_qmc(func_str, sequencia, semente, inicio, n, inferiores, superiores):
+    """
+    Soma de f em n pontos consecutivos (a partir do ponto 'inicio') de uma réplica embaralhada.
+    A réplica é inteiramente determinada pela semente e pelo contador 'inicio', de modo que o
+    lote pode ser calculado em qualquer processo e o resultado não depende da ordem de execução.
+    """
+    d = len(inferiores)
+    f, _ = compilar_funcao(func_str, variaveis_dimensao(d))
+    qmc = importar("scipy.stats.qmc")
+    classe = qmc.Sobol if sequencia == "Sobol" else qmc.Halton
+    gerador = classe(d, scramble=True, rng=np.random.default_rng(semente))
+    if inicio:
+        gerador.fast_forward(inicio)
+    pontos = qmc.scale(gerador.random(n), inferiores, superiores)
+    valores = np.asarray(f(*pontos.T), dtype=float)
+    return float(np.broadcast_to(valores, (n,)).sum())
+
+def integrar_qmc(func_str, inferiores, superiores, tol=1e-4, sequencia="Sobol", replicas=8,
+                 pontos_iniciais=2**12, max_pontos=2**24, semente=0, modo=None, n_trabalhadores=None):
+    """
+    Integral de f(x1, ..., xd) sobre o hiper-retângulo [inferiores, superiores] por
+    Quasi-Monte Carlo aleatorizado (Sobol ou Halton embaralhados).
+    São usadas 'replicas' sequências independentes; a integral é a média das réplicas e o
+    erro estimado é o desvio padrão dessa média. Cada rodada dobra o número de pontos de
+    todas as réplicas (mantendo potências de 2, como exige o Sobol) até o erro atingir 'tol'.
+    As sementes vêm de np.random.SeedSequence(semente).spawn(replicas), então a mesma
+    semente reproduz o mesmo resultado, com ou sem paralelismo ('threads' ou 'processos').
+    Retorna (dict de resultado, None) ou (None, mensagem de erro).
+    """
+    inferiores = np.atleast_1d(np.asarray(inferiores, dtype=float))
+    superiores = np.atleast_1d(np.asarray(superiores, dtype=float))
+    if inferiores.shape != superiores.shape or inferiores.ndim != 1:
+        return None, "Erro: Os limites inferiores e superiores devem ter a mesma dimensão."
+    if np.any(superiores <= inferiores):
+        return None, "Erro: Cada limite superior deve ser maior que o limite inferior correspondente."
+    if sequencia not in SEQUENCIAS_QMC:
+        return None, f"Erro: Sequência '{sequencia}' desconhecida. Use uma de {SEQUENCIAS_QMC}."
+    if replicas < 2:
+        return None, "Erro: São necessárias pelo menos 2 réplicas para estimar o erro."
+    if modo is not None and modo not in MODOS_PARALELOS:
+        return None, f"Erro: Modo '{modo}' desconhecido. Use um de {MODOS_PARALELOS}."
+
+    try:
+        # Valida a expressão (e já a deixa no cache) antes de criar os trabalhadores.
+        compilar_funcao(func_str, variaveis_dimensao(len(inferiores)))
+    except ValueError as e:
+        return None, f"Erro: {e}"
+    volume = float(np.prod(superiores - inferiores))
+    sementes = np.random.SeedSequence(semente).spawn(replicas)
+    pool = None
+    if modo is not None:
+        pool = _obter_pool(modo, n_trabalhadores or min(replicas, numero_nucleos()))
+
+    somas = np.zeros(replicas)
+    gerados = 0
+    lote = 2 ** int(np.ceil(np.log2(pontos_iniciais)))
+    historico = []
+    while True:
+        argumentos = [(func_str, sequencia, semente_replica, gerados, lote, inferiores, superiores)
+                      for semente_replica in sementes]
+        if pool is None:
+            somas += [_soma_lote_qmc(*args) for args in argumentos]
+        else:
+            somas += [tarefa.result() for tarefa in [pool.submit(_soma_lote_qmc, *args) for args in argumentos]]
+        gerados += lote
+
+        estimativas = volume * somas / gerados
+        integral = float(estimativas.mean())
+        erro_estimado = float(estimativas.std(ddof=1) / np.sqrt(replicas))
+        historico.append({"Rodada": len(historico) + 1, "Pontos por Réplica": gerados,
+                          "Integral": integral, "Erro Estimado": erro_estimado})
+
+        if erro_estimado <= tol or 2 * gerados * replicas > max_pontos or not np.isfinite(integral):
+            break
+        lote = gerados
+
+    if not np.isfinite(integral):
+        return None, "Erro: A função resultou em valores inválidos (ex: divisão por zero) no domínio."
+    return {
+        "Integral": integral,
+        "Erro Estimado": erro_estimado,
+        "Avaliações": gerados * replicas,
+        "Níveis": len(historico),
+        "Dimensão": len(inferiores),
+        "Réplicas": replicas,
+        "Histórico": historico,
+    }, None
 
 
 def plotar_resultados(X, Y, titulo="Gráfico de Integração Numérica"):
     """Gera o gráfico dos pontos e da área."""
+    plt = importar("matplotlib.pyplot")
     
     plt.figure(figsize=(10, 6))
     
@@ -80,9 +1383,12 @@ def processar_integracao(X, Y, titulo_grafico="Gráfico de Integração Numéric
         print("Erro: Número insuficiente de pontos.")
         return None
         
-    h = X[1] - X[0]
     print(f"Número de pontos (N): {N}")
-    print(f"Espaçamento (h): {h:.6f}")
+    if espacamento_uniforme(X):
+        print(f"Espaçamento (h): {X[1] - X[0]:.6f}")
+    else:
+        h = np.diff(X)
+        print(f"Espaçamento (h): variável, de {h.min():.6f} a {h.max():.6f}")
     
     print("\n\n--- 1. Regra do Trapézio Repetida ---")
     integral_trapezio, erro_trapezio = regra_trapezio_repetida(X, Y)
@@ -92,7 +1398,7 @@ def processar_integracao(X, Y, titulo_grafico="Gráfico de Integração Numéric
     else:
         print(f"Resultado (Trapézio): {integral_trapezio:.6f}")
         
-    print("\n\n--- 2. Regra de Simpson 1/3 Repetida ---")
+    print(f"\n\n--- 2. Regra de {nome_regra_simpson(len(X))} ---")
     integral_simpson, erro_simpson = regra_simpson_repetida(X, Y)
     
     if erro_simpson:
@@ -104,13 +1410,17 @@ def processar_integracao(X, Y, titulo_grafico="Gráfico de Integração Numéric
     print("                         RESUMO DOS RESULTADOS                     ")
     print("===================================================================")
     
-    print("{:<25} {:<20}".format("Método", "Resultado"))
-    print("-" * 45)
+    print("{:<25} {:<20} {:<15}".format("Método", "Resultado", "Erro Estimado"))
+    print("-" * 60)
     if integral_trapezio is not None:
-        print("{:<25} {:<20.6f}".format("Trapézio Repetida", integral_trapezio))
+        print("{:<25} {:<20.6f} {:<15.2e}".format("Trapézio Repetida", integral_trapezio, erro_estimado_trapezio(X, Y)))
     if integral_simpson is not None:
-        print("{:<25} {:<20.6f}".format("Simpson 1/3 Repetida", integral_simpson))
-    print("-" * 45)
+        print("{:<25} {:<20.6f} {:<15.2e}".format(nome_regra_simpson(len(X)), integral_simpson, erro_estimado_simpson(X, Y)))
+    print("-" * 60)
+    
+    posicao_meia_area, erro_meia_area = posicao_fracao_area(X, Y, 0.5)
+    if erro_meia_area is None:
+        print(f"Posição em que se atinge metade da área (Trapézio): x = {posicao_meia_area:.6f}")
     
     caminho_grafico = plotar_resultados(X, Y, titulo=titulo_grafico)
     print(f"\nGráfico gerado e salvo em: {caminho_grafico}")
@@ -136,7 +1446,7 @@ def input_dados_discretos():
     
     while True:
         try:
-            x_str = input("Insira os valores de X (Distância) separados por espaço (devem ser igualmente espaçados): ")
+            x_str = input("Insira os valores de X (Distância) separados por espaço (em ordem crescente): ")
             X = np.array([float(x) for x in x_str.split()])
             
             y_str = input("Insira os valores de Y (Profundidade/f(x)) separados por espaço: ")
@@ -150,9 +1460,8 @@ def input_dados_discretos():
                 print("Erro: São necessários pelo menos 2 pontos.")
                 continue
                 
-            h_calc = X[1] - X[0]
-            if not np.allclose(np.diff(X), h_calc):
-                print("Erro: Os pontos de X não estão igualmente espaçados.")
+            if np.any(np.diff(X) <= 0):
+                print("Erro: Os pontos de X devem estar em ordem estritamente crescente.")
                 continue
             
             return processar_integracao(X, Y, titulo_grafico="Integração de Dados Discretos")
@@ -175,21 +1484,33 @@ def input_funcao_continua():
             
             a = float(input("Limite inferior 'a': "))
             b = float(input("Limite superior 'b': "))
-            n = int(input("Número de subintervalos 'n' (deve ser par para Simpson): "))
+            n = int(input("Número de subintervalos 'n' (0 = automático): "))
             
-            if n <= 0:
+            if n < 0:
                 print("Erro: O número de subintervalos deve ser positivo.")
                 continue
             if b <= a:
                 print("Erro: O limite superior 'b' deve ser maior que o limite inferior 'a'.")
                 continue
+            
+            if n == 0:
+                tol = float(input("Tolerância desejada (ex: 1e-8): "))
+                f_lambda, _ = compilar_funcao(func_str)
+                resultado, erro = integrar_malha_automatica(f_lambda, a, b, tol)
+                if erro:
+                    print(erro)
+                    continue
+                X, Y = resultado["X"], resultado["Y"]
+                n = len(X) - 1
+                print(f"Malha escolhida automaticamente: n = {n} (erro estimado de Simpson: {resultado['Erro Estimado']:.2e})")
+                titulo = f"Integral de f(x) = {func_str} de {a} a {b} (n={n}, automático)"
+                return processar_integracao(X, Y, titulo_grafico=titulo)
                 
             h = (b - a) / n
             X = np.linspace(a, b, n + 1)
             
-            f_expr = sympify(func_str)
-            f_lambda = lambdify(x, f_expr, "numpy")
-            Y = f_lambda(X)
+            f_lambda, _ = compilar_funcao(func_str)
+            Y = avaliar_funcao_paralela(f_lambda, X, func_str=func_str)
             
             if np.any(np.isinf(Y)) or np.any(np.isnan(Y)):
                 print("Erro: A função resultou em valores inválidos (ex: divisão por zero) no intervalo.")
@@ -205,6 +1526,34 @@ def input_funcao_continua():
             print("Dica: Use 'x' como variável e funções como 'sin(x)', 'cos(x)', 'exp(x)', 'log(x)'.")
             return None
 
+def input_arquivo_grande():
+    """Integra um arquivo grande (.npy/.csv/.txt) de sondagens, lido em blocos."""
+    print("\n===================================================================")
+    print("              MODO ARQUIVO: INTEGRAÇÃO EM BLOCOS                   ")
+    print("===================================================================")
+    
+    caminho = input("Caminho do arquivo (.npy, .csv ou .txt) com as colunas X e Y: ").strip()
+    
+    try:
+        resultado, erro = integrar_arquivo(caminho)
+    except (OSError, ValueError) as e:
+        print(f"Erro ao ler o arquivo: {e}")
+        return None
+    
+    if erro:
+        print(erro)
+        return None
+    
+    print(f"Número de pontos (N): {resultado['N']}")
+    for metodo in ("Trapézio", "Simpson"):
+        if resultado[f"Erro {metodo}"]:
+            print(resultado[f"Erro {metodo}"])
+        else:
+            print(f"Resultado ({metodo}): {resultado[metodo]:.6f}")
+    if resultado["Erro Estimado Trapézio"] is not None:
+        print(f"Erro estimado do Trapézio (|Simpson - Trapézio|): {resultado['Erro Estimado Trapézio']:.2e}")
+    return None
+
 def main():
     """Função principal para iniciar o programa e apresentar as opções."""
     
@@ -219,9 +1568,10 @@ def main():
         print("1 - Rodar o Exemplo 1 (Área da Seção Reta do Rio)")
         print("2 - Inserir Dados Discretos (Pontos X e Y)")
         print("3 - Resolver Integral de Função Contínua (f(x), a, b, n)")
-        print("4 - Sair")
+        print("4 - Integrar Arquivo Grande em Blocos (.npy/.csv/.txt)")
+        print("5 - Sair")
         
-        escolha = input("Sua escolha (1, 2, 3 ou 4): ")
+        escolha = input("Sua escolha (1, 2, 3, 4 ou 5): ")
         
         if escolha == '1':
             caminho_grafico = exemplo_1_rio()
@@ -230,10 +1580,12 @@ def main():
         elif escolha == '3':
             caminho_grafico = input_funcao_continua()
         elif escolha == '4':
+            input_arquivo_grande()
+        elif escolha == '5':
             print("Programa encerrado. Obrigado!")
             break
         else:
-            print("Opção inválida. Por favor, escolha 1, 2, 3 ou 4.")
+            print("Opção inválida. Por favor, escolha 1, 2, 3, 4 ou 5.")
             
     if caminho_grafico:
         print(f"\nO gráfico da última execução foi salvo em: {caminho_grafico}")
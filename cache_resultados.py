@@ -0,0 +1,379 @@
+import functools
+import hashlib
+import importlib
+import io
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+
+import numpy as np
+
+LIMITE_BYTES_GRAFICOS = 64 * 1024 * 1024
+LIMITE_BYTES_CALCULOS = 128 * 1024 * 1024
+TTL_PADRAO = 6 * 3600
+LIMITE_ENTRADAS_DISCO = 10_000
+# Aumente ao mudar o formato dos resultados guardados: invalida todo o cache em disco.
+VERSAO_CACHE = "2"
+# Módulos de cálculo chamados pelas funções memorizadas; editar qualquer um deles invalida o cache.
+MODULOS_NUCLEO = ("T3_q3.py", "T4_q1.py", "leitura_dados.py")
+# Classes com para_bytes/de_bytes aceitas nos resultados gravados em disco (nome -> módulo).
+TIPOS_RESULTADO = {"ModeloRegressao": "T3_q3"}
+# Caminho do banco SQLite compartilhado entre processos; sem a variável, o cache fica só em memória.
+CAMINHO_CACHE_DISCO = os.environ.get("CALCULO_NUMERICO_CACHE_DISCO")
+
+
+def _alimentar(h, valor):
+    """Acrescenta ao hash uma representação canônica de 'valor' (arrays, números, textos e coleções)."""
+    if isinstance(valor, np.ndarray):
+        if valor.dtype == object:
+            _alimentar(h, valor.tolist())
+            return
+        dados = np.ascontiguousarray(valor)
+        h.update(f"A|{dados.dtype.str}|{dados.shape}|".encode())
+        h.update(dados.tobytes())
+    elif isinstance(valor, np.generic):
+        _alimentar(h, valor.item())
+    elif isinstance(valor, (str, bytes, bool, int, float, complex, type(None))):
+        h.update(f"{type(valor).__name__}|{valor!r}|".encode())
+    elif isinstance(valor, dict):
+        h.update(f"D|{len(valor)}|".encode())
+        for chave in sorted(valor, key=repr):
+            _alimentar(h, chave)
+            _alimentar(h, valor[chave])
+    elif isinstance(valor, (list, tuple)):
+        h.update(f"L|{len(valor)}|".encode())
+        for item in valor:
+            _alimentar(h, item)
+    elif hasattr(valor, "para_bytes"):
+        h.update(f"O|{type(valor).__name__}|".encode())
+        h.update(valor.para_bytes())
+    else:
+        raise TypeError(f"Tipo não suportado no hash de entrada: {type(valor).__name__}")
+
+
+def hash_entrada(*partes, **parametros):
+    """
+    Hash canônico (BLAKE2b) das entradas de um cálculo: arrays entram pelo tipo, formato e bytes,
+    dicionários com as chaves ordenadas. Entradas iguais dão a mesma chave em qualquer sessão ou processo.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    _alimentar(h, partes)
+    _alimentar(h, parametros)
+    return h.hexdigest()
+
+
+def tamanho_resultado(valor):
+    """Memória aproximada de um resultado, em bytes: arrays pelo nbytes, o resto por sys.getsizeof."""
+    if isinstance(valor, np.ndarray):
+        return sys.getsizeof(valor) + (valor.nbytes if valor.base is not None else 0)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamanho_resultado(k) + tamanho_resultado(v) for k, v in valor.items())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(tamanho_resultado(item) for item in valor)
+    if hasattr(valor, "__slots__"):
+        return sys.getsizeof(valor) + sum(tamanho_resultado(getattr(valor, nome, None)) for nome in valor.__slots__)
+    return sys.getsizeof(valor)
+
+
+def _codificar(valor, arrays):
+    """Estrutura JSON de 'valor', com os arrays (e objetos em bytes) separados na lista 'arrays'."""
+    if isinstance(valor, (np.ndarray, np.generic)):
+        dados = np.asarray(valor)
+        if dados.dtype == object:
+            raise TypeError("Arrays de objetos não podem ser gravados no cache em disco.")
+        arrays.append(dados)
+        return {"array": len(arrays) - 1, "escalar": isinstance(valor, np.generic)}
+    if valor is None or isinstance(valor, (str, bool, int, float)):
+        return valor
+    if isinstance(valor, dict):
+        if not all(isinstance(chave, str) for chave in valor):
+            raise TypeError("Só dicionários com chaves de texto podem ser gravados no cache em disco.")
+        return {"dict": {chave: _codificar(item, arrays) for chave, item in valor.items()}}
+    if isinstance(valor, (list, tuple)):
+        return {"tuple" if isinstance(valor, tuple) else "list": [_codificar(item, arrays) for item in valor]}
+    nome = type(valor).__name__
+    if TIPOS_RESULTADO.get(nome) == type(valor).__module__:
+        arrays.append(np.frombuffer(valor.para_bytes(), dtype=np.uint8))
+        return {"objeto": nome, "bytes": len(arrays) - 1}
+    raise TypeError(f"Tipo não suportado no cache em disco: {nome}")
+
+
+def _decodificar(estrutura, arrays):
+    """Reconstrói o valor codificado por _codificar."""
+    if not isinstance(estrutura, dict):
+        return estrutura
+    if "array" in estrutura:
+        dados = arrays[f"arr_{estrutura['array']}"]
+        return dados[()] if estrutura["escalar"] else dados
+    if "dict" in estrutura:
+        return {chave: _decodificar(item, arrays) for chave, item in estrutura["dict"].items()}
+    if "list" in estrutura:
+        return [_decodificar(item, arrays) for item in estrutura["list"]]
+    if "tuple" in estrutura:
+        return tuple(_decodificar(item, arrays) for item in estrutura["tuple"])
+    modulo = TIPOS_RESULTADO.get(estrutura.get("objeto"))
+    if modulo is None:
+        raise ValueError("Estrutura desconhecida no cache em disco.")
+    classe = getattr(importlib.import_module(modulo), estrutura["objeto"])
+    return classe.de_bytes(arrays[f"arr_{estrutura['bytes']}"].tobytes())
+
+
+def serializar_resultado(valor):
+    """
+    Converte um resultado em (metadados JSON, bytes .npz). Só são aceitos números, textos, None,
+    listas, tuplas, dicionários com chaves de texto, arrays numéricos e as classes de TIPOS_RESULTADO;
+    outros tipos levantam TypeError.
+    """
+    arrays = []
+    metadados = json.dumps(_codificar(valor, arrays))
+    buffer = io.BytesIO()
+    np.savez(buffer, *arrays)
+    return metadados, buffer.getvalue()
+
+
+def desserializar_resultado(metadados, dados):
+    """Inverso de serializar_resultado; os arrays são lidos com allow_pickle=False."""
+    with np.load(io.BytesIO(dados), allow_pickle=False) as arrays:
+        return _decodificar(json.loads(metadados), arrays)
+
+
+_AUSENTE = object()
+
+
+class CacheLRU:
+    """
+    Cache LRU limitado pelo total de bytes armazenados, compartilhado entre threads (sessões do Streamlit).
+    Ao ultrapassar 'limite_bytes', as entradas usadas há mais tempo são descartadas; com 'ttl'
+    (segundos), entradas mais antigas que isso expiram na próxima consulta.
+    """
+
+    def __init__(self, limite_bytes, ttl=None):
+        self.limite_bytes = limite_bytes
+        self.ttl = ttl
+        self._itens = OrderedDict()
+        self._bytes = 0
+        self._trava = threading.Lock()
+        self._contadores = {"Acertos": 0, "Faltas": 0, "Descartes": 0, "Expirados": 0}
+
+    def obter(self, chave, padrao=None):
+        """Devolve o valor guardado para a chave (ou 'padrao'), marcando-o como usado recentemente."""
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is not None and item[2] is not None and item[2] < time.monotonic():
+                del self._itens[chave]
+                self._bytes -= item[1]
+                self._contadores["Expirados"] += 1
+                item = None
+            if item is None:
+                self._contadores["Faltas"] += 1
+                return padrao
+            self._itens.move_to_end(chave)
+            self._contadores["Acertos"] += 1
+            return item[0]
+
+    def guardar(self, chave, valor, tamanho):
+        """Guarda o valor com o tamanho informado (em bytes); valores maiores que o limite não são guardados."""
+        if tamanho > self.limite_bytes:
+            return
+        expira_em = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._trava:
+            anterior = self._itens.pop(chave, None)
+            if anterior is not None:
+                self._bytes -= anterior[1]
+            self._itens[chave] = (valor, tamanho, expira_em)
+            self._bytes += tamanho
+            while self._bytes > self.limite_bytes:
+                _, (_, tamanho_descartado, _) = self._itens.popitem(last=False)
+                self._bytes -= tamanho_descartado
+                self._contadores["Descartes"] += 1
+
+    def limpar(self):
+        """Remove todas as entradas (os contadores são mantidos)."""
+        with self._trava:
+            self._itens.clear()
+            self._bytes = 0
+
+    def estatisticas(self):
+        """Contadores do cache: acertos, faltas, descartes, expirados, entradas, bytes e taxa de acerto."""
+        with self._trava:
+            estatisticas = dict(self._contadores)
+            estatisticas["Entradas"] = len(self._itens)
+            estatisticas["Bytes"] = self._bytes
+        consultas = estatisticas["Acertos"] + estatisticas["Faltas"]
+        estatisticas["Taxa de Acerto"] = estatisticas["Acertos"] / consultas if consultas else 0.0
+        return estatisticas
+
+
+class CacheDisco:
+    """
+    Armazenamento opcional dos resultados em um banco SQLite, compartilhado por todos os processos
+    do servidor. Cada entrada tem metadados JSON e os arrays em formato .npz (serializar_resultado),
+    lidos sem pickle; entradas expiram após 'ttl' segundos e, acima de 'limite_entradas', as menos
+    usadas recentemente são removidas.
+    """
+
+    def __init__(self, caminho, ttl=TTL_PADRAO, limite_entradas=LIMITE_ENTRADAS_DISCO):
+        self.caminho = caminho
+        self.ttl = ttl
+        self.limite_entradas = limite_entradas
+        self._local = threading.local()
+        self._trava = threading.Lock()
+        self._contadores = {"Acertos": 0, "Faltas": 0, "Gravações": 0}
+
+    def _conexao(self):
+        """Conexão SQLite da thread atual (sqlite3 não compartilha conexões entre threads)."""
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.caminho, timeout=30)
+            conexao.execute("PRAGMA journal_mode=WAL")
+            with conexao:
+                # Tabela do formato antigo (pickle), que não é mais lido.
+                conexao.execute("DROP TABLE IF EXISTS resultados")
+                conexao.execute(
+                    "CREATE TABLE IF NOT EXISTS resultados_npz (chave TEXT PRIMARY KEY, metadados TEXT NOT NULL, "
+                    "valor BLOB NOT NULL, criado REAL NOT NULL, usado REAL NOT NULL)"
+                )
+            self._local.conexao = conexao
+        return conexao
+
+    def _contar(self, nome):
+        with self._trava:
+            self._contadores[nome] += 1
+
+    def obter(self, chave):
+        """Devolve o resultado gravado para a chave, ou _AUSENTE se não houver, tiver expirado ou estiver corrompido."""
+        conexao = self._conexao()
+        agora = time.time()
+        with conexao:
+            linha = conexao.execute(
+                "SELECT metadados, valor FROM resultados_npz WHERE chave = ? AND criado >= ?",
+                (chave, agora - self.ttl)
+            ).fetchone()
+            if linha is not None:
+                conexao.execute("UPDATE resultados_npz SET usado = ? WHERE chave = ?", (agora, chave))
+        if linha is not None:
+            try:
+                valor = desserializar_resultado(*linha)
+            except (ValueError, KeyError, TypeError, OSError, zipfile.BadZipFile):
+                linha = None
+        self._contar("Acertos" if linha is not None else "Faltas")
+        return valor if linha is not None else _AUSENTE
+
+    def guardar(self, chave, valor):
+        """Grava o resultado da chave e remove as entradas expiradas ou excedentes."""
+        metadados, dados = serializar_resultado(valor)
+        conexao = self._conexao()
+        agora = time.time()
+        with conexao:
+            conexao.execute(
+                "INSERT OR REPLACE INTO resultados_npz (chave, metadados, valor, criado, usado) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (chave, metadados, sqlite3.Binary(dados), agora, agora),
+            )
+            conexao.execute("DELETE FROM resultados_npz WHERE criado < ?", (agora - self.ttl,))
+            conexao.execute(
+                "DELETE FROM resultados_npz WHERE chave IN "
+                "(SELECT chave FROM resultados_npz ORDER BY usado DESC LIMIT -1 OFFSET ?)",
+                (self.limite_entradas,),
+            )
+        self._contar("Gravações")
+
+    def estatisticas(self):
+        """Contadores do armazenamento em disco e número de entradas gravadas."""
+        with self._trava:
+            estatisticas = dict(self._contadores)
+        estatisticas["Entradas"] = self._conexao().execute("SELECT COUNT(*) FROM resultados_npz").fetchone()[0]
+        consultas = estatisticas["Acertos"] + estatisticas["Faltas"]
+        estatisticas["Taxa de Acerto"] = estatisticas["Acertos"] / consultas if consultas else 0.0
+        return estatisticas
+
+
+def _alimentar_codigo(h, codigo):
+    """Acrescenta ao hash o bytecode e as constantes de uma função, incluindo funções internas."""
+    h.update(codigo.co_code)
+    for constante in codigo.co_consts:
+        if hasattr(constante, "co_code"):
+            _alimentar_codigo(h, constante)
+        else:
+            h.update(f"{type(constante).__name__}|{constante!r}|".encode())
+
+
+_HASHES_FONTES = {}
+
+
+def _hash_fonte(caminho):
+    """Hash do conteúdo de um arquivo-fonte, recalculado só quando o arquivo muda."""
+    try:
+        modificado = os.path.getmtime(caminho)
+    except OSError:
+        return ""
+    em_cache = _HASHES_FONTES.get(caminho)
+    if em_cache is None or em_cache[0] != modificado:
+        with open(caminho, "rb") as arquivo:
+            em_cache = (modificado, hashlib.blake2b(arquivo.read(), digest_size=20).hexdigest())
+        _HASHES_FONTES[caminho] = em_cache
+    return em_cache[1]
+
+
+def assinatura_funcao(funcao):
+    """
+    Identifica a versão do código de uma função memorizada: VERSAO_CACHE, nome, bytecode e constantes,
+    e o conteúdo do arquivo onde ela está e dos MODULOS_NUCLEO (que ela chama indiretamente).
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{VERSAO_CACHE}|{funcao.__module__}|{funcao.__qualname__}|".encode())
+    _alimentar_codigo(h, funcao.__code__)
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    fontes = [getattr(funcao.__code__, "co_filename", "")] + [os.path.join(pasta, nome) for nome in MODULOS_NUCLEO]
+    for caminho in fontes:
+        h.update(f"{os.path.basename(caminho)}|{_hash_fonte(caminho)}|".encode())
+    return h.hexdigest()
+
+
+CACHE_GRAFICOS = CacheLRU(LIMITE_BYTES_GRAFICOS)
+CACHE_CALCULOS = CacheLRU(LIMITE_BYTES_CALCULOS, ttl=TTL_PADRAO)
+CACHE_DISCO = CacheDisco(CAMINHO_CACHE_DISCO) if CAMINHO_CACHE_DISCO else None
+
+
+def memorizar(funcao):
+    """
+    Memoriza uma função de cálculo pelo hash canônico das suas entradas, em memória (LRU com TTL,
+    compartilhado pelas sessões) e, se configurado, no SQLite compartilhado pelos processos.
+    A chave inclui assinatura_funcao (código, constantes e fontes dos módulos de cálculo), de modo
+    que alterar o código invalida os resultados antigos. Resultados que serializar_resultado não
+    aceita ficam só em memória. Os valores devolvidos são compartilhados: não devem ser modificados.
+    """
+    identificacao = assinatura_funcao(funcao)
+
+    @functools.wraps(funcao)
+    def memorizada(*args, **kwargs):
+        chave = hash_entrada(identificacao, *args, **kwargs)
+        valor = CACHE_CALCULOS.obter(chave, _AUSENTE)
+        if valor is not _AUSENTE:
+            return valor
+
+        valor = CACHE_DISCO.obter(chave) if CACHE_DISCO is not None else _AUSENTE
+        if valor is _AUSENTE:
+            valor = funcao(*args, **kwargs)
+            if CACHE_DISCO is not None:
+                try:
+                    CACHE_DISCO.guardar(chave, valor)
+                except TypeError:
+                    pass
+        CACHE_CALCULOS.guardar(chave, valor, tamanho_resultado(valor))
+        return valor
+
+    return memorizada
+
+
+def estatisticas_caches():
+    """Estatísticas de todos os caches do processo (cálculos, gráficos e, se ativo, disco)."""
+    estatisticas = {"Cálculos": CACHE_CALCULOS.estatisticas(), "Gráficos": CACHE_GRAFICOS.estatisticas()}
+    if CACHE_DISCO is not None:
+        estatisticas["Disco (SQLite)"] = CACHE_DISCO.estatisticas()
+    return estatisticas
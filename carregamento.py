@@ -0,0 +1,46 @@
+import importlib
+import sys
+import threading
+import time
+
+INICIO_PROCESSO = time.perf_counter()
+TEMPOS_IMPORTACAO = {}
+_EXECUCOES = []
+_TRAVA = threading.Lock()
+
+
+def importar(nome):
+    """
+    Importa um módulo sob demanda (ex.: 'sympy', 'matplotlib.pyplot'), registrando o tempo
+    gasto na primeira importação. Depois disso o módulo já está em sys.modules e a chamada é imediata.
+    """
+    modulo = sys.modules.get(nome)
+    if modulo is not None:
+        return modulo
+    inicio = time.perf_counter()
+    modulo = importlib.import_module(nome)
+    with _TRAVA:
+        TEMPOS_IMPORTACAO.setdefault(nome, time.perf_counter() - inicio)
+    return modulo
+
+
+def registrar_execucao(duracao):
+    """Registra a duração de uma execução do app (a primeira do processo é a partida a frio)."""
+    with _TRAVA:
+        _EXECUCOES.append(duracao)
+        if len(_EXECUCOES) > 1000:
+            del _EXECUCOES[1:-999]
+
+
+def relatorio_inicializacao():
+    """Resumo dos tempos de partida: primeira e última execução, e módulos carregados sob demanda."""
+    with _TRAVA:
+        execucoes = list(_EXECUCOES)
+        importacoes = dict(TEMPOS_IMPORTACAO)
+    return {
+        "Partida a Frio": execucoes[0] if execucoes else None,
+        "Última Execução": execucoes[-1] if execucoes else None,
+        "Execuções": len(execucoes),
+        "Processo Ativo Há": time.perf_counter() - INICIO_PROCESSO,
+        "Importações": importacoes,
+    }
@@ -0,0 +1,142 @@
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+LIMITE_BYTES_SESSAO = 1024 * 1024
+TTL_SESSAO = 30 * 60
+# Com a variável igual a "1", o histórico de iterações é sempre guardado em float32 (metade da memória).
+HISTORICO_FLOAT32 = os.environ.get("CALCULO_NUMERICO_HISTORICO_FLOAT32") == "1"
+# Painel de operação com a memória de todas as sessões: só aparece com a variável igual a "1".
+MOSTRAR_MEMORIA_SESSOES = os.environ.get("CALCULO_NUMERICO_MOSTRAR_MEMORIA") == "1"
+
+
+def sistema_wheatstone(R1, R2, R3, R4, R5, E):
+    """Matriz A e vetor b do sistema das correntes de malha i1, i2, i3 da Ponte de Wheatstone."""
+    A = np.array([
+        [R1 + R4 + R5, -R5, -R4],
+        [-R5, R2 + R3 + R5, -R3],
+        [-R4, -R3, R3 + R4]
+    ], dtype=float)
+    b = np.array([E, 0.0, 0.0], dtype=float)
+    return A, b
+
+
+class ResultadoGaussSeidel:
+    """
+    Resultado compacto do Gauss-Seidel de uma sessão: parâmetros do circuito em um único array,
+    solução e histórico como arrays contíguos (n_iterações x 3). A e b são recalculados dos parâmetros.
+    Se o histórico passar de 'limite_bytes', ele é convertido para float32 e, se ainda assim não couber,
+    só as últimas iterações são mantidas ('primeira_iteracao' indica a primeira guardada).
+    """
+
+    __slots__ = ("parametros", "solucao", "historico", "primeira_iteracao", "num_iter", "usado_em")
+
+    def __init__(self, solucao, historico, num_iter, R1, R2, R3, R4, R5, E, tol,
+                 limite_bytes=LIMITE_BYTES_SESSAO, float32=HISTORICO_FLOAT32):
+        self.parametros = np.array([R1, R2, R3, R4, R5, E, tol], dtype=float)
+        self.solucao = np.array(solucao, dtype=float)
+        self.num_iter = int(num_iter)
+
+        historico = np.asarray(historico, dtype=np.float32 if float32 else float)
+        if historico.nbytes > limite_bytes:
+            historico = historico.astype(np.float32)
+        max_linhas = max(2, limite_bytes // (historico.itemsize * historico.shape[1]))
+        self.primeira_iteracao = max(0, len(historico) - max_linhas)
+        # Cópia própria: uma fatia manteria viva a lista/array original inteira.
+        self.historico = np.array(historico[self.primeira_iteracao:], order="C")
+        self.usado_em = time.monotonic()
+
+    @property
+    def resistencias(self):
+        """Resistências (R1, R2, R3, R4, R5) em ohms."""
+        return tuple(float(r) for r in self.parametros[:5])
+
+    @property
+    def E(self):
+        """Tensão da fonte, em volts."""
+        return float(self.parametros[5])
+
+    @property
+    def tol(self):
+        """Tolerância usada no critério de parada."""
+        return float(self.parametros[6])
+
+    @property
+    def A(self):
+        """Matriz de coeficientes do sistema."""
+        return sistema_wheatstone(*self.resistencias, self.E)[0]
+
+    @property
+    def b(self):
+        """Vetor de termos independentes do sistema."""
+        return sistema_wheatstone(*self.resistencias, self.E)[1]
+
+    def tamanho_bytes(self):
+        """Memória ocupada pelo registro e seus arrays, em bytes."""
+        return sys.getsizeof(self) + sum(
+            sys.getsizeof(array) for array in (self.parametros, self.solucao, self.historico)
+        )
+
+
+class RegistroSessoes:
+    """
+    Resultados por sessão guardados no processo (fora do st.session_state), para que o consumo de
+    cada sessão possa ser medido e os resultados sem uso há mais de 'ttl' segundos sejam descartados,
+    inclusive os de sessões que não voltaram a interagir.
+    """
+
+    def __init__(self, ttl=TTL_SESSAO):
+        self.ttl = ttl
+        self._itens = {}
+        self._trava = threading.Lock()
+        self._expirados = 0
+
+    def _expurgar(self, agora):
+        vencidas = [sessao for sessao, item in self._itens.items() if agora - item.usado_em > self.ttl]
+        for sessao in vencidas:
+            del self._itens[sessao]
+        self._expirados += len(vencidas)
+
+    def guardar(self, sessao, resultado):
+        """Guarda (ou substitui) o resultado da sessão."""
+        with self._trava:
+            self._expurgar(time.monotonic())
+            self._itens[sessao] = resultado
+
+    def obter(self, sessao):
+        """Resultado da sessão, ou None se não houver (ou se tiver expirado)."""
+        with self._trava:
+            agora = time.monotonic()
+            self._expurgar(agora)
+            resultado = self._itens.get(sessao)
+            if resultado is not None:
+                resultado.usado_em = agora
+            return resultado
+
+    def remover(self, sessao):
+        """Descarta o resultado da sessão, se houver."""
+        with self._trava:
+            self._itens.pop(sessao, None)
+
+    def uso_memoria(self):
+        """Lista (sessão, bytes, segundos sem uso, iterações guardadas) de cada sessão ativa."""
+        with self._trava:
+            agora = time.monotonic()
+            self._expurgar(agora)
+            return [
+                (sessao, item.tamanho_bytes(), agora - item.usado_em, len(item.historico))
+                for sessao, item in self._itens.items()
+            ]
+
+    def estatisticas(self):
+        """Número de sessões com resultado, memória total e resultados descartados por expiração."""
+        uso = self.uso_memoria()
+        with self._trava:
+            expirados = self._expirados
+        return {"Sessões": len(uso), "Bytes": sum(item[1] for item in uso), "Expirados": expirados}
+
+
+REGISTRO_GAUSS_SEIDEL = RegistroSessoes()
@@ -0,0 +1,125 @@
+import numpy as np
+from carregamento import importar
+
+TAMANHO_BLOCO_PADRAO = 1_000_000
+TAMANHO_BLOCO_MEMORIA = 65_536
+
+
+def blocos_de_arrays(X, Y, tamanho_bloco=TAMANHO_BLOCO_MEMORIA):
+    """Percorre arrays já em memória em fatias (views), sem copiar os dados."""
+    for inicio in range(0, len(X), tamanho_bloco):
+        yield X[inicio:inicio + tamanho_bloco], Y[inicio:inicio + tamanho_bloco]
+
+
+def ler_blocos(caminho, colunas=(0, 1), tamanho_bloco=TAMANHO_BLOCO_PADRAO, cabecalho=False):
+    """
+    Lê um arquivo de dados em blocos, devolvendo pares (X, Y) de arrays float64.
+    Aceita .npy (lido via memória mapeada, sem carregar o arquivo inteiro) e
+    arquivos de texto .csv (vírgula) ou .txt (espaços), lidos em pedaços pelo leitor C do pandas.
+    'colunas' indica as colunas de X e Y (índices ou nomes, se houver cabeçalho).
+    """
+    caminho = str(caminho)
+    col_x, col_y = colunas
+
+    if caminho.endswith(".npy"):
+        dados = np.load(caminho, mmap_mode="r")
+        if dados.ndim != 2:
+            raise ValueError("O arquivo .npy deve conter uma matriz 2D (linhas x colunas).")
+        for inicio in range(0, dados.shape[0], tamanho_bloco):
+            bloco = dados[inicio:inicio + tamanho_bloco]
+            yield np.asarray(bloco[:, col_x], dtype=float), np.asarray(bloco[:, col_y], dtype=float)
+
+    elif caminho.endswith((".csv", ".txt")):
+        pd = importar("pandas")
+        leitor = pd.read_csv(
+            caminho,
+            usecols=[col_x, col_y],
+            header=0 if cabecalho else None,
+            sep=r"\s+" if caminho.endswith(".txt") else ",",
+            engine="c",
+            chunksize=tamanho_bloco,
+        )
+        for bloco in leitor:
+            yield bloco[col_x].to_numpy(dtype=float), bloco[col_y].to_numpy(dtype=float)
+
+    else:
+        raise ValueError("Formato de arquivo não suportado. Use .npy, .csv ou .txt.")
+
+
+FORMATOS_TABELA = ("csv", "txt", "parquet")
+
+
+def _formato_tabela(nome):
+    """Formato do arquivo pela extensão do nome ('csv', 'txt' ou 'parquet')."""
+    formato = str(nome).rsplit(".", 1)[-1].lower()
+    if formato not in FORMATOS_TABELA:
+        raise ValueError("Formato de arquivo não suportado. Use .csv, .txt ou .parquet.")
+    return formato
+
+
+def _rebobinar(arquivo):
+    """Volta ao início de um objeto de arquivo (ex.: arquivo enviado pelo Streamlit); caminhos são ignorados."""
+    if hasattr(arquivo, "seek"):
+        arquivo.seek(0)
+
+
+def colunas_tabela(arquivo, nome, cabecalho=True):
+    """
+    Nomes das colunas de um arquivo .csv, .txt ou .parquet, sem ler os dados.
+    'arquivo' pode ser um caminho ou um objeto de arquivo; 'nome' define o formato pela extensão.
+    Sem cabeçalho, as colunas são identificadas pelos índices 0, 1, 2, ...
+    """
+    formato = _formato_tabela(nome)
+    _rebobinar(arquivo)
+    if formato == "parquet":
+        pq = importar("pyarrow.parquet")
+        return list(pq.ParquetFile(arquivo).schema_arrow.names)
+
+    pd = importar("pandas")
+    amostra = pd.read_csv(
+        arquivo,
+        nrows=0 if cabecalho else 1,
+        header=0 if cabecalho else None,
+        sep=r"\s+" if formato == "txt" else ",",
+        engine="c",
+    )
+    _rebobinar(arquivo)
+    return list(amostra.columns)
+
+
+def ler_colunas_tabela(arquivo, nome, colunas, cabecalho=True, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """
+    Lê as colunas escolhidas de um arquivo .csv, .txt ou .parquet como arrays float64 (um por coluna).
+    Texto é convertido em blocos pelo leitor C do pandas; Parquet lê só as colunas pedidas e o Arrow
+    as entrega ao NumPy sem cópia quando já são float64 sem valores ausentes.
+    Valores não numéricos geram ValueError; valores ausentes viram NaN.
+    """
+    formato = _formato_tabela(nome)
+    unicas = list(dict.fromkeys(colunas))
+    _rebobinar(arquivo)
+
+    if formato == "parquet":
+        pq = importar("pyarrow.parquet")
+        tabela = pq.read_table(arquivo, columns=unicas)
+        arrays = {
+            coluna: np.asarray(tabela.column(coluna).combine_chunks().to_numpy(zero_copy_only=False), dtype=float)
+            for coluna in unicas
+        }
+    else:
+        pd = importar("pandas")
+        leitor = pd.read_csv(
+            arquivo,
+            usecols=unicas,
+            header=0 if cabecalho else None,
+            sep=r"\s+" if formato == "txt" else ",",
+            dtype=float,
+            engine="c",
+            chunksize=tamanho_bloco,
+        )
+        partes = {coluna: [] for coluna in unicas}
+        for bloco in leitor:
+            for coluna in unicas:
+                partes[coluna].append(bloco[coluna].to_numpy())
+        arrays = {coluna: np.concatenate(partes[coluna]) if partes[coluna] else np.empty(0) for coluna in unicas}
+
+    return tuple(arrays[coluna] for coluna in colunas)
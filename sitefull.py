@@ -1,14 +1,26 @@
+import time
+_INICIO_EXECUCAO = time.perf_counter()
+
+import io
+import uuid
 import streamlit as st
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 import math
-from sympy import sympify, lambdify
-from sympy.abc import x
-from matplotlib import rcParams
-
-rcParams['font.family'] = 'sans-serif'
-rcParams['font.size'] = 10
+from carregamento import importar, registrar_execucao, relatorio_inicializacao
+from cache_resultados import hash_entrada, memorizar, estatisticas_caches, CACHE_GRAFICOS
+from T3_q3 import (
+    regressao_ponderada, regressao_robusta, reduzir_pontos, regressao_em_blocos,
+    estatisticas_suficientes, resolver_subsistema, erro_modelo, ModeloRegressao, formatar_polinomio
+)
+from leitura_dados import blocos_de_arrays, colunas_tabela, ler_colunas_tabela, FORMATOS_TABELA
+from estado_sessao import ResultadoGaussSeidel, sistema_wheatstone, REGISTRO_GAUSS_SEIDEL, MOSTRAR_MEMORIA_SESSOES
+from T4_q1 import (
+    espacamento_uniforme, regra_trapezio_repetida, regra_simpson_repetida, nome_regra_simpson,
+    avaliar_funcao_paralela, integrar_simpson_adaptativo, integrar_gauss_kronrod, integrar_romberg,
+    integrar_quadratura_gaussiana, REGRAS_GAUSSIANAS, ORDEM_MAXIMA_QUADRATURA, compilar_funcao, estatisticas_cache_funcoes,
+    trapezio_acumulado, simpson_acumulado, posicao_para_area, integrar_qmc,
+    erro_estimado_trapezio, erro_estimado_simpson, integrar_malha_automatica, SEQUENCIAS_QMC, variaveis_dimensao
+)
 
 
 st.set_page_config(
@@ -18,17 +30,111 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+def id_sessao():
+    """Identificador desta sessão, usado para guardar os resultados dela fora do st.session_state."""
+    if "id_sessao" not in st.session_state:
+        st.session_state.id_sessao = uuid.uuid4().hex
+    return st.session_state.id_sessao
+
+def carregar_pyplot():
+    """Importa o matplotlib só quando um gráfico é desenhado (e aplica o estilo do app)."""
+    plt = importar("matplotlib.pyplot")
+    plt.rcParams['font.family'] = 'sans-serif'
+    plt.rcParams['font.size'] = 10
+    return plt
+
+DPI_GRAFICOS = 100
+LIMITE_LINHAS_TABELA = 1000
+FONTES_DADOS = ["Digitar valores", "Enviar arquivo (CSV/Parquet)"]
+NENHUMA_COLUNA = "(nenhuma)"
+
+def parse_input(text):
+    """Converte valores separados por vírgula ou espaço em um array (a conversão para float é feita pelo NumPy)."""
+    return np.array(text.replace(',', ' ').split(), dtype=float)
+
+def selecionar_colunas_arquivo(chave, rotulos, opcionais=()):
+    """
+    Campo de envio de arquivo (.csv, .txt ou .parquet) com a escolha de uma coluna para cada rótulo.
+    Retorna (arquivo, cabecalho, colunas), com None nas colunas opcionais deixadas em branco,
+    ou None enquanto nenhum arquivo for enviado.
+    """
+    arquivo = st.file_uploader(
+        "Arquivo de dados (.csv, .txt ou .parquet):", type=list(FORMATOS_TABELA), key=f"arquivo_{chave}",
+        help=".csv separado por vírgula, .txt separado por espaços, ou .parquet."
+    )
+    if arquivo is None:
+        return None
+    
+    cabecalho = True
+    if not arquivo.name.lower().endswith(".parquet"):
+        cabecalho = st.checkbox("A primeira linha contém os nomes das colunas", value=True, key=f"cabecalho_{chave}")
+    colunas_disponiveis = colunas_tabela(arquivo, arquivo.name, cabecalho)
+    
+    escolhas = []
+    for i, (coluna, rotulo) in enumerate(zip(st.columns(len(rotulos)), rotulos)):
+        if rotulo in opcionais:
+            opcoes, indice = [NENHUMA_COLUNA] + colunas_disponiveis, 0
+        else:
+            opcoes, indice = colunas_disponiveis, min(i, len(colunas_disponiveis) - 1)
+        escolha = coluna.selectbox(rotulo, opcoes, index=indice, key=f"coluna_{chave}_{i}")
+        escolhas.append(None if escolha == NENHUMA_COLUNA else escolha)
+    return arquivo, cabecalho, escolhas
+
+def ler_colunas_enviadas(selecao):
+    """Lê as colunas escolhidas em selecionar_colunas_arquivo (None nas opcionais em branco)."""
+    arquivo, cabecalho, escolhas = selecao
+    lidas = iter(ler_colunas_tabela(arquivo, arquivo.name, [c for c in escolhas if c is not None], cabecalho))
+    arrays = [next(lidas) if c is not None else None for c in escolhas]
+    if any(np.isnan(a).any() for a in arrays if a is not None):
+        raise ValueError("O arquivo contém valores ausentes nas colunas escolhidas.")
+    return arrays
+
+def exibir_grafico(desenhar, *dados, **parametros):
+    """
+    Exibe o gráfico produzido por desenhar(*dados, **parametros).
+    A figura é convertida em PNG e sempre fechada (plt.close), mesmo se o desenho falhar, e a imagem
+    fica no cache de gráficos do processo com chave no hash dos dados: reexecuções idênticas não usam o matplotlib.
+    """
+    chave = hash_entrada(desenhar.__name__, *dados, **parametros)
+    imagem = CACHE_GRAFICOS.obter(chave)
+    if imagem is None:
+        plt = carregar_pyplot()
+        abertas = set(plt.get_fignums())
+        try:
+            fig = desenhar(*dados, **parametros)
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format="png", dpi=DPI_GRAFICOS, bbox_inches="tight")
+            imagem = buffer.getvalue()
+        finally:
+            # Fecha toda figura criada aqui, inclusive se desenhar() falhar no meio do gráfico.
+            for numero in set(plt.get_fignums()) - abertas:
+                plt.close(numero)
+        CACHE_GRAFICOS.guardar(chave, imagem, len(imagem))
+    st.image(imagem, width="stretch")
+
+@memorizar
+def calcular_sistema_linear(A, b):
+    """Resolve Ax = b. Retorna (x, None) ou (None, mensagem de erro)."""
+    try:
+        return np.linalg.solve(A, b), None
+    except np.linalg.LinAlgError:
+        return None, "Erro: A matriz de coeficientes é singular. O sistema pode não ter solução única."
+    except ValueError as e:
+        return None, f"Erro de dimensão: {e}. Certifique-se de que A é uma matriz quadrada e b tem o mesmo número de linhas."
+
 def resolver_sistema_linear(A, b, interpretar_producao=True):
     """Resolve um sistema de equações lineares Ax = b e exibe o resultado no Streamlit."""
+    pd = importar("pandas")
     
     st.subheader("Matriz de Coeficientes A")
     st.dataframe(pd.DataFrame(A))
     st.subheader("Vetor de Termos Independentes b")
     st.dataframe(pd.DataFrame(b, columns=['b']))
     
-    try:
-        x = np.linalg.solve(A, b)
-        
+    x, erro = calcular_sistema_linear(A, b)
+    if erro:
+        st.error(erro)
+    else:
         st.subheader("Solução Matemática (x)")
         df_solucao = pd.DataFrame(x, columns=['Valor'])
         df_solucao.index = [f'x{i+1}' for i in range(len(x))]
@@ -47,11 +153,6 @@ def resolver_sistema_linear(A, b, interpretar_producao=True):
             
             **Total de componentes produzidos:** {np.sum(solucao_inteira)} unidades
             """)
-            
-    except np.linalg.LinAlgError:
-        st.error("Erro: A matriz de coeficientes é singular. O sistema pode não ter solução única.")
-    except ValueError as e:
-        st.error(f"Erro de dimensão: {e}. Certifique-se de que A é uma matriz quadrada e b tem o mesmo número de linhas.")
 
 def page_sistemas_lineares():
     st.title("Resolução de Sistemas Lineares 3x3 (T1, Q2)")
@@ -115,6 +216,7 @@ def page_sistemas_lineares():
                 st.error(f"Ocorreu um erro: {e}")
 
 
+@memorizar
 def gauss_seidel_detailed(A, b, x0, max_iter, tol):
     """Implementação do método de Gauss-Seidel para o sistema 3x3."""
     n = len(b)
@@ -165,6 +267,189 @@ def calcular_correntes_finais(i1, i2, i3, R1, R2, R3, R4, R5, E):
         "I_total": I_total
     }
 
+def plotar_convergencia_gauss_seidel(historico, erros, primeira_iteracao=0):
+    """Gera o gráfico da convergência das correntes de malha e da redução do erro por iteração."""
+    plt = carregar_pyplot()
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+    
+    iteracoes = range(primeira_iteracao, primeira_iteracao + len(historico))
+    i1_vals = [h[0] for h in historico]
+    i2_vals = [h[1] for h in historico]
+    i3_vals = [h[2] for h in historico]
+    
+    ax1.plot(iteracoes, i1_vals, 'o-', label='i₁', linewidth=2, markersize=4)
+    ax1.plot(iteracoes, i2_vals, 's-', label='i₂', linewidth=2, markersize=4)
+    ax1.plot(iteracoes, i3_vals, '^-', label='i₃', linewidth=2, markersize=4)
+    ax1.set_xlabel("Iteração", fontsize=11)
+    ax1.set_ylabel("Corrente (A)", fontsize=11)
+    ax1.set_title("Convergência das Correntes de Malha", fontsize=12, fontweight='bold')
+    ax1.legend(fontsize=10)
+    ax1.grid(True, alpha=0.3)
+    
+    if len(erros):
+        ax2.semilogy(range(primeira_iteracao + 1, primeira_iteracao + len(erros) + 1), erros, 'ro-', linewidth=2, markersize=6)
+        ax2.set_xlabel("Iteração", fontsize=11)
+        ax2.set_ylabel("Erro Máximo (escala log)", fontsize=11)
+        ax2.set_title("Redução do Erro por Iteração", fontsize=12, fontweight='bold')
+        ax2.grid(True, alpha=0.3, which='both')
+    else:
+        ax2.text(0.5, 0.5, "Não há iterações suficientes para o gráfico de erro.", ha='center', va='center', transform=ax2.transAxes)
+    
+    fig.tight_layout()
+    return fig
+
+def plotar_correntes_ramos(correntes):
+    """Gera o gráfico de barras das correntes em cada ramo do circuito."""
+    plt = carregar_pyplot()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ramos = ["I(R₁)", "I(R₂)", "I(R₃)", "I(R₄)", "I(R₅)", "I(Total)"]
+
+    cores = ['#1f77b4', '#ff7f0e', '#d62728', '#2ca02c', '#9467bd', '#8c564b']
+    barras = ax.bar(ramos, correntes, color=cores, alpha=0.7, edgecolor='black', linewidth=1.5)
+
+    for bar in barras:
+        yval = bar.get_height()
+        ax.text(
+        bar.get_x() + bar.get_width()/2, 
+        yval + 0.01 * max(correntes), 
+        f'{yval:.6f} A',             
+        ha='center', 
+        va='bottom', 
+        fontsize=9, 
+        fontweight='bold'
+    )
+    
+    ax.set_ylabel("Corrente (A)", fontsize=11)
+    ax.set_title("Correntes em Cada Ramo do Circuito", fontsize=12, fontweight='bold')
+    ax.grid(True, alpha=0.3, axis='y')
+    
+    fig.tight_layout()
+    return fig
+
+@memorizar
+def derivados_gauss_seidel(historico, solucao, R1, R2, R3, R4, R5, E):
+    """
+    Dados derivados dos resultados do Gauss-Seidel, calculados uma vez por solução:
+    o erro máximo de cada iteração e as correntes em cada ramo.
+    """
+    historico = np.asarray(historico)
+    erros = np.max(np.abs(np.diff(historico, axis=0)), axis=1) if len(historico) > 1 else np.empty(0)
+    correntes_ramo = calcular_correntes_finais(solucao[0], solucao[1], solucao[2], R1, R2, R3, R4, R5, E)
+    return erros, correntes_ramo
+
+# Cada aba de resultados é um fragmento: interagir com uma delas reexecuta apenas a própria aba.
+@st.fragment
+def exibir_iteracoes_gauss_seidel(historico, erros, primeira_iteracao=0):
+    """Tabela das iterações com o erro máximo de cada uma e o download em CSV."""
+    pd = importar("pandas")
+    st.subheader("Detalhamento de Cada Iteração")
+
+    df_historico = pd.DataFrame(
+        historico,
+        columns=["i₁ (A)", "i₂ (A)", "i₃ (A)"]
+    )
+    df_historico.index = np.arange(primeira_iteracao, primeira_iteracao + len(df_historico))
+    df_historico.index.name = "Iteração"
+
+    df_historico["Erro Máximo"] = np.concatenate(([0.0], erros))
+
+    st.dataframe(df_historico.style.format("{:.6f}"), width="stretch")
+    if primeira_iteracao:
+        st.caption(f"Para limitar a memória da sessão, só as últimas {len(df_historico)} iterações foram guardadas.")
+
+    csv = df_historico.to_csv().encode('utf-8')
+    st.download_button(
+        label="📥 Baixar Tabela (CSV)",
+        data=csv,
+        file_name="iteracoes_gauss_seidel.csv",
+        mime="text/csv"
+    )
+
+@st.fragment
+def exibir_convergencia_gauss_seidel(historico, erros, num_iter, tol, primeira_iteracao=0):
+    """Gráfico de convergência e métricas de iterações, tolerância e erro final."""
+    st.subheader("Análise de Convergência")
+
+    exibir_grafico(plotar_convergencia_gauss_seidel, historico, erros, primeira_iteracao)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Número de Iterações", num_iter)
+    with col2:
+        st.metric("Tolerância (ε)", f"{tol}")
+    with col3:
+        if len(erros):
+            st.metric("Erro Final", f"{erros[-1]:.2e}")
+        else:
+            st.metric("Erro Final", "N/A")
+
+@st.fragment
+def exibir_correntes_gauss_seidel(correntes_ramo, R1, R2, R3, R4, R5, E):
+    """Tabela e gráfico das correntes e quedas de tensão em cada ramo."""
+    pd = importar("pandas")
+    st.subheader("Correntes em Cada Ramo do Circuito")
+
+    df_correntes = pd.DataFrame({
+        "Ramo": ["R₁", "R₂", "R₃", "R₄", "R₅", "Total (Fonte)"],
+        "Resistência (Ω)": [R1, R2, R3, R4, R5, "-"],
+        "Corrente (A)": [
+            correntes_ramo["I_R1"], 
+            correntes_ramo["I_R2"], 
+            correntes_ramo["I_R3"], 
+            correntes_ramo["I_R4"], 
+            correntes_ramo["I_R5"], 
+            correntes_ramo["I_total"]
+        ],
+        "Queda de Tensão (V)": [
+            correntes_ramo["I_R1"]*R1, 
+            correntes_ramo["I_R2"]*R2, 
+            correntes_ramo["I_R3"]*R3, 
+            correntes_ramo["I_R4"]*R4, 
+            correntes_ramo["I_R5"]*R5, 
+            E
+        ]
+    })
+
+    st.dataframe(df_correntes.style.format({
+        "Corrente (A)": "{:.6f}",
+        "Queda de Tensão (V)": "{:.6f}"
+    }), width="stretch")
+
+    correntes = [
+        correntes_ramo["I_R1"], 
+        correntes_ramo["I_R2"], 
+        correntes_ramo["I_R3"], 
+        correntes_ramo["I_R4"], 
+        correntes_ramo["I_R5"], 
+        correntes_ramo["I_total"]
+    ]
+    exibir_grafico(plotar_correntes_ramos, correntes)
+
+@st.fragment
+def exibir_verificacao_gauss_seidel(A, b, solucao):
+    """Verificação da solução pelo resíduo |Ax - b|."""
+    st.subheader("Verificação da Solução")
+
+    Ax = A @ solucao
+
+    st.markdown("**Sistema Original:**")
+    st.code(f"A = {A.tolist()}\nb = {b.tolist()}")
+
+    st.markdown("**Solução Encontrada:**")
+    st.code(f"x = {solucao.tolist()}")
+
+    st.markdown("**Verificação (Ax):**")
+    st.code(f"Ax = {Ax.tolist()}")
+
+    st.markdown("**Erro Residual (|Ax - b|):**")
+    erro_residual = np.abs(Ax - b)
+    st.code(f"Erro = {erro_residual.tolist()}")
+
+    if np.max(erro_residual) < 1e-4:
+        st.success("✅ Solução verificada com sucesso! O erro residual é muito pequeno.")
+    else:
+        st.warning(f"⚠️ Verifique a solução. O erro residual máximo é {np.max(erro_residual):.2e}.")
+
 def page_ponte_wheatstone():
     st.title("Ponte de Wheatstone - Método de Gauss-Seidel (T2, Q1)")
     st.markdown("---")
@@ -302,29 +587,15 @@ def page_ponte_wheatstone():
         st.markdown("---")
         
         if st.button("🚀 Resolver Sistema", use_container_width=True, key="exec_gs"):
-            A = np.array([
-                [R1 + R4 + R5, -R5, -R4],
-                [-R5, R2 + R3 + R5, -R3],
-                [-R4, -R3, R3 + R4]
-            ], dtype=float)
-            b = np.array([E, 0.0, 0.0], dtype=float)
+            A, b = sistema_wheatstone(R1, R2, R3, R4, R5, E)
             x0 = np.array([0.0, 0.0, 0.0])
             
             try:
                 solucao, historico, num_iter = gauss_seidel_detailed(A, b, x0, max_iter, tol)
                 
-                st.session_state.gs_solucao = solucao
-                st.session_state.gs_historico = historico
-                st.session_state.gs_num_iter = num_iter
-                st.session_state.gs_A = A
-                st.session_state.gs_b = b
-                st.session_state.gs_E = E
-                st.session_state.gs_R1 = R1
-                st.session_state.gs_R2 = R2
-                st.session_state.gs_R3 = R3
-                st.session_state.gs_R4 = R4
-                st.session_state.gs_R5 = R5
-                st.session_state.gs_tol = tol
+                REGISTRO_GAUSS_SEIDEL.guardar(
+                    id_sessao(), ResultadoGaussSeidel(solucao, historico, num_iter, R1, R2, R3, R4, R5, E, tol)
+                )
                 
                 st.success(f"✅ Sistema resolvido em {num_iter} iterações!")
                 
@@ -347,21 +618,21 @@ def page_ponte_wheatstone():
     elif page == "📊 Resultados Detalhados":
         st.header("📊 Resultados Detalhados")
         
-        if "gs_solucao" not in st.session_state:
-            st.warning("⚠️ Primeiro, resolva o sistema na seção 'Calculadora'.")
+        resultado = REGISTRO_GAUSS_SEIDEL.obter(id_sessao())
+        if resultado is None:
+            st.warning("⚠️ Primeiro, resolva o sistema na seção 'Calculadora'. "
+                       "Resultados sem uso por muito tempo são descartados e precisam ser recalculados.")
         else:
-            solucao = st.session_state.gs_solucao
-            historico = st.session_state.gs_historico
-            num_iter = st.session_state.gs_num_iter
-            A = st.session_state.gs_A
-            b = st.session_state.gs_b
-            E = st.session_state.gs_E
-            R1 = st.session_state.gs_R1
-            R2 = st.session_state.gs_R2
-            R3 = st.session_state.gs_R3
-            R4 = st.session_state.gs_R4
-            R5 = st.session_state.gs_R5
-            tol = st.session_state.gs_tol
+            solucao = resultado.solucao
+            historico = resultado.historico
+            num_iter = resultado.num_iter
+            A, b = resultado.A, resultado.b
+            E = resultado.E
+            R1, R2, R3, R4, R5 = resultado.resistencias
+            tol = resultado.tol
+            primeira_iteracao = resultado.primeira_iteracao
+            
+            erros, correntes_ramo = derivados_gauss_seidel(historico, solucao, R1, R2, R3, R4, R5, E)
             
             tab1, tab2, tab3, tab4 = st.tabs([
                 "Iterações Detalhadas",
@@ -371,247 +642,31 @@ def page_ponte_wheatstone():
             ])
             
             with tab1:
-                st.subheader("Detalhamento de Cada Iteração")
-                
-                df_historico = pd.DataFrame(
-                    historico,
-                    columns=["i₁ (A)", "i₂ (A)", "i₃ (A)"]
-                )
-                df_historico.index.name = "Iteração"
-                
-                erros = []
-                for i in range(1, len(historico)):
-                    erro = np.linalg.norm(np.array(historico[i]) - np.array(historico[i-1]), ord=np.inf)
-                    erros.append(erro)
-                
-                df_historico["Erro Máximo"] = [0.0] + erros
-                
-                st.dataframe(df_historico.style.format("{:.6f}"), use_container_width=True)
-                
-                csv = df_historico.to_csv().encode('utf-8')
-                st.download_button(
-                    label="📥 Baixar Tabela (CSV)",
-                    data=csv,
-                    file_name="iteracoes_gauss_seidel.csv",
-                    mime="text/csv"
-                )
-            
+                exibir_iteracoes_gauss_seidel(historico, erros, primeira_iteracao)
             with tab2:
-                st.subheader("Análise de Convergência")
-                
-                fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
-                
-                iteracoes = range(len(historico))
-                i1_vals = [h[0] for h in historico]
-                i2_vals = [h[1] for h in historico]
-                i3_vals = [h[2] for h in historico]
-                
-                ax1.plot(iteracoes, i1_vals, 'o-', label='i₁', linewidth=2, markersize=4)
-                ax1.plot(iteracoes, i2_vals, 's-', label='i₂', linewidth=2, markersize=4)
-                ax1.plot(iteracoes, i3_vals, '^-', label='i₃', linewidth=2, markersize=4)
-                ax1.set_xlabel("Iteração", fontsize=11)
-                ax1.set_ylabel("Corrente (A)", fontsize=11)
-                ax1.set_title("Convergência das Correntes de Malha", fontsize=12, fontweight='bold')
-                ax1.legend(fontsize=10)
-                ax1.grid(True, alpha=0.3)
-                
-                if erros:
-                    ax2.semilogy(range(1, len(erros) + 1), erros, 'ro-', linewidth=2, markersize=6)
-                    ax2.set_xlabel("Iteração", fontsize=11)
-                    ax2.set_ylabel("Erro Máximo (escala log)", fontsize=11)
-                    ax2.set_title("Redução do Erro por Iteração", fontsize=12, fontweight='bold')
-                    ax2.grid(True, alpha=0.3, which='both')
-                else:
-                    ax2.text(0.5, 0.5, "Não há iterações suficientes para o gráfico de erro.", ha='center', va='center', transform=ax2.transAxes)
-                
-                plt.tight_layout()
-                st.pyplot(fig)
-                
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Número de Iterações", num_iter)
-                with col2:
-                    st.metric("Tolerância (ε)", f"{tol}")
-                with col3:
-                    if erros:
-                        st.metric("Erro Final", f"{erros[-1]:.2e}")
-                    else:
-                        st.metric("Erro Final", "N/A")
-            
+                exibir_convergencia_gauss_seidel(historico, erros, num_iter, tol, primeira_iteracao)
             with tab3:
-                st.subheader("Correntes em Cada Ramo do Circuito")
-                
-                correntes_ramo = calcular_correntes_finais(solucao[0], solucao[1], solucao[2], R1, R2, R3, R4, R5, E)
-                
-                df_correntes = pd.DataFrame({
-                    "Ramo": ["R₁", "R₂", "R₃", "R₄", "R₅", "Total (Fonte)"],
-                    "Resistência (Ω)": [R1, R2, R3, R4, R5, "-"],
-                    "Corrente (A)": [
-                        correntes_ramo["I_R1"], 
-                        correntes_ramo["I_R2"], 
-                        correntes_ramo["I_R3"], 
-                        correntes_ramo["I_R4"], 
-                        correntes_ramo["I_R5"], 
-                        correntes_ramo["I_total"]
-                    ],
-                    "Queda de Tensão (V)": [
-                        correntes_ramo["I_R1"]*R1, 
-                        correntes_ramo["I_R2"]*R2, 
-                        correntes_ramo["I_R3"]*R3, 
-                        correntes_ramo["I_R4"]*R4, 
-                        correntes_ramo["I_R5"]*R5, 
-                        E
-                    ]
-                })
-                
-                st.dataframe(df_correntes.style.format({
-                    "Corrente (A)": "{:.6f}",
-                    "Queda de Tensão (V)": "{:.6f}"
-                }), use_container_width=True)
-                
-                fig, ax = plt.subplots(figsize=(10, 6))
-                ramos = ["I(R₁)", "I(R₂)", "I(R₃)", "I(R₄)", "I(R₅)", "I(Total)"]
-                correntes = [
-                    correntes_ramo["I_R1"], 
-                    correntes_ramo["I_R2"], 
-                    correntes_ramo["I_R3"], 
-                    correntes_ramo["I_R4"], 
-                    correntes_ramo["I_R5"], 
-                    correntes_ramo["I_total"]
-                ]
-
-                cores = ['#1f77b4', '#ff7f0e', '#d62728', '#2ca02c', '#9467bd', '#8c564b']
-                barras = ax.bar(ramos, correntes, color=cores, alpha=0.7, edgecolor='black', linewidth=1.5)
-
-                for bar in barras:
-                    yval = bar.get_height()
-                    ax.text(
-                    bar.get_x() + bar.get_width()/2, 
-                    yval + 0.01 * max(correntes), 
-                    f'{yval:.6f} A',             
-                    ha='center', 
-                    va='bottom', 
-                    fontsize=9, 
-                    fontweight='bold'
-                )
-                
-                ax.set_ylabel("Corrente (A)", fontsize=11)
-                ax.set_title("Correntes em Cada Ramo do Circuito", fontsize=12, fontweight='bold')
-                ax.grid(True, alpha=0.3, axis='y')
-                
-                plt.tight_layout()
-                st.pyplot(fig)
-            
+                exibir_correntes_gauss_seidel(correntes_ramo, R1, R2, R3, R4, R5, E)
             with tab4:
-                st.subheader("Verificação da Solução")
-                
-                Ax = A @ solucao
-                
-                st.markdown("**Sistema Original:**")
-                st.code(f"A = {A.tolist()}\nb = {b.tolist()}")
-                
-                st.markdown("**Solução Encontrada:**")
-                st.code(f"x = {solucao.tolist()}")
-                
-                st.markdown("**Verificação (Ax):**")
-                st.code(f"Ax = {Ax.tolist()}")
-                
-                st.markdown("**Erro Residual (|Ax - b|):**")
-                erro_residual = np.abs(Ax - b)
-                st.code(f"Erro = {erro_residual.tolist()}")
-                
-                if np.max(erro_residual) < 1e-4:
-                    st.success("✅ Solução verificada com sucesso! O erro residual é muito pequeno.")
-                else:
-                    st.warning(f"⚠️ Verifique a solução. O erro residual máximo é {np.max(erro_residual):.2e}.")
-
-def erro_quadratico(Y_observado, Y_ajustado):
-    """Calcula o erro quadrático cometido."""
-    return np.sum((Y_observado - Y_ajustado)**2)
-
-def formatar_polinomio(coefs, tipo):
-    """Formata os coeficientes em uma string de equação."""
-    if tipo == "Reta":
-        return f"G(x) = {coefs[0]:.4f} + {coefs[1]:.4f}*x"
-    elif tipo == "Parábola":
-        return f"G(x) = {coefs[0]:.4f} + {coefs[1]:.4f}*x + {coefs[2]:.4f}*x^2"
-    elif tipo == "Exponencial":
-        a = math.exp(coefs[0])
-        b = coefs[1]
-        return f"G(x) = {a:.4f} * e^({b:.4f}*x)"
-    return ""
-
-def regressao_linear(X, Y):
-    """Ajusta os dados a uma reta: G(x) = a0 + a1*x"""
-    N = len(X)
-    sum_x = np.sum(X)
-    sum_y = np.sum(Y)
-    sum_x2 = np.sum(X**2)
-    sum_xy = np.sum(X * Y)
-    
-    A = np.array([[N, sum_x], [sum_x, sum_x2]])
-    b = np.array([sum_y, sum_xy])
-    
-    coefs = np.linalg.solve(A, b)
-    Y_ajustado = coefs[0] + coefs[1] * X
-    return coefs, Y_ajustado
+                exibir_verificacao_gauss_seidel(A, b, solucao)
 
-def regressao_quadratica(X, Y):
-    """Ajusta os dados a uma parábola: G(x) = a0 + a1*x + a2*x^2"""
-    N = len(X)
-    sum_x = np.sum(X)
-    sum_x2 = np.sum(X**2)
-    sum_x3 = np.sum(X**3)
-    sum_x4 = np.sum(X**4)
-    sum_y = np.sum(Y)
-    sum_xy = np.sum(X * Y)
-    sum_x2y = np.sum((X**2) * Y)
-    
-    A = np.array([
-        [N, sum_x, sum_x2],
-        [sum_x, sum_x2, sum_x3],
-        [sum_x2, sum_x3, sum_x4]
-    ])
-    b = np.array([sum_y, sum_xy, sum_x2y])
-    
-    coefs = np.linalg.solve(A, b)
-    Y_ajustado = coefs[0] + coefs[1] * X + coefs[2] * (X**2)
-    return coefs, Y_ajustado
-
-def regressao_exponencial(X, Y):
-    """Ajusta os dados a uma exponencial: G(x) = a*e^(b*x)"""
-    if np.any(Y <= 0):
-        raise ValueError("Regressão exponencial requer que todos os valores de F(x) sejam positivos.")
-        
-    Y_lin = np.log(Y)
-    coefs_lin, Y_lin_ajustado = regressao_linear(X, Y_lin)
-    Y_ajustado = np.exp(Y_lin_ajustado)
-    return coefs_lin, Y_ajustado
-
-def plotar_ajustes(X, Y, resultados):
-    """Gera o gráfico dos dados originais e das curvas de ajuste."""
+def plotar_ajustes(X, Y, resultados, max_pontos=2000, modo="lttb"):
+    """Gera o gráfico dos dados originais e das curvas de ajuste, reduzindo os pontos quando N é grande."""
+    plt = carregar_pyplot()
     fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(X, Y, 'o', label='Dados Originais F(x)', color='black')
+    if modo == "densidade" and len(X) > max_pontos:
+        ax.hexbin(X, Y, gridsize=80, bins='log', cmap='Greys', mincnt=1)
+        ax.plot([], [], 'h', label='Densidade dos Dados F(x)', color='gray')
+    else:
+        X_graf, Y_graf = reduzir_pontos(X, Y, max_pontos, modo)
+        ax.plot(X_graf, Y_graf, 'o', label='Dados Originais F(x)', color='black')
     
     X_plot = np.linspace(X.min(), X.max(), 100)
     
+    estilos = {"Reta": '-', "Parábola": '--', "Exponencial": ':'}
     for res in resultados:
-        ajuste = res["Ajuste"]
-        coefs = res["Coeficientes"]
-        
-        if ajuste == "Reta":
-            Y_plot = coefs[0] + coefs[1] * X_plot
-            ax.plot(X_plot, Y_plot, '-', label=f'Reta (Erro: {res["Erro Quadrático"]:.3f})')
-        
-        elif ajuste == "Parábola":
-            Y_plot = coefs[0] + coefs[1] * X_plot + coefs[2] * (X_plot**2)
-            ax.plot(X_plot, Y_plot, '--', label=f'Parábola (Erro: {res["Erro Quadrático"]:.3f})')
-            
-        elif ajuste == "Exponencial":
-            a = math.exp(coefs[0])
-            b = coefs[1]
-            Y_plot = a * np.exp(b * X_plot)
-            ax.plot(X_plot, Y_plot, ':', label=f'Exponencial (Erro: {res["Erro Quadrático"]:.3f})')
+        Y_plot = res["Modelo"].prever(X_plot)
+        ax.plot(X_plot, Y_plot, estilos[res["Ajuste"]], label=f'{res["Ajuste"]} (Erro: {res["Erro Quadrático"]:.3f})')
             
     ax.set_title('Regressão por Mínimos Quadrados: Comparação de Ajustes')
     ax.set_xlabel('X')
@@ -621,71 +676,119 @@ def plotar_ajustes(X, Y, resultados):
     
     return fig
 
-def processar_regressao(X, Y):
-    """Executa as 3 regressões e apresenta os resultados."""
-    
+def ajustar_polinomio_metodo(X, Y, grau, estado, metodo="Mínimos Quadrados", pesos=None):
+    """Ajusta Reta (grau 1) ou Parábola (grau 2) pelo método escolhido e devolve os coeficientes."""
+    if metodo in ("Huber", "Tukey"):
+        coefs, _, _ = regressao_robusta(X, Y, grau=grau, metodo=metodo, pesos=pesos)
+        return coefs
+    if pesos is not None:
+        coefs, _ = regressao_ponderada(X, Y, pesos, grau=grau)
+        return coefs
+    return resolver_subsistema(estado, grau)
+
+@memorizar
+def calcular_regressao(X, Y, metodo="Mínimos Quadrados", pesos=None, verificar=False):
+    """
+    Executa as 3 regressões sem exibir nada. Retorna (resultados, avisos), em que 'avisos' é uma
+    lista de pares ("error" ou "warning", mensagem) a exibir junto com os resultados.
+    """
     resultados = []
-    st.subheader("Dados Fornecidos")
-    st.dataframe(pd.DataFrame({'X': X, 'F(x)': Y}))
+    avisos = []
+    estado = estatisticas_suficientes(X, Y, "Parábola" if len(X) >= 3 else "Reta")
     
     try:
-        coefs_linear, Y_ajustado_linear = regressao_linear(X, Y)
-        erro_linear = erro_quadratico(Y, Y_ajustado_linear)
+        coefs_linear = ajustar_polinomio_metodo(X, Y, 1, estado, metodo, pesos)
+        erro_linear = erro_modelo(X, Y, coefs_linear, "Reta", estado)
         equacao_linear = formatar_polinomio(coefs_linear, "Reta")
         
         resultados.append({
             "Ajuste": "Reta",
             "Equação": equacao_linear,
             "Erro Quadrático": erro_linear,
-            "Coeficientes": coefs_linear
+            "Coeficientes": coefs_linear,
+            "Modelo": ModeloRegressao("Reta", coefs_linear, erro_linear)
         })
+        if verificar:
+            resultados[-1]["Erro (Resíduos)"] = erro_modelo(X, Y, coefs_linear, "Reta", estado, verificar=True)
     except Exception as e:
-        st.error(f"Erro na Regressão Linear: {e}")
+        avisos.append(("error", f"Erro na Regressão Linear: {e}"))
         
     try:
         if len(X) < 3:
-            st.warning("Aviso: Mínimo de 3 pontos necessários para regressão quadrática. Ignorando.")
+            avisos.append(("warning", "Aviso: Mínimo de 3 pontos necessários para regressão quadrática. Ignorando."))
         else:
-            coefs_quadratica, Y_ajustado_quadratica = regressao_quadratica(X, Y)
-            erro_quadratica = erro_quadratico(Y, Y_ajustado_quadratica)
+            coefs_quadratica = ajustar_polinomio_metodo(X, Y, 2, estado, metodo, pesos)
+            erro_quadratica = erro_modelo(X, Y, coefs_quadratica, "Parábola", estado)
             equacao_quadratica = formatar_polinomio(coefs_quadratica, "Parábola")
             
             resultados.append({
                 "Ajuste": "Parábola",
                 "Equação": equacao_quadratica,
                 "Erro Quadrático": erro_quadratica,
-                "Coeficientes": coefs_quadratica
+                "Coeficientes": coefs_quadratica,
+                "Modelo": ModeloRegressao("Parábola", coefs_quadratica, erro_quadratica)
             })
+            if verificar:
+                resultados[-1]["Erro (Resíduos)"] = erro_modelo(X, Y, coefs_quadratica, "Parábola", estado, verificar=True)
     except Exception as e:
-        st.error(f"Erro na Regressão Quadrática: {e}")
+        avisos.append(("error", f"Erro na Regressão Quadrática: {e}"))
         
     try:
-        coefs_exp_lin, Y_ajustado_exp = regressao_exponencial(X, Y)
-        erro_exp = erro_quadratico(Y, Y_ajustado_exp)
+        coefs_exp_lin, _ = regressao_em_blocos(blocos_de_arrays(X, Y), "Exponencial")
+        erro_exp = erro_modelo(X, Y, coefs_exp_lin, "Exponencial", estado)
         equacao_exp = formatar_polinomio(coefs_exp_lin, "Exponencial")
         
         resultados.append({
             "Ajuste": "Exponencial",
             "Equação": equacao_exp,
             "Erro Quadrático": erro_exp,
-            "Coeficientes": coefs_exp_lin
+            "Coeficientes": coefs_exp_lin,
+            "Modelo": ModeloRegressao("Exponencial", coefs_exp_lin, erro_exp)
         })
+        if verificar:
+            resultados[-1]["Erro (Resíduos)"] = erro_exp
     except ValueError as e:
-        st.warning(f"Aviso na Regressão Exponencial: {e}")
+        avisos.append(("warning", f"Aviso na Regressão Exponencial: {e}"))
     except Exception as e:
-        st.error(f"Erro na Regressão Exponencial: {e}")
+        avisos.append(("error", f"Erro na Regressão Exponencial: {e}"))
+    
+    return resultados, avisos
+
+def processar_regressao(X, Y, metodo="Mínimos Quadrados", pesos=None, modo_grafico="lttb", verificar=False):
+    """Executa as 3 regressões e apresenta os resultados."""
+    pd = importar("pandas")
+    
+    st.subheader("Dados Fornecidos")
+    st.dataframe(pd.DataFrame({'X': X[:LIMITE_LINHAS_TABELA], 'F(x)': Y[:LIMITE_LINHAS_TABELA]}))
+    if len(X) > LIMITE_LINHAS_TABELA:
+        st.caption(f"Exibindo os primeiros {LIMITE_LINHAS_TABELA} de {len(X)} pontos.")
+    
+    if metodo != "Mínimos Quadrados" or pesos is not None:
+        st.info(f"Reta e Parábola ajustadas por **{metodo}**{' com pesos informados' if pesos is not None else ''}. "
+                "O Erro Quadrático exibido considera todos os pontos com peso unitário.")
+    
+    resultados, avisos = calcular_regressao(X, Y, metodo, pesos, verificar)
+    for tipo, mensagem in avisos:
+        getattr(st, tipo)(mensagem)
         
     if resultados:
         st.subheader("Resumo dos Ajustes")
         df_resultados = pd.DataFrame(resultados)
         df_resultados = df_resultados.sort_values(by="Erro Quadrático")
-        st.dataframe(df_resultados[["Ajuste", "Equação", "Erro Quadrático"]].style.format({"Erro Quadrático": "{:.6f}"}))
+        colunas_erro = ["Erro Quadrático", "Erro (Resíduos)"] if verificar else ["Erro Quadrático"]
+        st.dataframe(df_resultados[["Ajuste", "Equação"] + colunas_erro].style.format({c: "{:.6f}" for c in colunas_erro}))
         
         melhor_ajuste = df_resultados.iloc[0]
         st.success(f"O **melhor ajuste** (menor Erro Quadrático) é a **{melhor_ajuste['Ajuste']}** com Erro Quadrático de **{melhor_ajuste['Erro Quadrático']:.6f}**.")
+        st.download_button(
+            label="📥 Baixar Melhor Modelo (.rgm)",
+            data=melhor_ajuste["Modelo"].para_bytes(),
+            file_name=f"modelo_{melhor_ajuste['Ajuste'].lower()}.rgm",
+            mime="application/octet-stream",
+            help="Modelo binário compacto; carregue com ModeloRegressao.carregar() para previsões em lote."
+        )
         
-        fig = plotar_ajustes(X, Y, resultados)
-        st.pyplot(fig)
+        exibir_grafico(plotar_ajustes, X, Y, resultados, modo=modo_grafico)
     else:
         st.error("Não foi possível realizar nenhum ajuste.")
 
@@ -710,62 +813,69 @@ def page_regressao_minimos_quadrados():
             
     elif page == "Inserir Novos Dados":
         st.header("Inserir Novos Dados")
-        st.markdown("Insira os valores de X e F(x) separados por vírgula ou espaço.")
+        fonte = st.radio("Fonte dos dados:", FONTES_DADOS, horizontal=True, key="fonte_regressao")
         
-        col_x, col_y = st.columns(2)
+        if fonte == FONTES_DADOS[0]:
+            st.markdown("Insira os valores de X e F(x) separados por vírgula ou espaço.")
+            
+            col_x, col_y = st.columns(2)
+            
+            x_input = col_x.text_area("Valores de X:", "0, 1.5, 2.6, 4.2, 6.0, 8.2, 10.0, 11.4")
+            y_input = col_y.text_area("Valores de F(x):", "18.0, 13.0, 11.0, 9.0, 6.0, 4.0, 2.0, 1.0")
+        else:
+            st.markdown("Envie um arquivo com os dados e escolha as colunas de X, F(x) e, se houver, dos pesos.")
+            selecao = selecionar_colunas_arquivo(
+                "regressao", ["Coluna de X:", "Coluna de F(x):", "Coluna de pesos wᵢ (opcional):"],
+                opcionais=("Coluna de pesos wᵢ (opcional):",)
+            )
         
-        x_input = col_x.text_area("Valores de X:", "0, 1.5, 2.6, 4.2, 6.0, 8.2, 10.0, 11.4")
-        y_input = col_y.text_area("Valores de F(x):", "18.0, 13.0, 11.0, 9.0, 6.0, 4.0, 2.0, 1.0")
+        col_metodo, col_pesos = st.columns(2)
+        metodo = col_metodo.selectbox(
+            "Método de Ajuste (Reta e Parábola):",
+            ["Mínimos Quadrados", "Huber", "Tukey"],
+            help="Huber e Tukey são M-estimadores robustos que reduzem a influência de outliers (IRLS)."
+        )
+        if fonte == FONTES_DADOS[0]:
+            pesos_input = col_pesos.text_area("Pesos wᵢ (opcional):", "")
+        modos_grafico = {"Redução LTTB": "lttb", "Mín/Máx por pixel": "minmax", "Densidade (hexbin)": "densidade"}
+        modo_grafico = st.selectbox(
+            "Visualização dos pontos (acima de 2000 pontos):",
+            list(modos_grafico),
+            help="Limita o custo de renderização do gráfico para conjuntos de dados grandes."
+        )
+        verificar = st.checkbox(
+            "Verificar o erro com uma passada exata nos resíduos",
+            help="Por padrão, o Erro Quadrático de Reta e Parábola é obtido das somas já usadas no ajuste, sem calcular os resíduos."
+        )
         
-        if st.button("Executar Regressão", key="exec_regressao_user"):
+        sem_arquivo = fonte != FONTES_DADOS[0] and selecao is None
+        if st.button("Executar Regressão", key="exec_regressao_user", disabled=sem_arquivo):
             try:
-                def parse_input(text):
-                    text = text.replace(',', ' ').strip()
-                    return np.array([float(val) for val in text.split() if val])
-
-                X_user = parse_input(x_input)
-                Y_user = parse_input(y_input)
+                if fonte == FONTES_DADOS[0]:
+                    X_user = parse_input(x_input)
+                    Y_user = parse_input(y_input)
+                    pesos_user = parse_input(pesos_input) if pesos_input.strip() else None
+                else:
+                    X_user, Y_user, pesos_user = ler_colunas_enviadas(selecao)
                 
                 if len(X_user) != len(Y_user):
                     st.error("Erro: O número de valores para X e F(x) deve ser o mesmo.")
                 elif len(X_user) < 2:
                     st.error("Erro: São necessários pelo menos 2 pontos para a regressão linear.")
+                elif pesos_user is not None and len(pesos_user) != len(X_user):
+                    st.error("Erro: O número de pesos deve ser igual ao número de pontos.")
                 else:
-                    processar_regressao(X_user, Y_user)
+                    processar_regressao(X_user, Y_user, metodo=metodo, pesos=pesos_user,
+                                        modo_grafico=modos_grafico[modo_grafico], verificar=verificar)
                     
             except ValueError:
                 st.error("Erro: Certifique-se de que todos os valores inseridos são números válidos.")
             except Exception as e:
                 st.error(f"Ocorreu um erro inesperado: {e}")
 
-def regra_trapezio_repetida_func(X, Y):
-    """Calcula a integral usando a Regra do Trapézio Repetida."""
-    N = len(X)
-    if N < 2:
-        return None, "Erro: Mínimo de 2 pontos necessários para a Regra do Trapézio."
-    
-    h = X[1] - X[0]
-    soma_interna = np.sum(Y[1:-1])
-    integral = (h / 2) * (Y[0] + 2 * soma_interna + Y[-1])
-    return integral, None
-
-def regra_simpson_repetida_func(X, Y):
-    """Calcula a integral usando a Regra de Simpson 1/3 Repetida."""
-    N = len(X)
-    if N < 3:
-        return None, "Erro: Mínimo de 3 pontos necessários para a Regra de Simpson."
-    
-    if (N - 1) % 2 != 0:
-        return None, "Erro: O número de subintervalos (N-1) deve ser par para a Regra de Simpson Repetida."
-        
-    h = X[1] - X[0]
-    soma_impares = np.sum(Y[1:-1:2])
-    soma_pares = np.sum(Y[2:-1:2])
-    integral = (h / 3) * (Y[0] + 4 * soma_impares + 2 * soma_pares + Y[-1])
-    return integral, None
-
 def plotar_integracao(X, Y, titulo="Gráfico de Integração Numérica"):
     """Gera o gráfico dos pontos e da área."""
+    plt = carregar_pyplot()
     fig, ax = plt.subplots(figsize=(10, 6))
     
     ax.plot(X, Y, '-', label='Função/Perfil', color='blue')
@@ -786,44 +896,123 @@ def plotar_integracao(X, Y, titulo="Gráfico de Integração Numérica"):
     
     return fig
 
+@memorizar
+def calcular_integracao(X, Y):
+    """
+    Calcula as integrais por Trapézio e Simpson, com os erros estimados, sem exibir nada.
+    Retorna (resultados, avisos), em que 'avisos' lista as mensagens das regras não aplicáveis.
+    """
+    resultados = []
+    avisos = []
+    N = len(X)
+    
+    integral_trapezio, erro_trapezio = regra_trapezio_repetida(X, Y)
+    if erro_trapezio:
+        avisos.append(f"Trapézio: {erro_trapezio}")
+    else:
+        resultados.append({"Método": "Trapézio Repetida", "Resultado": integral_trapezio,
+                           "Erro Estimado": erro_estimado_trapezio(X, Y)})
+        
+    integral_simpson, erro_simpson = regra_simpson_repetida(X, Y)
+    if erro_simpson:
+        avisos.append(f"Simpson: {erro_simpson}")
+    else:
+        resultados.append({"Método": nome_regra_simpson(N), "Resultado": integral_simpson,
+                           "Erro Estimado": erro_estimado_simpson(X, Y)})
+    
+    return resultados, avisos
+
 def processar_integracao(X, Y, titulo_grafico="Integração Numérica"):
     """Executa as integrações e apresenta os resultados."""
+    pd = importar("pandas")
     
     st.subheader("Dados de Amostragem")
-    df_dados = pd.DataFrame({'X': X, 'Y (f(x))': Y})
+    df_dados = pd.DataFrame({'X': X[:LIMITE_LINHAS_TABELA], 'Y (f(x))': Y[:LIMITE_LINHAS_TABELA]})
     st.dataframe(df_dados)
+    if len(X) > LIMITE_LINHAS_TABELA:
+        st.caption(f"Exibindo as primeiras {LIMITE_LINHAS_TABELA} de {len(X)} amostras.")
     
     N = len(X)
     if N < 2:
         st.error("Erro: Número insuficiente de pontos.")
         return
         
-    h = X[1] - X[0]
-    st.info(f"Número de pontos (N): {N} | Espaçamento (h): {h:.6f}")
-    
-    resultados = []
-    
-    integral_trapezio, erro_trapezio = regra_trapezio_repetida_func(X, Y)
-    if erro_trapezio:
-        st.warning(f"Trapézio: {erro_trapezio}")
-    else:
-        resultados.append({"Método": "Trapézio Repetida", "Resultado": integral_trapezio})
-        
-    integral_simpson, erro_simpson = regra_simpson_repetida_func(X, Y)
-    if erro_simpson:
-        st.warning(f"Simpson: {erro_simpson}")
+    if espacamento_uniforme(X):
+        st.info(f"Número de pontos (N): {N} | Espaçamento (h): {X[1] - X[0]:.6f}")
     else:
-        resultados.append({"Método": "Simpson 1/3 Repetida", "Resultado": integral_simpson})
+        h = np.diff(X)
+        st.info(f"Número de pontos (N): {N} | Espaçamento (h): variável, de {h.min():.6f} a {h.max():.6f}")
+    
+    resultados, avisos = calcular_integracao(X, Y)
+    for mensagem in avisos:
+        st.warning(mensagem)
         
     st.subheader("Resultados da Integração")
     if resultados:
         df_resultados = pd.DataFrame(resultados)
-        st.dataframe(df_resultados.style.format({"Resultado": "{:.6f}"}))
+        st.dataframe(df_resultados.style.format({"Resultado": "{:.6f}", "Erro Estimado": "{:.2e}"}, na_rep="N/A"))
+        st.caption("Erro estimado a partir das próprias amostras (Richardson com a malha de passo 2h "
+                   "ou diferença entre Trapézio e Simpson), sem novas avaliações.")
     else:
         st.error("Não foi possível calcular a integral com os métodos disponíveis.")
+    
+    if np.all(Y >= 0):
+        exibir_area_acumulada(X, Y)
+        
+    exibir_grafico(plotar_integracao, X, Y, titulo=titulo_grafico)
+
+def exibir_area_acumulada(X, Y):
+    """Mostra a área acumulada ao longo de X e a posição em que se atinge cada fração da área."""
+    pd = importar("pandas")
+    acumulado_trapezio, _ = trapezio_acumulado(X, Y)
+    acumulado_simpson, _ = simpson_acumulado(X, Y) if len(X) >= 3 else (None, None)
+    
+    with st.expander("Área Acumulada"):
+        fracoes = np.array([0.25, 0.5, 0.75])
+        posicoes = posicao_para_area(X, Y, acumulado_trapezio, fracoes * acumulado_trapezio[-1])
+        colunas = st.columns(len(fracoes))
+        for coluna, fracao, posicao in zip(colunas, fracoes, posicoes):
+            with coluna:
+                st.metric(f"Posição de {fracao:.0%} da área", f"x = {posicao:.6f}")
         
-    fig = plotar_integracao(X, Y, titulo=titulo_grafico)
-    st.pyplot(fig)
+        indices = np.unique(np.linspace(0, len(X) - 1, min(len(X), LIMITE_LINHAS_TABELA)).astype(int))
+        df_acumulado = pd.DataFrame({"Trapézio": acumulado_trapezio[indices]}, index=X[indices])
+        if acumulado_simpson is not None:
+            df_acumulado["Simpson"] = acumulado_simpson[indices]
+        df_acumulado.index.name = "X"
+        st.line_chart(df_acumulado)
+
+METODOS_ADAPTATIVOS = {
+    "Malha Automática (n)": integrar_malha_automatica,
+    "Simpson Adaptativo": integrar_simpson_adaptativo,
+    "Gauss-Kronrod 7-15": integrar_gauss_kronrod,
+    "Romberg": integrar_romberg,
+}
+
+def processar_integracao_adaptativa(resultado, metodo, titulo_grafico="Integração Numérica"):
+    """Apresenta o resultado de uma integração adaptativa (valor, erro estimado e custo)."""
+    pd = importar("pandas")
+    
+    st.subheader(f"Resultado da Integração ({metodo})")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Integral", f"{resultado['Integral']:.10f}")
+    with col2:
+        erro_estimado = resultado["Erro Estimado"]
+        st.metric("Erro Estimado", "N/A" if np.isnan(erro_estimado) else f"{erro_estimado:.2e}")
+    with col3:
+        st.metric("Avaliações de f(x)", resultado["Avaliações"])
+    if metodo not in REGRAS_GAUSSIANAS:
+        st.caption(f"Refinamento concluído em {resultado['Níveis']} nível(is).")
+    
+    if "Histórico" in resultado:
+        st.markdown("**Convergência por nível** (cada nível avalia f apenas nos novos pontos médios):")
+        df_historico = pd.DataFrame(resultado["Histórico"]).set_index("Nível")
+        formatos = {coluna: "{:.10f}" for coluna in ("Trapézio", "Simpson", "Romberg R(k,k)") if coluna in df_historico}
+        formatos["Erro Estimado"] = "{:.2e}"
+        st.dataframe(df_historico.style.format(formatos, na_rep="N/A"), width="stretch")
+    
+    exibir_grafico(plotar_integracao, resultado["X"], resultado["Y"], titulo=titulo_grafico)
 
 def page_integracao_numerica():
     st.title("Integração Numérica (T4, Q1)")
@@ -832,7 +1021,7 @@ def page_integracao_numerica():
     st.sidebar.title("📋 Navegação")
     page = st.sidebar.radio(
         "Selecione uma seção:",
-        ["Exemplo Padrão (Rio)", "Inserir Dados Discretos", "Integrar Função Contínua"]
+        ["Exemplo Padrão (Rio)", "Inserir Dados Discretos", "Integrar Função Contínua", "Integral Multidimensional (QMC)"]
     )
     
     if page == "Exemplo Padrão (Rio)":
@@ -847,30 +1036,35 @@ def page_integracao_numerica():
             
     elif page == "Inserir Dados Discretos":
         st.header("Inserir Dados Discretos")
-        st.markdown("Insira os valores de X (distância) e Y (f(x) ou profundidade) separados por vírgula ou espaço. **Os valores de X devem ser igualmente espaçados.**")
-        
-        col_x, col_y = st.columns(2)
+        fonte = st.radio("Fonte dos dados:", FONTES_DADOS, horizontal=True, key="fonte_int_discreto")
         
-        x_input = col_x.text_area("Valores de X:", "0, 2, 4, 6, 8, 10, 12, 14, 16, 18, 20")
-        y_input = col_y.text_area("Valores de Y (f(x)):", "0, 1.8, 4.0, 4.0, 5.0, 6.0, 4.0, 3.6, 3.4, 2.8, 0.0")
+        if fonte == FONTES_DADOS[0]:
+            st.markdown("Insira os valores de X (distância) e Y (f(x) ou profundidade) separados por vírgula ou espaço. **Os valores de X devem estar em ordem crescente** (o espaçamento pode ser variável).")
+            
+            col_x, col_y = st.columns(2)
+            
+            x_input = col_x.text_area("Valores de X:", "0, 2, 4, 6, 8, 10, 12, 14, 16, 18, 20")
+            y_input = col_y.text_area("Valores de Y (f(x)):", "0, 1.8, 4.0, 4.0, 5.0, 6.0, 4.0, 3.6, 3.4, 2.8, 0.0")
+        else:
+            st.markdown("Envie um arquivo com os dados e escolha as colunas de X e Y. **Os valores de X devem estar em ordem crescente** (o espaçamento pode ser variável).")
+            selecao = selecionar_colunas_arquivo("int_discreto", ["Coluna de X:", "Coluna de Y (f(x)):"])
         
-        if st.button("Executar Integração (Dados Discretos)", key="exec_int_discreto"):
+        sem_arquivo = fonte != FONTES_DADOS[0] and selecao is None
+        if st.button("Executar Integração (Dados Discretos)", key="exec_int_discreto", disabled=sem_arquivo):
             try:
-                def parse_input(text):
-                    text = text.replace(',', ' ').strip()
-                    return np.array([float(val) for val in text.split() if val])
-
-                X_user = parse_input(x_input)
-                Y_user = parse_input(y_input)
+                if fonte == FONTES_DADOS[0]:
+                    X_user = parse_input(x_input)
+                    Y_user = parse_input(y_input)
+                else:
+                    X_user, Y_user = ler_colunas_enviadas(selecao)
                 
                 if len(X_user) != len(Y_user):
                     st.error("Erro: O número de valores para X e Y deve ser o mesmo.")
                 elif len(X_user) < 2:
                     st.error("Erro: São necessários pelo menos 2 pontos.")
                 else:
-                    h_calc = X_user[1] - X_user[0]
-                    if not np.allclose(np.diff(X_user), h_calc):
-                        st.error("Erro: Os pontos de X não estão igualmente espaçados.")
+                    if np.any(np.diff(X_user) <= 0):
+                        st.error("Erro: Os pontos de X devem estar em ordem estritamente crescente.")
                     else:
                         processar_integracao(X_user, Y_user, titulo_grafico="Integração de Dados Discretos")
                         
@@ -881,37 +1075,120 @@ def page_integracao_numerica():
                 
     elif page == "Integrar Função Contínua":
         st.header("Integrar Função Contínua")
-        st.markdown("Insira a função $f(x)$, os limites de integração $a$ e $b$, e o número de subintervalos $n$.")
+        st.markdown("Insira a função $f(x)$, os limites de integração $a$ e $b$, e o número de subintervalos $n$ ou a tolerância desejada.")
         
         func_str = st.text_input("Função f(x) (ex: exp(x), 1/x, x**2):", "x**2")
+        modo = st.selectbox(
+            "Modo de Integração:",
+            ["Malha Fixa (n)"] + list(METODOS_ADAPTATIVOS) + list(REGRAS_GAUSSIANAS),
+            help="Os modos adaptativos refinam a malha apenas onde necessário até atingir a tolerância. "
+                 "Gauss-Legendre e Clenshaw-Curtis usam nós e pesos pré-calculados, ideais para funções suaves."
+        )
         
         col_a, col_b, col_n = st.columns(3)
         a = col_a.number_input("Limite Inferior 'a'", value=0.0, format="%.2f")
         b = col_b.number_input("Limite Superior 'b'", value=1.0, format="%.2f")
-        n = col_n.number_input("Número de Subintervalos 'n' (deve ser par para Simpson)", value=10, min_value=2, step=2)
+        if modo == "Malha Fixa (n)":
+            n = col_n.number_input("Número de Subintervalos 'n'", value=10, min_value=2, step=1)
+        elif modo in REGRAS_GAUSSIANAS:
+            ordem = col_n.number_input("Ordem da Regra 'n'", value=10, min_value=1, max_value=ORDEM_MAXIMA_QUADRATURA,
+                                       step=1, key="ordem_gauss")
+            subintervalos = st.number_input("Número de Subintervalos (regra composta)", value=1, min_value=1, step=1, key="sub_gauss")
+        else:
+            tol = col_n.select_slider(
+                "Tolerância (ε):",
+                options=[1e-4, 1e-6, 1e-8, 1e-10, 1e-12],
+                value=1e-8, key="tol_int_adaptativa"
+            )
         
         if st.button("Executar Integração (Função Contínua)", key="exec_int_funcao"):
             try:
                 if b <= a:
                     st.error("Erro: O limite superior 'b' deve ser maior que o limite inferior 'a'.")
-                elif n % 2 != 0:
-                    st.error("Erro: O número de subintervalos 'n' deve ser par para a Regra de Simpson 1/3.")
-                else:
+                elif modo == "Malha Fixa (n)":
                     X_func = np.linspace(a, b, n + 1)
                     
-                    f_expr = sympify(func_str)
-                    f_lambda = lambdify(x, f_expr, "numpy")
-                    Y_func = f_lambda(X_func)
+                    f_lambda, _ = compilar_funcao(func_str)
+                    Y_func = avaliar_funcao_paralela(f_lambda, X_func, func_str=func_str)
                     
                     if np.any(np.isinf(Y_func)) or np.any(np.isnan(Y_func)):
                         st.error("Erro: A função resultou em valores inválidos (ex: divisão por zero) no intervalo.")
                     else:
                         titulo = f"Integral de f(x) = {func_str} de {a} a {b} (n={n})"
                         processar_integracao(X_func, Y_func, titulo_grafico=titulo)
+                elif modo in REGRAS_GAUSSIANAS:
+                    f_lambda, _ = compilar_funcao(func_str)
+                    resultado, erro = integrar_quadratura_gaussiana(f_lambda, a, b, ordem, subintervalos, regra=modo)
+                    
+                    if erro:
+                        st.error(erro)
+                    else:
+                        titulo = f"Integral de f(x) = {func_str} de {a} a {b} ({modo}, n={ordem}, {subintervalos} subintervalo(s))"
+                        processar_integracao_adaptativa(resultado, modo, titulo_grafico=titulo)
+                else:
+                    f_lambda, _ = compilar_funcao(func_str)
+                    resultado, erro = METODOS_ADAPTATIVOS[modo](f_lambda, a, b, tol)
+                    
+                    if erro:
+                        st.error(erro)
+                    else:
+                        titulo = f"Integral de f(x) = {func_str} de {a} a {b} ({modo}, ε={tol})"
+                        processar_integracao_adaptativa(resultado, modo, titulo_grafico=titulo)
                         
             except Exception as e:
                 st.error(f"Ocorreu um erro ao processar a função: {e}")
                 st.info("Dica: Use 'x' como variável e funções como 'sin(x)', 'cos(x)', 'exp(x)', 'log(x)'.")
+        
+        with st.expander("Cache de funções compiladas"):
+            estatisticas = estatisticas_cache_funcoes()
+            col_ac, col_fa, col_tx = st.columns(3)
+            col_ac.metric("Acertos", estatisticas["Acertos"])
+            col_fa.metric("Faltas", estatisticas["Faltas"])
+            col_tx.metric("Taxa de Acerto", f"{estatisticas['Taxa de Acerto']:.1%}")
+            st.caption(f"{estatisticas['Entradas']} expressão(ões) em cache, {estatisticas['Descartes']} descartada(s) por LRU. "
+                       "O cache é compartilhado por todas as sessões deste servidor.")
+
+    elif page == "Integral Multidimensional (QMC)":
+        st.header("Integral Multidimensional (Quasi-Monte Carlo)")
+        st.markdown("Insira a função $f(x_1, ..., x_d)$ usando as variáveis `x1`, `x2`, ..., e os limites de cada dimensão separados por vírgula. "
+                    "A integral é estimada por sequências de baixa discrepância embaralhadas, até o erro estimado atingir a tolerância.")
+        
+        func_str = st.text_input("Função f(x1, ..., xd):", "exp(-(x1**2 + x2**2 + x3**2))", key="func_qmc")
+        col_inf, col_sup = st.columns(2)
+        inf_input = col_inf.text_input("Limites Inferiores:", "0, 0, 0", key="inf_qmc")
+        sup_input = col_sup.text_input("Limites Superiores:", "1, 1, 1", key="sup_qmc")
+        
+        col_seq, col_tol, col_sem = st.columns(3)
+        sequencia = col_seq.selectbox("Sequência:", SEQUENCIAS_QMC, key="seq_qmc")
+        tol = col_tol.select_slider("Tolerância (ε):", options=[1e-2, 1e-3, 1e-4, 1e-5, 1e-6], value=1e-4, key="tol_qmc")
+        semente = col_sem.number_input("Semente", value=0, min_value=0, step=1, key="semente_qmc")
+        
+        if st.button("Executar Integração (QMC)", key="exec_int_qmc"):
+            try:
+                inferiores = np.array([float(v) for v in inf_input.replace(',', ' ').split()])
+                superiores = np.array([float(v) for v in sup_input.replace(',', ' ').split()])
+                resultado, erro = integrar_qmc(func_str, inferiores, superiores, tol=tol,
+                                               sequencia=sequencia, semente=int(semente))
+                if erro:
+                    st.error(erro)
+                else:
+                    st.subheader(f"Resultado da Integração ({sequencia}, d = {resultado['Dimensão']})")
+                    col1, col2, col3 = st.columns(3)
+                    col1.metric("Integral", f"{resultado['Integral']:.8f}")
+                    col2.metric("Erro Estimado", f"{resultado['Erro Estimado']:.2e}")
+                    col3.metric("Avaliações de f", resultado["Avaliações"])
+                    if resultado["Erro Estimado"] > tol:
+                        st.warning("O limite de pontos foi atingido antes da tolerância pedida.")
+                    
+                    pd = importar("pandas")
+                    df_historico = pd.DataFrame(resultado["Histórico"]).set_index("Rodada")
+                    st.dataframe(df_historico.style.format({"Integral": "{:.10f}", "Erro Estimado": "{:.2e}"}),
+                                 width="stretch")
+                    st.caption(f"{resultado['Réplicas']} réplicas independentes; variáveis: {', '.join(variaveis_dimensao(resultado['Dimensão']))}.")
+            except ValueError as e:
+                st.error(f"Erro: {e}")
+            except Exception as e:
+                st.error(f"Ocorreu um erro ao processar a função: {e}")
 
 def page_home():
     st.title("Bem-vindo ao Kit de Ferramentas de Cálculo Numérico")
@@ -946,6 +1223,62 @@ def page_home():
             st.session_state.selected_page = "integracao_numerica"
             st.rerun()
 
+def exibir_relatorio_inicializacao():
+    """Mostra na barra lateral o tempo desta execução, a partida a frio e as importações sob demanda."""
+    registrar_execucao(time.perf_counter() - _INICIO_EXECUCAO)
+    relatorio = relatorio_inicializacao()
+    
+    with st.sidebar.expander("⏱️ Tempo de Inicialização"):
+        col1, col2 = st.columns(2)
+        col1.metric("Esta Execução", f"{relatorio['Última Execução']:.2f} s")
+        col2.metric("Partida a Frio", f"{relatorio['Partida a Frio']:.2f} s")
+        st.caption(f"{relatorio['Execuções']} execução(ões) neste processo, ativo há {relatorio['Processo Ativo Há']:.0f} s.")
+        if relatorio["Importações"]:
+            st.markdown("\n".join(
+                f"- `{modulo}`: {tempo:.3f} s"
+                for modulo, tempo in sorted(relatorio["Importações"].items(), key=lambda item: -item[1])
+            ))
+        else:
+            st.caption("Nenhuma biblioteca pesada (pandas, SymPy, Matplotlib, SciPy) foi carregada ainda.")
+
+def exibir_estatisticas_cache():
+    """Mostra na barra lateral os acertos e faltas dos caches de resultados (compartilhados por todas as sessões)."""
+    estatisticas = estatisticas_caches()
+    
+    with st.sidebar.expander("🗄️ Cache de Resultados"):
+        linhas = ["| Cache | Acertos | Faltas | Taxa de Acerto | Entradas | Memória (MB) |", "|---|---|---|---|---|---|"]
+        for nome, valores in estatisticas.items():
+            memoria = f"{valores['Bytes'] / 1024**2:.2f}" if "Bytes" in valores else "—"
+            linhas.append(f"| {nome} | {valores['Acertos']} | {valores['Faltas']} | {valores['Taxa de Acerto']:.0%} "
+                          f"| {valores['Entradas']} | {memoria} |")
+        st.markdown("\n".join(linhas))
+        st.caption("Entradas idênticas (mesmos dados e parâmetros) reaproveitam o resultado já calculado. "
+                   "Defina CALCULO_NUMERICO_CACHE_DISCO para compartilhá-los também entre processos.")
+
+def exibir_memoria_sessoes():
+    """
+    Painel de operação: memória ocupada pelos resultados guardados de cada sessão.
+    Só é exibido com CALCULO_NUMERICO_MOSTRAR_MEMORIA=1, pois lista as sessões de todos os usuários.
+    """
+    pd = importar("pandas")
+    estatisticas = REGISTRO_GAUSS_SEIDEL.estatisticas()
+    
+    with st.sidebar.expander("🧠 Memória das Sessões"):
+        col1, col2 = st.columns(2)
+        col1.metric("Sessões com Resultado", estatisticas["Sessões"])
+        col2.metric("Memória Total", f"{estatisticas['Bytes'] / 1024:.1f} KB")
+        uso = REGISTRO_GAUSS_SEIDEL.uso_memoria()
+        if uso:
+            sessao_atual = st.session_state.get("id_sessao")
+            df_uso = pd.DataFrame(
+                [(sessao[:8] + (" (esta)" if sessao == sessao_atual else ""), tamanho / 1024, parada, iteracoes)
+                 for sessao, tamanho, parada, iteracoes in sorted(uso, key=lambda item: -item[1])],
+                columns=["Sessão", "Memória (KB)", "Sem Uso Há (s)", "Iterações"]
+            )
+            st.dataframe(df_uso.style.format({"Memória (KB)": "{:.1f}", "Sem Uso Há (s)": "{:.0f}"}),
+                         hide_index=True, width="stretch")
+        st.caption(f"Resultados do Gauss-Seidel; {estatisticas['Expirados']} descartado(s) por falta de uso.")
+
 def main_app():
     
     if 'selected_page' not in st.session_state:
@@ -972,6 +1305,11 @@ def main_app():
         
     elif pagina == "integracao_numerica":
         page_integracao_numerica()
+    
+    exibir_relatorio_inicializacao()
+    exibir_estatisticas_cache()
+    if MOSTRAR_MEMORIA_SESSOES:
+        exibir_memoria_sessoes()
 
 if __name__ == "__main__":
     main_app()
\ No newline at end of file
@@ -0,0 +1,61 @@
+import time
+
+import numpy as np
+import pytest
+
+from cache_resultados import (
+    CacheLRU, CacheDisco, _AUSENTE, hash_entrada, serializar_resultado, desserializar_resultado, tamanho_resultado
+)
+from T3_q3 import ModeloRegressao
+
+
+def test_resultado_ida_e_volta_sem_pickle():
+    """Resultados típicos (tuplas, dicionários, arrays, escalares NumPy e modelos) voltam iguais."""
+    modelo = ModeloRegressao("Parábola", np.array([1.0, -2.0, 0.5]), 0.25)
+    valor = ([{"Ajuste": "Parábola", "Erro": np.float64(0.25), "Modelo": modelo}], [("warning", "aviso")])
+
+    metadados, dados = serializar_resultado(valor)
+    lido = desserializar_resultado(metadados, dados)
+
+    assert lido[1] == [("warning", "aviso")]
+    assert isinstance(lido[0][0]["Erro"], np.float64) and lido[0][0]["Erro"] == 0.25
+    assert np.array_equal(lido[0][0]["Modelo"].coefs, modelo.coefs)
+
+
+def test_serializar_rejeita_objetos_arbitrarios():
+    with pytest.raises(TypeError):
+        serializar_resultado({"objeto": object()})
+    with pytest.raises(TypeError):
+        serializar_resultado(np.array([object()]))
+
+
+def test_cache_disco_ignora_entrada_corrompida(tmp_path):
+    cache = CacheDisco(str(tmp_path / "cache.db"))
+    cache.guardar("chave", (np.arange(4.0), None))
+    valor, erro = cache.obter("chave")
+    assert np.array_equal(valor, np.arange(4.0)) and erro is None
+
+    with cache._conexao() as conexao:
+        conexao.execute("UPDATE resultados_npz SET valor = ?", (b"nao e um npz",))
+    assert cache.obter("chave") is _AUSENTE
+    assert cache.estatisticas()["Faltas"] == 1
+
+
+def test_cache_lru_descarta_menos_usado_e_expira(monkeypatch):
+    cache = CacheLRU(limite_bytes=100, ttl=10)
+    cache.guardar("a", 1, 40)
+    cache.guardar("b", 2, 40)
+    cache.obter("a")
+    cache.guardar("c", 3, 40)
+    assert cache.obter("b") is None and cache.obter("a") == 1
+
+    agora = time.monotonic()
+    monkeypatch.setattr("cache_resultados.time.monotonic", lambda: agora + 11)
+    assert cache.obter("a") is None
+    assert cache.estatisticas()["Expirados"] >= 1
+
+
+def test_hash_entrada_e_tamanho():
+    assert hash_entrada(np.arange(3.0), x=1) == hash_entrada(np.arange(3.0), x=1)
+    assert hash_entrada(np.arange(3.0)) != hash_entrada(np.arange(3))
+    assert tamanho_resultado(np.zeros(1000)) >= 8000
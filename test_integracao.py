@@ -0,0 +1,355 @@
+import numpy as np
+import pytest
+
+from leitura_dados import blocos_de_arrays
+from T4_q1 import (
+    integrar_qmc, integrar_em_fluxo, regra_trapezio_repetida, regra_simpson_repetida,
+    compilar_funcao, interpretar_expressao, espacamento_uniforme, regra_trapezio_nao_uniforme,
+    regra_simpson_nao_uniforme, simpson_uniforme, integrar_simpson_adaptativo,
+    integrar_gauss_kronrod, integrar_romberg, integrar_quadratura_gaussiana, nos_pesos_quadratura,
+    salvar_tabela_quadratura, carregar_tabela_quadratura, LIMITE_CACHE_NOS_PESOS,
+    ORDEM_MAXIMA_QUADRATURA, trapezio_acumulado, simpson_acumulado, posicao_para_area,
+    posicao_fracao_area, areas_secoes, calcular_trecho, volume_trecho, tabela_cota_area,
+    consultar_tabela, geometria_molhada, salvar_tabela_cota_area, carregar_tabela_cota_area,
+    integrar_grade, integrar_grade_arquivo, integrar_pontos_dispersos, avaliar_funcao_paralela,
+    escolher_trabalhadores, PONTOS_SONDA, nome_regra_simpson, pesos_simpson, pesos_tres_oitavos,
+    erro_estimado_trapezio, erro_estimado_simpson, integrar_malha_automatica
+)
+
+
+@pytest.mark.parametrize("func_str", [
+    "__import__('os')", "x.__class__", "x.real", "(1).__class__", "sin.__module__", "x[0]",
+    "open(x)", "eval(x)", "lambda: x", "y + x", "f(x)", "1 2", "",
+])
+def test_expressao_fora_da_lista_permitida_e_recusada(func_str):
+    with pytest.raises(ValueError):
+        interpretar_expressao(func_str)
+
+
+@pytest.mark.parametrize("func_str", ["x^2 + 1.5e-3", "sqrt(x) * exp(-x)", "Abs(x) + abs(x) + pi + E + e", "3.5 * .5"])
+def test_expressao_permitida_e_aceita(func_str):
+    f, _ = compilar_funcao(func_str)
+    assert np.all(np.isfinite(f(np.linspace(0.5, 1.5, 3))))
+
+
+def test_expressoes_equivalentes_compartilham_a_funcao():
+    assert compilar_funcao("x^2*3") is compilar_funcao("3*x**2") is compilar_funcao(" 3 * x ** 2 ")
+
+
+@pytest.mark.parametrize("func_str", ["x1.__class__", "open(x1)", "x1 +* x2", "y1 + x1"])
+def test_qmc_expressao_invalida_retorna_erro(func_str):
+    resultado, erro = integrar_qmc(func_str, [0, 0], [1, 1])
+    assert resultado is None
+    assert erro.startswith("Erro:")
+
+
+def test_qmc_reproduzivel_pela_semente():
+    """A mesma semente reproduz o mesmo resultado, com ou sem paralelismo."""
+    argumentos = ("x1 * x2", [0, 0], [1, 1])
+    opcoes = dict(tol=1e-3, pontos_iniciais=2**8, max_pontos=2**14, semente=7)
+    serial, erro = integrar_qmc(*argumentos, **opcoes)
+    assert erro is None
+    paralelo, _ = integrar_qmc(*argumentos, modo="threads", n_trabalhadores=2, **opcoes)
+    assert serial["Integral"] == paralelo["Integral"]
+    assert serial["Integral"] == pytest.approx(0.25, abs=5 * serial["Erro Estimado"] + 1e-3)
+
+
+@pytest.mark.parametrize("N", [3, 4, 101, 102])
+@pytest.mark.parametrize("tamanho_bloco", [1, 2, 3, 7, 1000])
+def test_fluxo_igual_as_regras_em_memoria(N, tamanho_bloco):
+    """A integração em blocos dá o mesmo resultado das regras sobre os dados inteiros, em qualquer partição."""
+    rng = np.random.default_rng(N)
+    X = np.cumsum(rng.uniform(0.5, 1.5, N))
+    Y = np.sin(X) + X
+    resultado, erro = integrar_em_fluxo(blocos_de_arrays(X, Y, tamanho_bloco))
+    assert erro is None
+    assert resultado["Trapézio"] == pytest.approx(regra_trapezio_repetida(X, Y)[0], rel=1e-12)
+    assert resultado["Simpson"] == pytest.approx(regra_simpson_repetida(X, Y)[0], rel=1e-12)
+
+
+def test_fluxo_mesmas_chaves_com_poucos_pontos():
+    completo, _ = integrar_em_fluxo(blocos_de_arrays(np.arange(5.0), np.arange(5.0)))
+    for N in (0, 1, 2):
+        resultado, erro = integrar_em_fluxo(blocos_de_arrays(np.arange(float(N)), np.arange(float(N))))
+        assert erro is None
+        assert resultado.keys() == completo.keys()
+    assert resultado["Erro Estimado Trapézio"] is None and resultado["Trapézio"] == 0.5
+
+
+def _malha_irregular(N, semente=0):
+    rng = np.random.default_rng(semente)
+    return np.concatenate([[0.0], np.cumsum(rng.uniform(0.2, 1.0, N - 1))])
+
+
+@pytest.mark.parametrize("N", [5, 6, 41])
+def test_regras_nao_uniformes_exatas_para_polinomios(N):
+    """Trapézio é exato para retas e Simpson (1/3, ou 1/3 + 3/8) para parábolas em qualquer malha."""
+    X = _malha_irregular(N)
+    a, b = X[0], X[-1]
+    reta, _ = regra_trapezio_nao_uniforme(X, 2 * X + 1)
+    assert reta == pytest.approx(b**2 - a**2 + (b - a), rel=1e-12)
+    parabola, _ = regra_simpson_nao_uniforme(X, 3 * X**2 - X)
+    assert parabola == pytest.approx((b**3 - a**3) - (b**2 - a**2) / 2, rel=1e-12)
+
+
+def test_regras_repetidas_detectam_malha_irregular():
+    X = _malha_irregular(9)
+    Y = np.cos(X)
+    assert not espacamento_uniforme(X)
+    assert regra_trapezio_repetida(X, Y)[0] == regra_trapezio_nao_uniforme(X, Y)[0]
+    assert regra_simpson_repetida(X, Y)[0] == regra_simpson_nao_uniforme(X, Y)[0]
+
+
+@pytest.mark.parametrize("N", [7, 8])
+def test_pesos_nao_uniformes_coincidem_com_a_formula_uniforme(N):
+    X = np.linspace(1.0, 4.0, N)
+    Y = np.exp(X)
+    assert regra_simpson_nao_uniforme(X, Y)[0] == pytest.approx(simpson_uniforme(Y, X[1] - X[0]), rel=1e-12)
+
+
+@pytest.mark.parametrize("escala", [1e-9, 1.0, 1e9])
+def test_espacamento_uniforme_em_qualquer_escala(escala):
+    X = escala * np.linspace(0, 1, 11)
+    assert espacamento_uniforme(X)
+    X[5] += escala * 0.01
+    assert not espacamento_uniforme(X)
+
+
+@pytest.mark.parametrize("integrar", [integrar_simpson_adaptativo, integrar_gauss_kronrod])
+@pytest.mark.parametrize("f, a, b, exato", [
+    (np.exp, 0.0, 1.0, np.e - 1),
+    (np.sqrt, 0.0, 1.0, 2 / 3),
+    (lambda x: 1 / (1 + 100 * x**2), -1.0, 1.0, 0.2 * np.arctan(10.0)),
+])
+def test_integracao_adaptativa_atinge_a_tolerancia(integrar, f, a, b, exato):
+    resultado, erro = integrar(f, a, b, tol=1e-9)
+    assert erro is None
+    assert resultado["Integral"] == pytest.approx(exato, abs=1e-8)
+    assert np.all(np.diff(resultado["X"]) > 0), "nenhum nó deve ser avaliado duas vezes"
+    assert resultado["Avaliações"] == len(resultado["X"])
+
+
+@pytest.mark.parametrize("integrar", [integrar_simpson_adaptativo, integrar_gauss_kronrod])
+def test_integracao_adaptativa_recusa_intervalo_e_valores_invalidos(integrar):
+    assert integrar(np.exp, 1.0, 0.0)[0] is None
+    with np.errstate(invalid="ignore"):
+        resultado, erro = integrar(lambda x: np.sqrt(x - 0.5), 0.0, 1.0)
+    assert resultado is None and erro.startswith("Erro:")
+
+
+@pytest.mark.parametrize("f, exato", [(np.exp, np.e - 1), (np.cos, np.sin(1.0)), (lambda x: x**7, 1 / 8)])
+def test_romberg_converge_e_reaproveita_a_malha(f, exato):
+    resultado, erro = integrar_romberg(f, 0.0, 1.0, tol=1e-12)
+    assert erro is None
+    assert resultado["Integral"] == pytest.approx(exato, abs=1e-11)
+    niveis = resultado["Níveis"]
+    assert resultado["Avaliações"] == 2**niveis + 1
+    assert resultado["Histórico"][-1]["Trapézio"] == pytest.approx(
+        regra_trapezio_repetida(resultado["X"], resultado["Y"])[0], rel=1e-13)
+
+
+@pytest.mark.parametrize("regra, n, grau", [("Gauss-Legendre", 5, 9), ("Clenshaw-Curtis", 8, 9)])
+def test_quadratura_exata_ate_o_grau_da_regra(regra, n, grau):
+    """Gauss-Legendre de n pontos integra exatamente grau 2n-1; Clenshaw-Curtis de ordem n (par), grau n+1."""
+    resultado, erro = integrar_quadratura_gaussiana(lambda x: x**grau + x**(grau - 1), 0.0, 2.0, n=n, regra=regra)
+    assert erro is None
+    assert resultado["Integral"] == pytest.approx(2.0**(grau + 1) / (grau + 1) + 2.0**grau / grau, rel=1e-12)
+
+
+def test_clenshaw_curtis_estima_o_erro_e_converge_com_subintervalos():
+    resultado, _ = integrar_quadratura_gaussiana(np.exp, 0.0, 3.0, n=8, subintervalos=4, regra="Clenshaw-Curtis")
+    erro_real = abs(resultado["Integral"] - (np.exp(3.0) - 1))
+    assert erro_real < 1e-10
+    assert resultado["Erro Estimado"] >= erro_real
+
+
+def test_ordem_da_quadratura_limitada():
+    resultado, erro = integrar_quadratura_gaussiana(np.exp, 0.0, 1.0, n=ORDEM_MAXIMA_QUADRATURA + 1)
+    assert resultado is None and erro.startswith("Erro:")
+    with pytest.raises(ValueError):
+        nos_pesos_quadratura("Gauss-Legendre", ORDEM_MAXIMA_QUADRATURA + 1)
+
+
+def test_cache_de_nos_e_pesos_limitado_e_gravavel(tmp_path):
+    for n in range(1, LIMITE_CACHE_NOS_PESOS + 20):
+        nos_pesos_quadratura("Gauss-Legendre", n)
+    caminho = tmp_path / "nos_pesos.npz"
+    salvar_tabela_quadratura(caminho)
+    assert carregar_tabela_quadratura(caminho) == LIMITE_CACHE_NOS_PESOS
+    nos, pesos = nos_pesos_quadratura("Gauss-Legendre", LIMITE_CACHE_NOS_PESOS + 19)
+    assert not nos.flags.writeable and pesos.sum() == pytest.approx(2.0)
+
+
+@pytest.mark.parametrize("N", [2, 3, 4, 9, 10])
+def test_areas_acumuladas_terminam_na_integral_das_regras(N):
+    X = _malha_irregular(N, semente=N)
+    Y = 1 + X**2
+    trapezio, _ = trapezio_acumulado(X, Y)
+    assert trapezio[0] == 0 and trapezio[-1] == pytest.approx(regra_trapezio_repetida(X, Y)[0], rel=1e-12)
+    if N >= 3:
+        simpson, _ = simpson_acumulado(X, Y)
+        assert simpson[-1] == pytest.approx(regra_simpson_repetida(X, Y)[0], rel=1e-12)
+        # A parábola é integrada exatamente em cada subintervalo, não só no total.
+        assert simpson == pytest.approx(X + X**3 / 3 - (X[0] + X[0]**3 / 3), rel=1e-12, abs=1e-12)
+
+
+def test_posicao_para_area_inverte_a_area_acumulada():
+    X = _malha_irregular(30)
+    Y = 2 + np.sin(X)
+    acumulado, _ = trapezio_acumulado(X, Y)
+    alvos = np.linspace(0, acumulado[-1], 57)
+    posicoes = posicao_para_area(X, Y, acumulado, alvos)
+    recalculado = [trapezio_acumulado(np.append(X[X < p], p), np.append(Y[X < p], np.interp(p, X, Y)))[0][-1]
+                   if p > X[0] else 0.0 for p in posicoes]
+    assert recalculado == pytest.approx(alvos, rel=1e-10, abs=1e-12)
+    assert np.isnan(posicao_para_area(X, Y, acumulado, [-1.0, acumulado[-1] + 1])).all()
+
+
+def test_meia_area_de_perfil_simetrico_fica_no_centro():
+    X = np.linspace(-1, 1, 101)
+    posicao, erro = posicao_fracao_area(X, 1 - X**2, 0.5)
+    assert erro is None and posicao == pytest.approx(0.0, abs=1e-12)
+
+
+@pytest.mark.parametrize("regra, integrar", [("Trapézio", regra_trapezio_repetida), ("Simpson", regra_simpson_repetida)])
+def test_areas_em_lote_iguais_as_secoes_uma_a_uma(regra, integrar):
+    rng = np.random.default_rng(1)
+    X = np.linspace(0, 20, 11)
+    Y = rng.uniform(0, 5, (6, 11))
+    X_proprio = np.sort(rng.uniform(0, 20, (6, 11)), axis=1)
+    irregulares_X = [np.sort(rng.uniform(0, 20, n)) for n in (4, 5, 8)]
+    irregulares_Y = [rng.uniform(0, 5, len(x)) for x in irregulares_X]
+
+    assert areas_secoes(X, Y, regra)[0] == pytest.approx([integrar(X, y)[0] for y in Y], rel=1e-12)
+    assert areas_secoes(X_proprio, Y, regra)[0] == pytest.approx(
+        [integrar(x, y)[0] for x, y in zip(X_proprio, Y)], rel=1e-12)
+    assert areas_secoes(irregulares_X, irregulares_Y, regra)[0] == pytest.approx(
+        [integrar(x, y)[0] for x, y in zip(irregulares_X, irregulares_Y)], rel=1e-12)
+
+
+def test_volume_do_trecho():
+    estacoes = np.array([0.0, 10.0, 25.0, 30.0])
+    areas = 2 * estacoes + 1
+    assert volume_trecho(estacoes, areas, "Áreas Médias")[0] == pytest.approx(930.0)
+    assert volume_trecho(estacoes, areas, "Prismoidal")[0] == pytest.approx(930.0)
+    assert volume_trecho(estacoes[::-1], areas)[0] is None
+
+    resultado, erro = calcular_trecho(estacoes, np.array([0.0, 1.0, 2.0]), np.ones((4, 3)))
+    assert erro is None and resultado["Volume"] == pytest.approx(2.0 * 30.0)
+
+
+def test_tabela_cota_area_de_secao_trapezoidal(tmp_path):
+    """Fundo de 2 m e taludes 1:1: A(h) = 2h + h², P(h) = 2 + 2√2 h."""
+    X = np.array([0.0, 3.0, 5.0, 8.0])
+    Z = np.array([3.0, 0.0, 0.0, 3.0])
+    tabela, erro = tabela_cota_area(X, Z, n_cotas=31)
+    assert erro is None
+    h = np.array([-0.5, 0.0, 0.37, 1.0, 2.9, 3.5])
+    consulta = consultar_tabela(tabela, h)
+    dentro = (h >= 0) & (h <= 3)
+    assert consulta["Área"][dentro] == pytest.approx(2 * h[dentro] + h[dentro]**2, abs=2.5e-3)
+    assert consulta["Perímetro"][dentro][1:] == pytest.approx(2 + 2 * np.sqrt(2) * h[dentro][1:], rel=1e-12)
+    assert consulta["Área"][0] == 0.0 and np.isnan(consulta["Área"][-1])
+    assert np.isnan(consulta["Raio Hidráulico"][-1]) and consulta["Raio Hidráulico"][0] == 0.0
+
+    caminho = tmp_path / "tabela.npz"
+    salvar_tabela_cota_area(tabela, caminho)
+    lida = carregar_tabela_cota_area(caminho)
+    assert all(np.array_equal(lida[chave], tabela[chave]) for chave in tabela)
+
+
+def test_geometria_molhada_em_blocos_de_cotas(monkeypatch):
+    X = np.linspace(0, 10, 50)
+    Z = (X - 5)**2 / 5
+    cotas = np.linspace(0, 5, 301)
+    inteira = geometria_molhada(X, Z, cotas)
+    monkeypatch.setattr("T4_q1.LIMITE_ELEMENTOS_COTAS", 7 * len(X))
+    for esperado, obtido in zip(inteira, geometria_molhada(X, Z, cotas)):
+        assert np.array_equal(esperado, obtido)
+
+
+def test_integral_dupla_em_grade_e_em_arquivo(tmp_path):
+    X = np.linspace(0, 2, 21)
+    Y = np.concatenate([np.linspace(0, 1, 8), np.linspace(1.25, 3, 9)])
+    Z = (1 + X[None, :]**2) * Y[:, None]**2
+    exato = (2 + 8 / 3) * 9
+    assert integrar_grade(X, Y, Z, "Simpson")[0] == pytest.approx(exato, rel=1e-12)
+    assert integrar_grade(X, Y, Z, "Trapézio")[0] == pytest.approx(exato, rel=1e-2)
+
+    caminho = tmp_path / "grade.npy"
+    np.save(caminho, Z)
+    assert integrar_grade_arquivo(caminho, X, Y, "Simpson", linhas_bloco=3)[0] == pytest.approx(exato, rel=1e-12)
+    assert integrar_grade(X, Y, Z.T)[0] is None
+
+
+def test_pontos_dispersos_exato_para_superficie_plana():
+    rng = np.random.default_rng(2)
+    X = np.concatenate([[0, 1, 0, 1], rng.uniform(0, 1, 50)])
+    Y = np.concatenate([[0, 0, 1, 1], rng.uniform(0, 1, 50)])
+    volume, erro = integrar_pontos_dispersos(X, Y, 3 + 2 * X - Y)
+    assert erro is None and volume == pytest.approx(3.5, rel=1e-12)
+    assert integrar_pontos_dispersos([0, 1, 2], [0, 1, 2], [1, 1, 1])[0] is None
+
+
+@pytest.mark.parametrize("modo", ["threads", "processos"])
+def test_avaliacao_paralela_igual_a_serial(modo):
+    func_str = "sin(x) * exp(-x^2)"
+    f, _ = compilar_funcao(func_str)
+    X = np.linspace(-3, 3, PONTOS_SONDA + 1001)
+    Y = avaliar_funcao_paralela(f, X, func_str=func_str, modo=modo, n_trabalhadores=2)
+    assert np.array_equal(Y, f(X))
+
+
+def test_escolha_de_trabalhadores_e_validacao():
+    assert escolher_trabalhadores(1e-9, 10_000, max_trabalhadores=8) == 1
+    assert escolher_trabalhadores(1e-3, 10_000, max_trabalhadores=8) == 8
+    f, _ = compilar_funcao("x")
+    with pytest.raises(ValueError):
+        avaliar_funcao_paralela(f, np.arange(3.0), modo="processos")
+    with pytest.raises(ValueError):
+        avaliar_funcao_paralela(f, np.arange(3.0), modo="gpu")
+
+
+@pytest.mark.parametrize("N", [4, 6, 8, 12])
+def test_simpson_com_paineis_tres_oitavos_exato_para_cubicas(N):
+    """Com número ímpar de subintervalos, 1/3 + 3/8 continua exato para cúbicas em malha uniforme."""
+    X = np.linspace(1.0, 3.0, N)
+    integral, erro = regra_simpson_repetida(X, X**3 - 2 * X)
+    assert erro is None
+    assert nome_regra_simpson(N) == "Simpson 1/3 + 3/8"
+    assert integral == pytest.approx((3.0**4 - 1.0) / 4 - (9.0 - 1.0), rel=1e-12)
+
+
+def test_pesos_simpson_uniformes():
+    h = 0.5
+    X = h * np.arange(8)
+    assert pesos_tres_oitavos(X[:4]) == pytest.approx(3 * h / 8 * np.array([1, 3, 3, 1]), rel=1e-12)
+    esperado = np.concatenate([h / 3 * np.array([1, 4, 2, 4, 1]), [0, 0, 0]])
+    esperado[4:] += 3 * h / 8 * np.array([1, 3, 3, 1])
+    assert pesos_simpson(X) == pytest.approx(esperado, rel=1e-12)
+    assert nome_regra_simpson(7) == "Simpson 1/3 Repetida"
+
+
+@pytest.mark.parametrize("N", [9, 12, 41, 42])
+def test_estimativas_de_erro_acompanham_o_erro_real(N):
+    X = np.linspace(0, 2, N)
+    Y = np.exp(X)
+    exato = np.exp(2) - 1
+    for regra, estimativa in ((regra_trapezio_repetida, erro_estimado_trapezio),
+                              (regra_simpson_repetida, erro_estimado_simpson)):
+        real = abs(regra(X, Y)[0] - exato)
+        assert 0.5 * real <= estimativa(X, Y) <= 2 * real
+
+
+def test_estimativas_sem_pontos_suficientes():
+    assert np.isnan(erro_estimado_trapezio(np.arange(2.0), np.arange(2.0)))
+    assert np.isnan(erro_estimado_simpson(np.arange(4.0), np.arange(4.0)))
+
+
+def test_malha_automatica_dobra_ate_a_tolerancia():
+    resultado, erro = integrar_malha_automatica(np.sin, 0.0, np.pi, tol=1e-10)
+    assert erro is None
+    assert resultado["Integral"] == pytest.approx(2.0, abs=1e-9)
+    ns = [nivel["n"] for nivel in resultado["Histórico"]]
+    assert all(b == 2 * a for a, b in zip(ns, ns[1:]))
+    assert resultado["Avaliações"] == ns[-1] + 1
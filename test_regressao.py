@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from T3_q3 import (
+    estatisticas_suficientes, resolver_subsistema, regressao_em_blocos,
+    erro_quadratico_estado, erro_quadratico_exato, blocos_de_arrays,
+    reduzir_lttb, reduzir_minmax, reduzir_pontos, ModeloRegressao, obter_modelo
+)
+
+
+@pytest.mark.parametrize("deslocamento", [0.0, 1e5, 1e6])
+def test_erro_estado_com_deslocamento_grande(deslocamento):
+    """O erro pelas estatísticas acumuladas deve bater com a passada exata mesmo com Y longe de zero."""
+    rng = np.random.default_rng(0)
+    X = np.linspace(0, 10, 100_000)
+    Y = deslocamento + 2 * X + 0.5 * X**2 + rng.normal(0, 1e-3, X.size)
+
+    estado = estatisticas_suficientes(X, Y, "Parábola")
+    for grau, ajuste in ((1, "Reta"), (2, "Parábola")):
+        coefs = resolver_subsistema(estado, grau)
+        exato = erro_quadratico_exato(X, Y, coefs, ajuste)
+        assert erro_quadratico_estado(coefs, estado) == pytest.approx(exato, rel=1e-3)
+
+    for metodo in ("normais", "qr"):
+        coefs, estado = regressao_em_blocos(blocos_de_arrays(X, Y, 7000), "Parábola", metodo)
+        exato = erro_quadratico_exato(X, Y, coefs, "Parábola")
+        assert exato == pytest.approx(0.1, rel=0.05)
+        assert erro_quadratico_estado(coefs, estado) == pytest.approx(exato, rel=1e-3)
+
+
+def test_lttb_mantem_extremos_e_picos():
+    rng = np.random.default_rng(1)
+    X = rng.permutation(np.arange(100_000, dtype=float))
+    Y = np.sin(X / 5000)
+    Y[X == 54_321] = 10.0
+
+    X_red, Y_red = reduzir_lttb(X, Y, 500)
+    assert len(X_red) == 500
+    assert X_red[0] == 0 and X_red[-1] == 99_999
+    assert np.all(np.diff(X_red) > 0)
+    assert 54_321 in X_red
+    Y_por_x = np.empty_like(Y)
+    Y_por_x[X.astype(int)] = Y
+    assert np.array_equal(Y_red, Y_por_x[X_red.astype(int)]), "os pontos mantidos devem ser pares (x, y) originais"
+
+
+def test_minmax_preserva_o_envelope():
+    rng = np.random.default_rng(2)
+    X = np.sort(rng.uniform(0, 1, 50_000))
+    Y = rng.normal(size=X.size)
+    X_red, Y_red = reduzir_minmax(X, Y, 100)
+    assert len(X_red) <= 200
+    assert Y_red.max() == Y.max() and Y_red.min() == Y.min()
+    assert len(reduzir_pontos(X[:1000], Y[:1000], max_pontos=2000)[0]) == 1000
+
+
+@pytest.mark.parametrize("ajuste, coefs", [("Reta", [1.0, -2.0]), ("Parábola", [0.5, 1.0, -3.0]), ("Exponencial", [0.1, 0.7])])
+def test_modelo_ida_e_volta_e_previsao(ajuste, coefs, tmp_path):
+    modelo = ModeloRegressao(ajuste, coefs, erro=0.125)
+    lido = ModeloRegressao.de_bytes(modelo.para_bytes())
+    assert lido.ajuste == ajuste and lido.erro == 0.125 and np.array_equal(lido.coefs, modelo.coefs)
+
+    X = np.linspace(-2, 2, 7)
+    if ajuste == "Exponencial":
+        esperado = np.exp(coefs[0]) * np.exp(coefs[1] * X)
+    else:
+        esperado = np.polyval(coefs[::-1], X)
+    assert lido.prever(X) == pytest.approx(esperado, rel=1e-12)
+    assert lido.prever(1.5) == pytest.approx(lido.prever([1.5])[0])
+    assert np.ndim(lido.prever(1.5)) == 0
+
+    caminho = tmp_path / "modelo.bin"
+    modelo.salvar(caminho)
+    assert obter_modelo(caminho) is obter_modelo(caminho)
+    assert np.concatenate(list(lido.prever_em_blocos([X[:3], X[3:]]))) == pytest.approx(esperado, rel=1e-12)
+
+
+@pytest.mark.parametrize("dados", [b"", b"XXXX" + bytes(20), ModeloRegressao("Reta", [1.0, 2.0]).para_bytes()[:-1]])
+def test_modelo_recusa_dados_invalidos(dados):
+    with pytest.raises(ValueError):
+        ModeloRegressao.de_bytes(dados)
+